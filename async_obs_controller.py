@@ -0,0 +1,381 @@
+"""Asyncio-native OBS controller - obs-websocket v5 over the main event loop"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from collections import deque
+import websockets
+from obs_controller import REQUIRED_SOURCES, BATCH_EXECUTION_SERIAL_FRAME, frame_states
+from config import (
+    OBS_HOST, OBS_PORT, OBS_PASSWORD, MAIN_SCENE, ANIMATION_SPEED,
+    LIP_SYNC_FRAME_SECONDS, OBS_REQUEST_TIMEOUT, OBS_RECONNECT_MIN_DELAY, OBS_RECONNECT_MAX_DELAY
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# obs-websocket v5 EventSubscription flags
+EVENT_SUBSCRIPTION_SCENES = 1 << 2
+EVENT_SUBSCRIPTION_SCENE_ITEMS = 1 << 7
+
+class AsyncOBSController:
+    def __init__(self, host=OBS_HOST, port=OBS_PORT, password=OBS_PASSWORD):
+        self.url = f"ws://{host}:{port}"
+        self.password = password
+        self.ws = None
+        self.connected = False
+        self.source_ids = {}
+        self._visibility = {}  # Last known visibility per source
+        self._pending = {}  # requestId -> future
+        self._next_request_id = 1
+        self._reader_task = None
+        self._supervisor_task = None
+        self._animation_task = None
+        self._refresh_task = None
+        self._closing = False
+        self._frame_latencies = deque(maxlen=200)
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.frames_dropped = 0
+        self.reconnects = 0
+
+    async def connect(self):
+        """Connect and keep reconnecting in the background if OBS goes away"""
+        self._closing = False
+        connected = await self._open()
+        if not self._supervisor_task:
+            self._supervisor_task = asyncio.create_task(self._supervise())
+        return connected
+
+    async def _open(self):
+        """Open the websocket, identify and set up sources"""
+        # Item IDs belong to the OBS instance we were connected to - never reuse them
+        self._forget_sources()
+        try:
+            self.ws = await websockets.connect(self.url, max_size=None)
+            await self._identify()
+            self.connected = True
+            self._reader_task = asyncio.create_task(self._reader_loop())
+            logger.info("✅ Connected to OBS WebSocket")
+
+            await self._get_source_ids()
+            await self._set_initial_state()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Connection failed: {e}")
+            self.connected = False
+            if self.ws:
+                await self.ws.close()
+            return False
+
+    async def _supervise(self):
+        """Reconnect with exponential backoff whenever the connection drops"""
+        delay = OBS_RECONNECT_MIN_DELAY
+
+        while not self._closing:
+            if self._reader_task and not self._reader_task.done():
+                # Connected - wait for the reader to exit (without cancelling it)
+                await asyncio.wait({self._reader_task})
+                delay = OBS_RECONNECT_MIN_DELAY
+                continue
+
+            await asyncio.sleep(delay)
+            if self._closing:
+                break
+
+            logger.info("🔄 Reconnecting to OBS...")
+            if await self._open():
+                self.reconnects += 1
+                delay = OBS_RECONNECT_MIN_DELAY
+            else:
+                delay = min(delay * 2, OBS_RECONNECT_MAX_DELAY)
+
+    async def _identify(self):
+        """Complete the Hello / Identify handshake"""
+        hello = json.loads(await self.ws.recv())
+        if hello.get("op") != 0:
+            raise ConnectionError("Invalid Hello message from OBS")
+
+        identify = {
+            "rpcVersion": 1,
+            "eventSubscriptions": EVENT_SUBSCRIPTION_SCENES | EVENT_SUBSCRIPTION_SCENE_ITEMS
+        }
+        authentication = hello["d"].get("authentication")
+        if authentication:
+            identify["authentication"] = self._build_auth_string(
+                authentication["salt"], authentication["challenge"]
+            )
+
+        await self.ws.send(json.dumps({"op": 1, "d": identify}))
+        identified = json.loads(await self.ws.recv())
+        if identified.get("op") != 2:
+            raise ConnectionError("OBS rejected Identify, password may be incorrect")
+
+    def _build_auth_string(self, salt, challenge):
+        secret = base64.b64encode(hashlib.sha256((self.password + salt).encode("utf-8")).digest())
+        return base64.b64encode(
+            hashlib.sha256(secret + challenge.encode("utf-8")).digest()
+        ).decode("utf-8")
+
+    async def _reader_loop(self):
+        """Route responses to their waiting callers"""
+        try:
+            async for message in self.ws:
+                data = json.loads(message)
+                op = data.get("op")
+                if op in (7, 9):  # RequestResponse / RequestBatchResponse
+                    future = self._pending.pop(data["d"].get("requestId"), None)
+                    if future and not future.done():
+                        future.set_result(data["d"])
+                elif op == 5:  # Event
+                    self._handle_event(data["d"])
+        except websockets.exceptions.ConnectionClosed:
+            logger.warning("OBS connection lost!")
+        except Exception as e:
+            logger.error(f"OBS reader error: {e}")
+        finally:
+            self.connected = False
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("OBS connection closed"))
+            self._pending.clear()
+
+    def _handle_event(self, event):
+        """Keep the scene-item ID and visibility caches in step with OBS"""
+        event_type = event.get("eventType")
+        data = event.get("eventData", {})
+        logger.debug(f"OBS event: {event_type}")
+
+        if event_type == "SceneNameChanged" and data.get("oldSceneName") == MAIN_SCENE:
+            logger.warning(f"Scene {MAIN_SCENE} renamed to {data.get('sceneName')}")
+            self._forget_sources()
+
+        if event_type in ("SceneCreated", "SceneNameChanged"):
+            if data.get("sceneName") == MAIN_SCENE:
+                self._refresh_task = asyncio.create_task(self._refresh_sources())
+            return
+
+        if event_type == "SceneRemoved" and data.get("sceneName") == MAIN_SCENE:
+            logger.warning(f"Scene {MAIN_SCENE} removed")
+            self._forget_sources()
+            return
+
+        if data.get("sceneName") != MAIN_SCENE:
+            return
+
+        if event_type == "SceneItemCreated":
+            source_name = data.get("sourceName")
+            if source_name in REQUIRED_SOURCES:
+                self.source_ids[source_name] = data.get("sceneItemId")
+                self._visibility.pop(source_name, None)
+                logger.info(f"Found {source_name} with ID: {self.source_ids[source_name]}")
+
+        elif event_type == "SceneItemRemoved":
+            source_name = data.get("sourceName")
+            if self.source_ids.get(source_name) == data.get("sceneItemId"):
+                del self.source_ids[source_name]
+                self._visibility.pop(source_name, None)
+                logger.warning(f"{source_name} removed from {MAIN_SCENE}")
+
+        elif event_type == "SceneItemEnableStateChanged":
+            for source_name, item_id in self.source_ids.items():
+                if item_id == data.get("sceneItemId"):
+                    self._visibility[source_name] = data.get("sceneItemEnabled")
+                    break
+
+    def _forget_sources(self):
+        """Drop cached scene-item IDs and visibility"""
+        self.source_ids.clear()
+        self._visibility.clear()
+
+    async def _refresh_sources(self):
+        """Re-resolve source IDs and reset the scene"""
+        self._forget_sources()
+        if await self._get_source_ids():
+            await self._set_initial_state()
+
+    async def _send_request(self, op, payload):
+        """Send a request or batch and wait for its response"""
+        if not self.connected:
+            raise ConnectionError("Not connected to OBS")
+
+        request_id = str(self._next_request_id)
+        self._next_request_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        try:
+            await self.ws.send(json.dumps({"op": op, "d": {"requestId": request_id, **payload}}))
+            return await asyncio.wait_for(future, OBS_REQUEST_TIMEOUT)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def call(self, request_type, request_data=None):
+        """Send a single request and return its response data"""
+        response = await self._send_request(6, {
+            "requestType": request_type,
+            "requestData": request_data or {}
+        })
+        if not response.get("requestStatus", {}).get("result"):
+            raise RuntimeError(f"{request_type} failed: {response.get('requestStatus')}")
+        return response.get("responseData", {})
+
+    async def call_batch(self, batch, execution_type=BATCH_EXECUTION_SERIAL_FRAME):
+        """Send (request_type, request_data) pairs as one RequestBatch"""
+        response = await self._send_request(8, {
+            "haltOnFailure": False,
+            "executionType": execution_type,
+            "requests": [
+                {"requestType": request_type, "requestData": request_data}
+                for request_type, request_data in batch
+            ]
+        })
+        return response.get("results", [])
+
+    async def _get_source_ids(self):
+        """Get all source IDs"""
+        try:
+            response = await self.call("GetSceneItemList", {"sceneName": MAIN_SCENE})
+
+            for item in response.get("sceneItems", []):
+                source_name = item.get("sourceName", "")
+                if source_name in REQUIRED_SOURCES:
+                    self.source_ids[source_name] = item.get("sceneItemId", 0)
+                    logger.info(f"Found {source_name} with ID: {self.source_ids[source_name]}")
+
+            missing = [src for src in REQUIRED_SOURCES if src not in self.source_ids]
+            if missing:
+                logger.error(f"❌ Missing sources: {missing}")
+                return False
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Error getting source IDs: {e}")
+            return False
+
+    async def _set_initial_state(self):
+        """Set initial visibility state"""
+        self._visibility.clear()
+        await self._show_state(stretched=False)
+        logger.info("✅ Set initial state")
+
+    def start_animation(self, lip_sync=None, playback_position=None):
+        """Start animation as a task on the running loop"""
+        if self._animation_task and not self._animation_task.done():
+            return
+
+        self._animation_task = asyncio.create_task(
+            self._animation_loop(lip_sync if playback_position else None, playback_position)
+        )
+        logger.info("🎭 Started source-switching animation")
+
+    async def stop_animation(self):
+        """Stop animation and reset"""
+        if self._animation_task:
+            self._animation_task.cancel()
+            await asyncio.gather(self._animation_task, return_exceptions=True)
+            self._animation_task = None
+
+        await self._show_state(stretched=False)
+        logger.info("⏹️ Stopped animation")
+
+    async def _animation_loop(self, lip_sync, playback_position):
+        """Follow the lip sync track, or flip-flop every ANIMATION_SPEED seconds"""
+        if not lip_sync:
+            stretched = False
+            while True:
+                stretched = not stretched
+                await self._show_state(stretched)
+                await asyncio.sleep(ANIMATION_SPEED)
+
+        mouth_open = False
+        while True:
+            should_open = lip_sync.is_open_at(playback_position())
+            if should_open != mouth_open:
+                mouth_open = should_open
+                await self._show_state(mouth_open)
+            await asyncio.sleep(LIP_SYNC_FRAME_SECONDS)
+
+    async def _show_state(self, stretched):
+        """Show the stretched (open lips) or normal (closed lips) frame"""
+        try:
+            await self._apply_frame(frame_states(stretched))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error showing {'stretched' if stretched else 'normal'} state: {e}")
+
+    async def _apply_frame(self, states):
+        """Send every visibility change for a frame as one request batch"""
+        changes = [
+            (source_name, visible) for source_name, visible in states.items()
+            if self._visibility.get(source_name) != visible and self.source_ids.get(source_name)
+        ]
+
+        if not changes:
+            self.frames_skipped += 1
+            return
+
+        # Drop frames cheaply while OBS is down; the supervisor resets state on reconnect
+        if not self.connected:
+            self.frames_dropped += 1
+            return
+
+        started = time.perf_counter()
+        results = await self.call_batch([
+            ("SetSceneItemEnabled", {
+                "sceneName": MAIN_SCENE,
+                "sceneItemId": self.source_ids[source_name],
+                "sceneItemEnabled": visible
+            })
+            for source_name, visible in changes
+        ])
+        self._frame_latencies.append(time.perf_counter() - started)
+        self.frames_sent += 1
+
+        for (source_name, visible), result in zip(changes, results):
+            if result.get("requestStatus", {}).get("result"):
+                self._visibility[source_name] = visible
+            else:
+                self._visibility.pop(source_name, None)
+                logger.error(f"Failed to set {source_name} visibility")
+
+    async def disconnect(self):
+        """Disconnect from OBS"""
+        self._closing = True
+        if self._supervisor_task:
+            self._supervisor_task.cancel()
+            await asyncio.gather(self._supervisor_task, return_exceptions=True)
+            self._supervisor_task = None
+        if self._animation_task:
+            await self.stop_animation()
+        if self.ws:
+            try:
+                await self.ws.close()
+                logger.info("Disconnected from OBS")
+            except Exception as e:
+                logger.error(f"Disconnect error: {e}")
+        if self._reader_task:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+        self.connected = False
+
+    def is_connected(self):
+        """Check connection status"""
+        return self.connected
+
+    def get_frame_stats(self):
+        """Get per-frame batch latency stats"""
+        latencies = sorted(self._frame_latencies)
+        return {
+            "frames_sent": self.frames_sent,
+            "frames_skipped": self.frames_skipped,
+            "frames_dropped": self.frames_dropped,
+            "reconnects": self.reconnects,
+            "avg_latency_ms": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_latency_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "max_latency_ms": 1000 * latencies[-1] if latencies else 0.0
+        }
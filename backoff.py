@@ -0,0 +1,7 @@
+"""Retry backoff shared by the Groq, Barkle HTTP and websocket clients"""
+
+import random
+
+def backoff_delay(attempt, base, cap):
+    """Exponential backoff with full jitter for retry number `attempt` (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
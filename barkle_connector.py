@@ -3,17 +3,21 @@
 import asyncio
 import websockets
 import json
-import queue
 import logging
 import time
 import random
-from collections import deque
 from groq_summarizer import GroqSummarizer
+from stream_channel import StreamChatChannel
+from barkle_protocol import ChannelFrame, ChatMessage, parse_frame, DECODE_ERRORS, DECODER_NAME
 from stream_id_helper import BarkleStreamHelper
+from live_monitor import LiveStatusMonitor, WENT_LIVE, WENT_OFFLINE
+from connection_uptime import ConnectionUptime
+from backoff import backoff_delay
 from config import (
-    BARKLE_TOKEN, BARKLE_TARGET_USER_ID, BARKLE_STREAM_ID, 
-    BARKLE_AUTO_DETECT_STREAM, FAST_CHAT_THRESHOLD, CHAT_SPEED_WINDOW, 
-    MIN_MESSAGES_FOR_GROQ, RANDOM_SAMPLE_SIZE, STREAM_CHECK_INTERVAL,
+    BARKLE_TOKEN, BARKLE_TARGET_USER_ID, BARKLE_STREAM_ID, BARKLE_STREAM_IDS,
+    BARKLE_AUTO_DETECT_STREAM, BARKLE_FOLLOW_LIVE_USERS, LIVE_MONITOR_USERS,
+    BARKLE_WS_PING_INTERVAL, BARKLE_WS_PING_TIMEOUT, BARKLE_RECONNECT_MIN_DELAY,
+    BARKLE_RECONNECT_MAX_DELAY, BARKLE_WS_STABLE_SECONDS, BARKLE_OUTAGE_RATE_SECONDS,
     COOLDOWN, TIMEOUT  # New cooldown imports
 )
 
@@ -21,306 +25,424 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class EnhancedBarkleConnector:
-    def __init__(self):
+    def __init__(self, stream_ids=None, ws_url="wss://barkle.chat/streaming"):
+        """`stream_ids` overrides BARKLE_STREAM_ID/BARKLE_STREAM_IDS (first is primary);
+        `ws_url` can point at a local stand-in server"""
         self.token = BARKLE_TOKEN
         self.target_user_id = BARKLE_TARGET_USER_ID
-        self.ws_url = "wss://barkle.chat/streaming"
-        self.chat_buffer = []
-        self.summary_queue = queue.Queue()
+        self.ws_url = ws_url
+        self.summary_queue = asyncio.Queue()
         self.connected = False
-        self.message_timestamps = deque(maxlen=100)
+        self.uptime = ConnectionUptime()
         self.groq_summarizer = GroqSummarizer()
         self.connection_id = f"chatty-{int(time.time())}-{random.randint(1000, 9999)}"
-        self._last_process_time = time.time()
-        self._last_response_time = 0  # Track when we last responded
+        
+        # Every followed stream is a streamChat channel on the one websocket, keyed by channel id
+        self.channels = {}
+        self._channel_ids = {}  # stream ID -> channel ID
+        self._channels_opened = 0
+        self._followed_users = {}  # user ID -> stream ID, for BARKLE_FOLLOW_LIVE_USERS
+        self._stream_sources = {}  # stream ID -> why it's followed ("primary", "config", "live:<user>")
+        
+        # Ingest counters
+        self.frames_received = 0
+        self.frames_rejected = 0
+        
+        # Summary dispatch metrics
+        self._summaries_dispatched = 0
+        self._max_queue_depth = 0
+        self._total_summary_wait = 0.0
+        self._max_summary_wait = 0.0
+        self._last_summary_wait = 0.0
         
         # Stream ID configuration
-        self.current_stream_id = BARKLE_STREAM_ID
+        if stream_ids is None:
+            stream_ids = [BARKLE_STREAM_ID, *BARKLE_STREAM_IDS]
+        self.current_stream_id = stream_ids[0] if stream_ids else None
+        for index, stream_id in enumerate(stream_ids):
+            if stream_id:
+                self.add_stream(stream_id, source="primary" if index == 0 else "config")
+        
         self.stream_helper = BarkleStreamHelper(self.token) if BARKLE_AUTO_DETECT_STREAM else None
+        self.live_monitor = None
+        self._stream_found = asyncio.Event()
+        self._detect_task = None
+        self._websocket = None
+        if self.stream_helper and self.target_user_id:
+            self.live_monitor = LiveStatusMonitor(self.stream_helper, [self.target_user_id, *LIVE_MONITOR_USERS])
+            self.live_monitor.subscribe(self._on_live_status)
         
     async def connect_to_chat(self):
         """Enhanced connection with dynamic stream ID detection"""
         # Step 1: Get stream ID if not configured
         if not self.current_stream_id and BARKLE_AUTO_DETECT_STREAM:
             logger.info("🔍 No stream ID configured, detecting automatically...")
-            await self._detect_stream_id()
+            if self.channels:
+                # Other streams are configured - serve them while waiting for the target
+                self._detect_task = asyncio.create_task(self._detect_stream_id())
+            else:
+                await self._detect_stream_id()
+        
+        # Keep watching for go-live, stream switches and followed creators,
+        # whether or not a stream ID was configured up front
+        if self.live_monitor:
+            self.live_monitor.start()
         
         # Step 2: Validate we have a stream ID
-        if not self.current_stream_id:
+        if not self.channels:
             logger.error("❌ No stream ID available. Please configure BARKLE_STREAM_ID or enable auto-detection.")
             return
         
         # Step 3: Connect to WebSocket
         await self._websocket_connection_loop()
     
+    def add_stream(self, stream_id, source="config"):
+        """Follow a stream's chat; subscribed on the next (re)connect.
+        
+        `source` records why it's followed, so leaving for one reason
+        keeps streams still wanted for another.
+        """
+        self._stream_sources.setdefault(stream_id, set()).add(source)
+        channel_id = self._channel_ids.get(stream_id)
+        if channel_id:
+            return self.channels[channel_id]
+        
+        # The first channel keeps the plain connection ID
+        channel_id = self.connection_id if not self._channels_opened else f"{self.connection_id}-{self._channels_opened}"
+        self._channels_opened += 1
+        
+        channel = StreamChatChannel(stream_id, channel_id, self.groq_summarizer, self._enqueue_summary)
+        self.channels[channel_id] = channel
+        self._channel_ids[stream_id] = channel_id
+        self.groq_summarizer.set_stream_count(len(self.channels))
+        return channel
+    
+    async def join_stream(self, stream_id, source="config"):
+        """Follow a stream's chat, subscribing right away if connected"""
+        is_new = stream_id not in self._channel_ids
+        channel = self.add_stream(stream_id, source)
+        if is_new and self.connected and self._websocket:
+            await self._subscribe_channel(self._websocket, channel)
+        return channel
+    
+    async def leave_stream(self, stream_id, source=None):
+        """Stop following a stream's chat for `source`, unsubscribing once no
+        source still wants it; with no `source` leave it outright"""
+        sources = self._stream_sources.get(stream_id, set())
+        if source is not None:
+            sources.discard(source)
+            if sources:
+                return
+        self._stream_sources.pop(stream_id, None)
+        
+        channel_id = self._channel_ids.pop(stream_id, None)
+        if not channel_id:
+            return
+        
+        channel = self.channels.pop(channel_id)
+        channel.cancel()
+        self.groq_summarizer.set_stream_count(len(self.channels))
+        if self.connected and self._websocket:
+            try:
+                await self._websocket.send(json.dumps({"type": "disconnect", "body": {"id": channel_id}}))
+            except Exception as e:
+                logger.error(f"Failed to unsubscribe from stream chat: {e}")
+        logger.info(f"📴 Left stream chat for stream ID: {stream_id}")
+    
+    @property
+    def primary_channel(self):
+        """The channel for the target user's stream (or the configured stream)"""
+        channel_id = self._channel_ids.get(self.current_stream_id)
+        return self.channels.get(channel_id) if channel_id else None
+    
     async def _detect_stream_id(self):
         """Detect stream ID dynamically"""
-        if not self.stream_helper or not self.target_user_id:
+        if not self.live_monitor or not self.target_user_id:
             logger.warning("Stream detection requires BARKLE_TARGET_USER_ID to be configured")
             return
         
         logger.info(f"🎯 Checking if {self.target_user_id} is live...")
         
         try:
-            stream_data = await self.stream_helper.get_stream_data(self.target_user_id)
+            # One concurrent sweep of everyone we watch, then keep polling in the background
+            await self.live_monitor.check_all()
+            self.live_monitor.start()
             
-            if stream_data and stream_data.get("isActive"):
-                self.current_stream_id = stream_data.get("id")
-                logger.info(f"🔴 Found live stream!")
-                logger.info(f"   Stream ID: {self.current_stream_id}")
-                logger.info(f"   Title: {stream_data.get('title', 'Untitled')}")
-                logger.info(f"   Viewers: {stream_data.get('viewers', 0)}")
-            else:
+            if not self.current_stream_id:
                 logger.warning(f"⚫ {self.target_user_id} is not currently live")
-                
-                if BARKLE_AUTO_DETECT_STREAM:
-                    logger.info("⏳ Waiting for user to go live...")
-                    await self._monitor_for_live_stream()
+                logger.info("⏳ Waiting for user to go live...")
+                await self._monitor_for_live_stream()
                     
         except Exception as e:
             logger.error(f"Error detecting stream: {e}")
     
     async def _monitor_for_live_stream(self):
-        """Monitor target user until they go live"""
+        """Wait until the live monitor sees the target user go live"""
         while not self.current_stream_id:
-            try:
-                await asyncio.sleep(STREAM_CHECK_INTERVAL)
-                
-                stream_data = await self.stream_helper.get_stream_data(self.target_user_id)
-                
-                if stream_data and stream_data.get("isActive"):
-                    self.current_stream_id = stream_data.get("id")
-                    logger.info(f"🎉 {self.target_user_id} went live! Stream ID: {self.current_stream_id}")
-                    break
-                else:
-                    logger.info(f"⏳ Still waiting for {self.target_user_id} to go live...")
-                    
-            except Exception as e:
-                logger.error(f"Error monitoring for live stream: {e}")
-                await asyncio.sleep(STREAM_CHECK_INTERVAL)
+            await self._stream_found.wait()
+    
+    def _is_target_user(self, user_id):
+        return self.stream_helper.format_user_id(self.target_user_id) == user_id
+    
+    async def _on_live_status(self, event, user_id, stream_data):
+        """Follow the target user's go-live/go-offline events, and other creators' if enabled"""
+        if not self._is_target_user(user_id):
+            if BARKLE_FOLLOW_LIVE_USERS:
+                await self._follow_user_stream(event, user_id, stream_data)
+            return
+        
+        if event == WENT_OFFLINE:
+            logger.info(f"⚫ {self.target_user_id} went offline")
+            return
+        
+        stream_id = stream_data.get("id")
+        if stream_id == self.current_stream_id:
+            return
+        
+        logger.info(f"🔴 Found live stream!")
+        logger.info(f"   Stream ID: {stream_id}")
+        logger.info(f"   Title: {stream_data.get('title', 'Untitled')}")
+        logger.info(f"   Viewers: {stream_data.get('viewers', 0)}")
+        
+        # A new stream - move the target's chat subscription over
+        previous_stream_id = self.current_stream_id
+        self.current_stream_id = stream_id
+        await self.join_stream(stream_id, source="primary")
+        if previous_stream_id:
+            await self.leave_stream(previous_stream_id, source="primary")
+        self._stream_found.set()
+    
+    async def _follow_user_stream(self, event, user_id, stream_data):
+        """Join a watched creator's chat while they're live"""
+        source = f"live:{user_id}"
+        previous_stream_id = self._followed_users.pop(user_id, None)
+        if previous_stream_id:
+            # Only drops the subscription if nothing else follows that stream
+            await self.leave_stream(previous_stream_id, source)
+        
+        if event == WENT_LIVE:
+            self._followed_users[user_id] = stream_data.get("id")
+            await self.join_stream(stream_data.get("id"), source)
     
     async def _websocket_connection_loop(self):
-        """Main WebSocket connection loop"""
-        logger.info(f"📡 Connecting to stream chat: {self.current_stream_id}")
+        """Keep the websocket up, reconnecting with jittered exponential backoff"""
+        logger.info(f"📡 Connecting to stream chat: {', '.join(self._channel_ids)}")
+        attempt = 0
         
         while True:
+            connected_at = None
             try:
                 uri = f"{self.ws_url}?i={self.token}"
-                logger.info(f"Connecting to Barkle streaming: {uri}")
+                logger.info(f"Connecting to Barkle streaming: {self.ws_url}")
                 
-                async with websockets.connect(uri) as websocket:
+                async with websockets.connect(
+                    uri,
+                    ping_interval=BARKLE_WS_PING_INTERVAL,
+                    ping_timeout=BARKLE_WS_PING_TIMEOUT,
+                    close_timeout=5
+                ) as websocket:
+                    connected_at = time.monotonic()
+                    self._websocket = websocket
                     self.connected = True
+                    self.uptime.mark_connected()
                     logger.info("✅ Successfully connected to Barkle streaming")
                     
-                    # Subscribe to stream chat
+                    # Resubscribe every stream chat straight away
                     await self.subscribe_to_stream_chat(websocket)
                     
                     # Listen for messages
                     async for message in websocket:
                         try:
-                            data = json.loads(message)
-                            await self.process_streaming_message(data)
-                        except json.JSONDecodeError as e:
-                            logger.error(f"JSON decode error: {e}")
+                            await self.handle_raw_frame(message)
                         except Exception as e:
                             logger.error(f"Message processing error: {e}")
-                            
-            except websockets.exceptions.ConnectionClosed:
+                
                 logger.warning("WebSocket connection closed, reconnecting...")
-                self.connected = False
-                await asyncio.sleep(5)
+                            
+            except websockets.exceptions.ConnectionClosed as e:
+                logger.warning(f"WebSocket connection lost ({e}), reconnecting...")
             except Exception as e:
                 logger.error(f"Connection error: {e}")
-                self.connected = False
-                await asyncio.sleep(5)
+            
+            self._mark_disconnected()
+            
+            # Only a connection that stayed up a while resets the backoff
+            if connected_at and time.monotonic() - connected_at >= BARKLE_WS_STABLE_SECONDS:
+                attempt = 0
+            delay = backoff_delay(attempt, BARKLE_RECONNECT_MIN_DELAY, BARKLE_RECONNECT_MAX_DELAY)
+            attempt += 1
+            logger.info(f"🔄 Reconnecting in {delay:.1f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+    
+    def _mark_disconnected(self):
+        # Chat keeps flowing while we're away - remember how fast it was just now, to estimate what we missed
+        self.uptime.mark_disconnected(sum(
+            channel.chat_rate.recent_rate(BARKLE_OUTAGE_RATE_SECONDS) for channel in self.channels.values()
+        ))
+        self.connected = False
+        self._websocket = None
+        for channel in self.channels.values():
+            channel.subscribed = False
     
     async def subscribe_to_stream_chat(self, websocket):
-        """Subscribe to the stream chat channel"""
+        """Subscribe to the chat channel of every followed stream"""
+        for channel in list(self.channels.values()):
+            await self._subscribe_channel(websocket, channel)
+    
+    async def _subscribe_channel(self, websocket, channel):
+        """Subscribe one stream chat channel"""
         try:
             subscribe_message = {
                 "type": "connect",
                 "body": {
                     "channel": "streamChat",
-                    "id": self.connection_id,
+                    "id": channel.channel_id,
                     "params": {
-                        "streamId": self.current_stream_id
+                        "streamId": channel.stream_id
                     }
                 }
             }
             
             await websocket.send(json.dumps(subscribe_message))
-            logger.info(f"📺 Subscribed to stream chat for stream ID: {self.current_stream_id}")
+            logger.info(f"📺 Subscribed to stream chat for stream ID: {channel.stream_id}")
             
         except Exception as e:
             logger.error(f"Failed to subscribe to stream chat: {e}")
     
-    async def process_streaming_message(self, data):
-        """Process incoming streaming messages"""
-        try:
-            message_type = data.get("type")
-            
-            if message_type == "connected" and data.get("body", {}).get("id") == self.connection_id:
-                logger.info("✅ Successfully connected to stream chat channel")
-                
-            elif message_type == "channel" and data.get("body", {}).get("id") == self.connection_id:
-                body = data.get("body", {})
-                
-                if body.get("type") == "message":
-                    await self.handle_stream_chat_message(body.get("body", {}))
-                elif body.get("type") == "deleted":
-                    await self.handle_message_deletion(body.get("body", {}))
-                    
-        except Exception as e:
-            logger.error(f"Error processing streaming message: {e}")
-    
-    async def handle_stream_chat_message(self, message_data):
-        """Handle incoming stream chat messages"""
+    async def handle_raw_frame(self, raw):
+        """Fast path for websocket frames - reject foreign frames before decoding them"""
+        self.frames_received += 1
         try:
-            user_info = message_data.get("user", {})
-            user_name = user_info.get("name", user_info.get("username", "Anonymous"))
-            message_text = message_data.get("text", "")
-            
-            if not message_text.strip():
-                return
-                
-            # Record timestamp for speed tracking
-            current_time = time.time()
-            self.message_timestamps.append(current_time)
-            
-            # Add to buffer
-            formatted_message = f"{user_name}: {message_text}"
-            self.chat_buffer.append(formatted_message)
-            
-            logger.info(f"Stream Chat: {formatted_message}")
-            
-            # Check if we should process messages
-            await self.check_and_process_messages()
-                
-        except Exception as e:
-            logger.error(f"Error handling stream chat message: {e}")
-    
-    async def handle_message_deletion(self, deletion_data):
-        """Handle message deletion events"""
-        message_id = deletion_data.get("messageId", "")
-        logger.info(f"Message {message_id} deleted")
-    
-    async def check_and_process_messages(self):
-        """Enhanced processing logic with cooldown"""
-        buffer_length = len(self.chat_buffer)
-        
-        if buffer_length < 1:
+            frame = parse_frame(raw, self.connection_id)
+        except DECODE_ERRORS as e:
+            logger.error(f"JSON decode error: {e}")
             return
         
-        current_time = time.time()
-        time_since_last_response = current_time - self._last_response_time
-        chat_speed = self.calculate_chat_speed()
-        
-        logger.info(f"Chat speed: {chat_speed:.1f} msg/min, Buffer: {buffer_length}")
-        
-        # Check cooldown - prevent too frequent responses
-        if time_since_last_response < COOLDOWN:
-            remaining_cooldown = COOLDOWN - time_since_last_response
-            logger.info(f"⏳ Cooldown active: {remaining_cooldown:.1f}s remaining")
+        if frame is None:
+            self.frames_rejected += 1
             return
-        
-        # Processing logic with configurable thresholds
-        if chat_speed >= FAST_CHAT_THRESHOLD and buffer_length >= MIN_MESSAGES_FOR_GROQ:
-            logger.info(f"🚀 Using Groq (fast chat: {chat_speed:.1f} msg/min)")
-            await self.process_with_groq()
-        elif buffer_length >= 1:
-            logger.info(f"🎲 Using random selection ({buffer_length} messages)")
-            self.process_with_random_selection()
-        
-        # Fallback timeout processing (after cooldown expires)
-        elif buffer_length >= 1 and self._should_process_timeout():
-            logger.info(f"⏰ Timeout processing ({buffer_length} messages)")
-            self.process_with_random_selection()
-    
-    def _should_process_timeout(self):
-        """Check if we should process due to timeout"""
-        current_time = time.time()
-        time_since_last_response = current_time - self._last_response_time
-        time_since_last_process = current_time - self._last_process_time
-        
-        # Only timeout if cooldown has expired and we haven't processed in a while
-        return (time_since_last_response >= COOLDOWN and 
-                time_since_last_process >= TIMEOUT)
-    
-    async def process_with_groq(self):
-        """Process with Groq summarization"""
-        if not self.groq_summarizer.is_available():
-            logger.warning("Groq not available, using random selection")
-            self.process_with_random_selection()
-            return
-            
-        try:
-            summary = self.groq_summarizer.summarize_chat_messages(self.chat_buffer)
-            
-            if summary:
-                processed_text = f"Chat buzz: {summary}"
-                self.summary_queue.put(processed_text)
-                logger.info(f"Groq summary: {processed_text}")
-                
-                # Update response time
-                self._last_response_time = time.time()
-            else:
-                self.process_with_random_selection()
-            
-            self.chat_buffer.clear()
-            self._last_process_time = time.time()
-            
-        except Exception as e:
-            logger.error(f"Error in Groq processing: {e}")
-            self.process_with_random_selection()
+        await self._dispatch_frame(frame)
+    
+    async def process_streaming_message(self, data):
+        """Route an already decoded streaming message to its stream's channel"""
+        frame = ChannelFrame.from_dict(data)
+        if frame:
+            await self._dispatch_frame(frame)
     
-    def process_with_random_selection(self):
-        """Process with actual message content - SINGLE MESSAGE ONLY"""
+    async def _dispatch_frame(self, frame):
+        """Route a frame to its stream's channel"""
         try:
-            if not self.chat_buffer:
+            channel = self.channels.get(frame.channel_id)
+            if not channel:
+                self.frames_rejected += 1
                 return
             
-            # Always pick just ONE message, regardless of buffer size
-            selected_message = random.choice(self.chat_buffer)
-            
-            if ":" in selected_message:
-                user_name = selected_message.split(':', 1)[0].strip()
-                content = selected_message.split(':', 1)[1].strip()
-                summary = f"{content}"  # Just the content
-            else:
-                summary = f"{selected_message}"
-            
-            self.summary_queue.put(summary)
-            logger.info(f"Random selection: {summary}")
-            
-            # Update response time
-            self._last_response_time = time.time()
-            
-            self.chat_buffer.clear()
-            self._last_process_time = time.time()
+            if frame.type == "channel":
+                if frame.event == "message":
+                    await channel.handle_chat(ChatMessage.from_body(frame.body))
+                elif frame.event == "deleted":
+                    await channel.handle_message_deletion(frame.body)
             
+            elif frame.type == "connected":
+                channel.subscribed = True
+                logger.info(f"✅ Successfully connected to stream chat channel ({channel.stream_id})")
+                    
         except Exception as e:
-            logger.error(f"Error in random selection: {e}")
-            if self.chat_buffer:
-                simple_summary = f"Chat activity from {len(self.chat_buffer)} viewers"
-                self.summary_queue.put(simple_summary)
-                self._last_response_time = time.time()
-                self.chat_buffer.clear()
-                self._last_process_time = time.time()
+            logger.error(f"Error processing streaming message: {e}")
+    
+    def get_connection_stats(self):
+        """Get connected-time ratio, reconnect counts and outage windows"""
+        return self.uptime.get_stats()
+    
+    def get_ingest_stats(self):
+        """Get frame counters for the websocket ingest path"""
+        return {
+            "decoder": DECODER_NAME,
+            "frames_received": self.frames_received,
+            "frames_rejected": self.frames_rejected
+        }
     
     def calculate_chat_speed(self):
-        """Calculate messages per minute"""
-        current_time = time.time()
-        cutoff_time = current_time - CHAT_SPEED_WINDOW
-        recent_messages = [ts for ts in self.message_timestamps if ts >= cutoff_time]
-        return len(recent_messages) * (60 / CHAT_SPEED_WINDOW)
+        """Calculate messages per minute on the primary stream"""
+        channel = self.primary_channel
+        return channel.calculate_chat_speed() if channel else 0.0
+    
+    def get_buffer_stats(self):
+        """Get the primary stream's buffer and duplicate counters"""
+        channel = self.primary_channel
+        return channel.get_buffer_stats() if channel else None
+    
+    def get_chat_rates(self):
+        """Get the primary stream's chat rates, in messages per minute"""
+        channel = self.primary_channel
+        return channel.get_chat_rates() if channel else None
+    
+    def get_stream_metrics(self):
+        """Get per-stream metrics for every followed stream, keyed by stream ID"""
+        return {channel.stream_id: channel.get_stats() for channel in self.channels.values()}
+    
+    def _enqueue_summary(self, summary, started_at=None, final=True):
+        """Queue a summary for the main loop, stamped with its enqueue time.
+        
+        Streamed summaries arrive as several phrases sharing `started_at`
+        (when generation began); `final` marks the last one.
+        """
+        now = time.time()
+        self.summary_queue.put_nowait((now, summary, started_at or now, final))
+        self._max_queue_depth = max(self._max_queue_depth, self.summary_queue.qsize())
+    
+    def _record_dispatch(self, item):
+        """Record wait-time metrics for a dequeued summary"""
+        enqueued_at, summary, started_at, final = item
+        wait = time.time() - enqueued_at
+        self._summaries_dispatched += 1
+        self._total_summary_wait += wait
+        self._max_summary_wait = max(self._max_summary_wait, wait)
+        self._last_summary_wait = wait
+        return summary, started_at, final
     
     def get_summary(self):
-        """Get next summary from queue"""
+        """Get next summary from queue without waiting"""
         try:
-            return self.summary_queue.get_nowait()
-        except queue.Empty:
+            return self._record_dispatch(self.summary_queue.get_nowait())[0]
+        except asyncio.QueueEmpty:
             return None
     
+    async def wait_for_summary(self):
+        """Wait until a summary is available and return it"""
+        return (await self.wait_for_summary_chunk())[0]
+    
+    async def wait_for_summary_chunk(self):
+        """Wait for the next summary or streamed phrase.
+        
+        Returns (text, started_at, final) so speech can be timed from when
+        generation began and streamed phrases can play back to back.
+        """
+        return self._record_dispatch(await self.summary_queue.get())
+    
+    def get_summary_metrics(self):
+        """Get summary queue depth and wait-time metrics"""
+        dispatched = self._summaries_dispatched
+        return {
+            "queue_depth": self.summary_queue.qsize(),
+            "max_queue_depth": self._max_queue_depth,
+            "dispatched": dispatched,
+            "avg_wait_seconds": self._total_summary_wait / dispatched if dispatched else 0.0,
+            "max_wait_seconds": self._max_summary_wait,
+            "last_wait_seconds": self._last_summary_wait
+        }
+    
+    async def close(self):
+        """Stop live monitoring and release pooled HTTP connections"""
+        if self._detect_task:
+            self._detect_task.cancel()
+        for channel in self.channels.values():
+            channel.cancel()
+        if self.live_monitor:
+            await self.live_monitor.stop()
+        if self.stream_helper:
+            await self.stream_helper.close()
+    
     def is_connected(self):
         """Check connection status"""
         return self.connected
@@ -329,6 +451,7 @@ class EnhancedBarkleConnector:
         """Get current stream information"""
         return {
             "stream_id": self.current_stream_id,
+            "stream_ids": list(self._channel_ids),
             "connected": self.connected,
             "target_user": self.target_user_id,
             "auto_detect": BARKLE_AUTO_DETECT_STREAM,
@@ -337,13 +460,6 @@ class EnhancedBarkleConnector:
         }
     
     def get_cooldown_status(self):
-        """Get current cooldown status"""
-        current_time = time.time()
-        time_since_last_response = current_time - self._last_response_time
-        remaining_cooldown = max(0, COOLDOWN - time_since_last_response)
-        
-        return {
-            "cooldown_active": remaining_cooldown > 0,
-            "remaining_seconds": remaining_cooldown,
-            "last_response_time": self._last_response_time
-        }
+        """Get current cooldown status of the primary stream"""
+        channel = self.primary_channel
+        return channel.get_cooldown_status() if channel else None
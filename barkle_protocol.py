@@ -0,0 +1,72 @@
+"""Barkle streaming frames - fast JSON decoding and slotted records for the ingest path"""
+
+import json
+from config import BARKLE_JSON_DECODER
+
+def _load_decoder(name):
+    """Pick a JSON decoder: "orjson", "msgspec", "json", or "auto" for the fastest installed"""
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+            return "orjson", orjson.loads, (orjson.JSONDecodeError,)
+        except ImportError:
+            if name == "orjson":
+                raise
+    if name in ("auto", "msgspec"):
+        try:
+            import msgspec
+            return "msgspec", msgspec.json.Decoder().decode, (msgspec.DecodeError,)
+        except ImportError:
+            if name == "msgspec":
+                raise
+    return "json", json.loads, (json.JSONDecodeError,)
+
+DECODER_NAME, loads, DECODE_ERRORS = _load_decoder(BARKLE_JSON_DECODER)
+
+class ChannelFrame:
+    """A decoded frame: top-level type, the channel it's for, and the channel event"""
+    __slots__ = ("type", "channel_id", "event", "body")
+
+    def __init__(self, frame_type, channel_id, event, body):
+        self.type = frame_type
+        self.channel_id = channel_id
+        self.event = event
+        self.body = body
+
+    @classmethod
+    def from_dict(cls, data):
+        body = data.get("body")
+        if not isinstance(body, dict):
+            return None
+        inner = body.get("body")
+        return cls(data.get("type"), body.get("id"), body.get("type"), inner if isinstance(inner, dict) else {})
+
+class ChatMessage:
+    """The fields of a streamChat message the connector uses"""
+    __slots__ = ("user_name", "text", "message_id")
+
+    def __init__(self, user_name, text, message_id=None):
+        self.user_name = user_name
+        self.text = text
+        self.message_id = message_id
+
+    @classmethod
+    def from_body(cls, body):
+        user = body.get("user") or {}
+        return cls(user.get("name") or user.get("username") or "Anonymous", body.get("text") or "", body.get("id"))
+
+def parse_frame(raw, channel_prefix=None):
+    """Decode a raw frame, or return None without decoding if it can't be for our channels.
+
+    Every channel ID we open starts with `channel_prefix`, so frames that
+    don't contain it at all (other subscriptions, broadcasts) skip JSON
+    decoding entirely.
+    """
+    if channel_prefix:
+        needle = channel_prefix if isinstance(raw, str) else channel_prefix.encode("utf-8")
+        if needle not in raw:
+            return None
+    data = loads(raw)
+    if not isinstance(data, dict):
+        return None
+    return ChannelFrame.from_dict(data)
@@ -0,0 +1,139 @@
+"""Local stand-in for Barkle - the streaming websocket and live/get, for exercising the bot offline"""
+
+import json
+import logging
+import time
+from aiohttp import web, WSMsgType
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class BarkleStandIn:
+    """Speaks enough of Barkle's streaming protocol to drive the connector.
+
+    Clients `connect` to streamChat channels and get `connected` back;
+    `publish()` sends a chat message to every channel subscribed to its
+    stream, stamped with `sentAt` (epoch seconds) so delivery can be timed.
+    `live_streams` maps user IDs to the stream live/get reports them on.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, live_streams=None):
+        self.host = host
+        self.port = port
+        self.live_streams = dict(live_streams or {})
+        self._subscribers = {}  # stream ID -> {channel ID: websocket}
+        self._clients = set()
+        self._runner = None
+        self._next_message_id = 0
+
+        # Stats
+        self.connections = 0
+        self.published = 0
+        self.delivered = 0
+        self.unrouted = 0  # Published while nobody was subscribed to the stream
+
+    @property
+    def ws_url(self):
+        return f"ws://{self.host}:{self.port}/streaming"
+
+    @property
+    def api_url(self):
+        return f"http://{self.host}:{self.port}/api"
+
+    async def start(self):
+        """Start listening; with port 0 a free port is picked"""
+        app = web.Application()
+        app.router.add_get("/streaming", self._handle_streaming)
+        app.router.add_post("/api/live/get", self._handle_live_get)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"🧪 Barkle stand-in listening on {self.ws_url}")
+
+    async def stop(self):
+        await self.drop_clients()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def is_subscribed(self, stream_id):
+        return bool(self._subscribers.get(stream_id))
+
+    async def drop_clients(self):
+        """Close every client connection, as an outage would"""
+        for ws in list(self._clients):
+            await ws.close(code=1011, message=b"stand-in outage")
+
+    async def publish(self, stream_id, user_name, text, message_id=None):
+        """Send a chat message to everyone following a stream; returns its message ID"""
+        if message_id is None:
+            self._next_message_id += 1
+            message_id = f"replay{self._next_message_id}"
+        self.published += 1
+        await self._send_event(stream_id, "message", {
+            "id": message_id,
+            "text": text,
+            "user": {"name": user_name, "username": user_name},
+            "sentAt": time.time()
+        })
+        return message_id
+
+    async def delete(self, stream_id, message_id):
+        """Tell everyone following a stream that a message was deleted"""
+        await self._send_event(stream_id, "deleted", {"messageId": message_id, "sentAt": time.time()})
+
+    async def _send_event(self, stream_id, event, body):
+        subscribers = self._subscribers.get(stream_id)
+        if not subscribers:
+            self.unrouted += 1
+            return
+        for channel_id, ws in list(subscribers.items()):
+            frame = {"type": "channel", "body": {"id": channel_id, "type": event, "body": body}}
+            try:
+                await ws.send_str(json.dumps(frame))
+                self.delivered += 1
+            except (ConnectionError, RuntimeError):
+                pass  # Client went away mid-send; its handler cleans up
+
+    async def _handle_streaming(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        self._clients.add(ws)
+
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    data = json.loads(message.data)
+                except ValueError:
+                    continue
+
+                body = data.get("body") or {}
+                if data.get("type") == "connect" and body.get("channel") == "streamChat":
+                    stream_id = (body.get("params") or {}).get("streamId")
+                    self._subscribers.setdefault(stream_id, {})[body.get("id")] = ws
+                    await ws.send_str(json.dumps({"type": "connected", "body": {"id": body.get("id")}}))
+                elif data.get("type") == "disconnect":
+                    for subscribers in self._subscribers.values():
+                        subscribers.pop(body.get("id"), None)
+        finally:
+            self._clients.discard(ws)
+            for subscribers in self._subscribers.values():
+                for channel_id in [cid for cid, client in subscribers.items() if client is ws]:
+                    del subscribers[channel_id]
+        return ws
+
+    async def _handle_live_get(self, request):
+        try:
+            user_id = (await request.json()).get("userId") or ""
+        except ValueError:
+            return web.json_response({"error": "invalid JSON"}, status=400)
+
+        stream_id = self.live_streams.get(user_id) or self.live_streams.get(user_id.split(":", 1)[-1])
+        if not stream_id:
+            return web.json_response({"isActive": False, "userId": user_id})
+        viewers = len(self._subscribers.get(stream_id, ()))
+        return web.json_response({"isActive": True, "id": stream_id, "userId": user_id, "viewers": viewers})
@@ -0,0 +1,117 @@
+"""Microbenchmark for the Barkle websocket ingest path.
+
+Feeds synthetic frames through the previous per-frame path (json.loads,
+nested dict lookups, a formatted INFO log per chat line) and through the
+fast path (prefix rejection, optional orjson/msgspec, slotted records,
+lazy DEBUG logging), and prints messages/sec for each.
+
+    python bench_ingest.py [--frames 50000] [--foreign 0.3]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import barkle_protocol
+from barkle_connector import EnhancedBarkleConnector
+from chat_buffer import ChatEntry
+
+logger = logging.getLogger("bench_ingest")
+
+def make_frames(channel_id, count, foreign_ratio, seed=1):
+    """Chat frames for our channel, mixed with frames for channels we didn't open"""
+    rng = random.Random(seed)
+    phrases = ["lol", "gg", "what build is this", "POG", "hi chat", "that boss is brutal",
+               "first time here, love the stream", "KEKW", "can you explain the last part?"]
+    frames = []
+    for index in range(count):
+        target = "main" if rng.random() < foreign_ratio else channel_id
+        frames.append(json.dumps({
+            "type": "channel",
+            "body": {
+                "id": target,
+                "type": "message",
+                "body": {
+                    "id": f"msg{index}",
+                    "text": f"{rng.choice(phrases)} {rng.randrange(50)}",
+                    "user": {"name": f"viewer{rng.randrange(500)}", "username": f"viewer{rng.randrange(500)}"}
+                }
+            }
+        }))
+    return frames
+
+async def legacy_ingest(connector, raw):
+    """Replica of the per-frame work the connector did before the fast path"""
+    data = json.loads(raw)
+    if data.get("type") == "channel":
+        channel = connector.channels.get(data.get("body", {}).get("id"))
+        if not channel:
+            return
+        body = data.get("body", {})
+        if body.get("type") == "message":
+            message_data = body.get("body", {})
+            user_info = message_data.get("user", {})
+            user_name = user_info.get("name", user_info.get("username", "Anonymous"))
+            message_text = message_data.get("text", "")
+            if not message_text.strip():
+                return
+            channel.chat_rate.record()
+            duplicate = channel.dedup.find_duplicate(message_text)
+            if duplicate is not None:
+                duplicate.count += 1
+                logger.info(f"Stream Chat (repeat x{duplicate.count}): {user_name}: {message_text}")
+            else:
+                entry = ChatEntry(user_name, message_text)
+                channel.chat_buffer.append(entry)
+                channel.dedup.remember(entry)
+                logger.info(f"Stream Chat: {entry.formatted}")
+            logger.info(f"Chat speed: {channel.calculate_chat_speed():.1f} msg/min, Buffer: {len(channel.chat_buffer)}")
+
+async def run(handler, frames):
+    started = time.perf_counter()
+    for raw in frames:
+        await handler(raw)
+    return len(frames) / (time.perf_counter() - started)
+
+def fresh_connector():
+    connector = EnhancedBarkleConnector()
+    channel = connector.add_stream("bench-stream")
+    # Hold the channel in cooldown so only ingest is measured, not summarising
+    channel._last_response_time = float("inf")
+    return connector, channel
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=50000)
+    parser.add_argument("--foreign", type=float, default=0.3, help="share of frames for other channels")
+    args = parser.parse_args()
+
+    # INFO lines go somewhere real, as they would on a console
+    logging.getLogger().handlers.clear()
+    logging.basicConfig(level=logging.INFO, stream=open(os.devnull, "w"), force=True)
+
+    results = {}
+
+    connector, channel = fresh_connector()
+    frames = make_frames(channel.channel_id, args.frames, args.foreign)
+    results["previous (json, INFO per line)"] = await run(lambda raw: legacy_ingest(connector, raw), frames)
+
+    for decoder in ("json", "orjson", "msgspec"):
+        try:
+            _, barkle_protocol.loads, barkle_protocol.DECODE_ERRORS = barkle_protocol._load_decoder(decoder)
+        except ImportError:
+            continue
+        connector, channel = fresh_connector()
+        frames = make_frames(channel.channel_id, args.frames, args.foreign)
+        results[f"fast path ({decoder})"] = await run(connector.handle_raw_frame, frames)
+
+    baseline = next(iter(results.values()))
+    print(f"{args.frames} frames, {args.foreign:.0%} for other channels")
+    for name, rate in results.items():
+        print(f"  {name:32} {rate:>10,.0f} msg/s  ({rate / baseline:.1f}x)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
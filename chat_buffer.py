@@ -0,0 +1,197 @@
+"""Bounded chat buffer with pluggable overflow policies"""
+
+import random
+import time
+from collections import deque
+from config import (
+    CHAT_BUFFER_MAX_MESSAGES, CHAT_BUFFER_MAX_BYTES, CHAT_BUFFER_POLICY,
+    CHAT_BUFFER_PER_USER_LIMIT
+)
+
+class ChatEntry:
+    """One buffered chat message, standing in for `count` repeats of it"""
+    __slots__ = ("user", "text", "timestamp", "size", "count", "buffered")
+
+    def __init__(self, user, text, timestamp=None):
+        self.user = user
+        self.text = text
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.size = len(user.encode("utf-8")) + len(text.encode("utf-8")) + 2
+        self.count = 1
+        self.buffered = False
+
+    @property
+    def formatted(self):
+        if self.count > 1:
+            return f"{self.user}: {self.text} (x{self.count})"
+        return f"{self.user}: {self.text}"
+
+    def __str__(self):
+        return self.formatted
+
+class DropOldestPolicy:
+    """Make room by evicting the oldest messages"""
+    name = "drop_oldest"
+
+    def admit(self, buffer, entry):
+        buffer._push(entry)
+        buffer._trim_oldest("overflow")
+
+class ReservoirPolicy:
+    """Keep a uniform sample of everything offered since the last drain"""
+    name = "reservoir"
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    def admit(self, buffer, entry):
+        if len(buffer) < buffer.max_messages:
+            buffer._push(entry)
+            buffer._trim_oldest("overflow")
+            return
+
+        # Algorithm R: the new message replaces a random slot with probability k/n
+        slot = self.rng.randrange(buffer.offered_since_drain)
+        if slot < len(buffer):
+            buffer._replace(slot, entry)
+            buffer._trim_oldest("overflow")
+        else:
+            buffer._record_drop("reservoir")
+
+class PerUserCapPolicy:
+    """Keep at most `limit` messages per user, then evict the oldest overall"""
+    name = "per_user"
+
+    def __init__(self, limit=CHAT_BUFFER_PER_USER_LIMIT):
+        self.limit = limit
+
+    def admit(self, buffer, entry):
+        if buffer.count_for_user(entry.user) >= self.limit:
+            buffer._remove_oldest_from(entry.user, "per_user")
+        buffer._push(entry)
+        buffer._trim_oldest("overflow")
+
+OVERFLOW_POLICIES = {
+    DropOldestPolicy.name: DropOldestPolicy,
+    ReservoirPolicy.name: ReservoirPolicy,
+    PerUserCapPolicy.name: PerUserCapPolicy
+}
+
+def create_overflow_policy(name=CHAT_BUFFER_POLICY):
+    """Build an overflow policy by name"""
+    try:
+        return OVERFLOW_POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown chat buffer policy: {name}") from None
+
+class ChatBuffer:
+    """Chat messages awaiting a summary, bounded by count and by bytes"""
+
+    def __init__(self, max_messages=CHAT_BUFFER_MAX_MESSAGES, max_bytes=CHAT_BUFFER_MAX_BYTES,
+                 policy=None):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.policy = policy or create_overflow_policy()
+        self._entries = deque()
+        self._bytes = 0
+        self._user_counts = {}
+
+        # Counters
+        self.offered = 0
+        self.offered_since_drain = 0
+        self.dropped = 0
+        self.dropped_by_reason = {}
+
+    def append(self, entry):
+        """Offer a message to the buffer; the policy decides what gets kept"""
+        self.offered += 1
+        self.offered_since_drain += 1
+        self.policy.admit(self, entry)
+
+    def prepend(self, entries):
+        """Put drained messages back ahead of newer ones"""
+        # They count as offered again, or a reservoir would treat the window as barely sampled
+        self.offered_since_drain += len(entries)
+        for entry in reversed(entries):
+            self._entries.appendleft(entry)
+            self._account(entry, 1)
+        self._trim_oldest("overflow")
+
+    def drain(self):
+        """Remove and return every buffered message"""
+        entries = list(self._entries)
+        self.clear()
+        return entries
+
+    def clear(self):
+        for entry in self._entries:
+            entry.buffered = False
+        self._entries.clear()
+        self._bytes = 0
+        self._user_counts.clear()
+        self.offered_since_drain = 0
+
+    def count_for_user(self, user):
+        return self._user_counts.get(user, 0)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __getitem__(self, index):
+        return self._entries[index]
+
+    # Helpers for overflow policies
+
+    def _account(self, entry, sign):
+        entry.buffered = sign > 0
+        self._bytes += sign * entry.size
+        count = self._user_counts.get(entry.user, 0) + sign
+        if count > 0:
+            self._user_counts[entry.user] = count
+        else:
+            self._user_counts.pop(entry.user, None)
+
+    def _push(self, entry):
+        self._entries.append(entry)
+        self._account(entry, 1)
+
+    def _replace(self, index, entry):
+        self._record_drop("reservoir")
+        self._account(self._entries[index], -1)
+        del self._entries[index]
+        self._push(entry)
+
+    def _trim_oldest(self, reason):
+        while self._entries and (len(self._entries) > self.max_messages or self._bytes > self.max_bytes):
+            self._account(self._entries.popleft(), -1)
+            self._record_drop(reason)
+
+    def _remove_oldest_from(self, user, reason):
+        for index, entry in enumerate(self._entries):
+            if entry.user == user:
+                del self._entries[index]
+                self._account(entry, -1)
+                self._record_drop(reason)
+                return
+
+    def _record_drop(self, reason):
+        self.dropped += 1
+        self.dropped_by_reason[reason] = self.dropped_by_reason.get(reason, 0) + 1
+
+    def get_stats(self):
+        """Get buffer size and drop counters"""
+        return {
+            "messages": len(self._entries),
+            "bytes": self._bytes,
+            "policy": self.policy.name,
+            "offered": self.offered,
+            "dropped": self.dropped,
+            "dropped_by_reason": dict(self.dropped_by_reason)
+        }
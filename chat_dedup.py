@@ -0,0 +1,99 @@
+"""Streaming duplicate and near-duplicate detection for incoming chat"""
+
+import re
+from collections import OrderedDict, deque
+from config import CHAT_DEDUP_WINDOW, CHAT_DEDUP_SIMILARITY
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_REPEATED_LETTERS = re.compile(r"([^\W\d_])\1{2,}")  # Stretched letters only - "100" and "10" differ
+_REPEATED_UNITS = re.compile(r"(.+?)\1+")
+
+def normalize_message(text):
+    """Canonical form for spam comparison.
+
+    Case, punctuation and stretched letters are ignored ("LOOOL!!" == "lol")
+    but numbers are kept as written ("100" != "10"), and back-to-back
+    repeated words collapse so emote walls match one emote.
+    Messages with no words at all ("🔥🔥🔥", "???") keep their symbols, so
+    different reactions stay apart while walls of one still collapse.
+    """
+    folded = text.casefold()
+    normalized = _collapse_words(_REPEATED_LETTERS.sub(r"\1", _PUNCTUATION.sub(" ", folded)))
+    if normalized:
+        return normalized
+    # Emoji can span several code points (e.g. "❤️"), so collapse repeated runs, not chars
+    return _collapse_words(_REPEATED_UNITS.sub(r"\1", "".join(folded.split())))
+
+def _collapse_words(text):
+    words = []
+    for word in text.split():
+        if not words or words[-1] != word:
+            words.append(word)
+    return " ".join(words)
+
+def shingles(text, size=3):
+    """Character n-grams of normalized text"""
+    if len(text) <= size:
+        return frozenset([text])
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+class ChatDeduplicator:
+    """Finds the buffered entry a new message repeats, within a rolling window"""
+
+    def __init__(self, window=CHAT_DEDUP_WINDOW, similarity=CHAT_DEDUP_SIMILARITY):
+        self.window = window
+        self.similarity = similarity
+        self._exact = OrderedDict()  # normalized text -> entry
+        self._recent = deque(maxlen=window)  # (entry, normalized length, shingles)
+
+        # Counters
+        self.exact_hits = 0
+        self.near_hits = 0
+
+    def find_duplicate(self, text):
+        """Return the still-buffered entry this text repeats, or None"""
+        normalized = normalize_message(text)
+
+        entry = self._exact.get(normalized)
+        if entry is not None and entry.buffered:
+            self._exact.move_to_end(normalized)
+            self.exact_hits += 1
+            return entry
+
+        if self.similarity >= 1:
+            return None
+
+        # Near-duplicates: Jaccard similarity of character shingles.
+        # Jaccard can't reach the threshold if the lengths differ too much,
+        # so only texts within these length bounds are compared.
+        length = len(normalized)
+        min_length = length * self.similarity
+        max_length = length / self.similarity if self.similarity > 0 else float("inf")
+        candidate = None
+        for entry, other_length, other in reversed(self._recent):
+            if other_length < min_length or other_length > max_length or not entry.buffered:
+                continue
+            if candidate is None:
+                candidate = shingles(normalized)
+            overlap = len(candidate & other)
+            if overlap and overlap / (len(candidate) + len(other) - overlap) >= self.similarity:
+                self.near_hits += 1
+                return entry
+
+        return None
+
+    def remember(self, entry):
+        """Track a newly buffered entry"""
+        normalized = normalize_message(entry.text)
+        self._exact[normalized] = entry
+        self._exact.move_to_end(normalized)
+        while len(self._exact) > self.window:
+            self._exact.popitem(last=False)
+        self._recent.append((entry, len(normalized), shingles(normalized)))
+
+    def get_stats(self):
+        return {
+            "exact_duplicates": self.exact_hits,
+            "near_duplicates": self.near_hits,
+            "tracked": len(self._recent)
+        }
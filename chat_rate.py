@@ -0,0 +1,128 @@
+"""Chat rate estimators - bucketed sliding windows and an EWMA"""
+
+import math
+import time
+from config import CHAT_SPEED_WINDOW, CHAT_RATE_WINDOWS, CHAT_RATE_EWMA_SECONDS
+
+class SlidingWindowCounter:
+    """Count of events in the last `window` seconds, kept in a ring of time buckets.
+
+    Memory is fixed by the bucket count, not the chat rate, so the count never
+    saturates. Updates are amortized O(1); the window edge moves one bucket at a time.
+    """
+
+    def __init__(self, window, buckets=60):
+        self.window = window
+        self.bucket_seconds = window / buckets
+        self._counts = [0] * buckets
+        self._head = None  # Absolute index of the newest bucket
+        self._total = 0
+
+    def _advance(self, now):
+        bucket = int(now // self.bucket_seconds)
+        if self._head is None:
+            self._head = bucket
+            return
+        if bucket <= self._head:
+            return
+
+        # Clear every bucket that slid out of the window
+        size = len(self._counts)
+        for step in range(1, min(bucket - self._head, size) + 1):
+            index = (self._head + step) % size
+            self._total -= self._counts[index]
+            self._counts[index] = 0
+        self._head = bucket
+
+    def add(self, now=None, count=1):
+        now = time.time() if now is None else now
+        self._advance(now)
+        self._counts[self._head % len(self._counts)] += count
+        self._total += count
+
+    def count(self, now=None):
+        self._advance(time.time() if now is None else now)
+        return self._total
+
+    def rate_per_minute(self, now=None):
+        return self.count(now) * 60 / self.window
+
+    def recent_rate_per_minute(self, seconds, now=None):
+        """Rate over only the newest `seconds` of the window, in whole buckets.
+
+        The newest bucket is still filling, so it counts only for the time it has covered.
+        """
+        now = time.time() if now is None else now
+        self._advance(now)
+        if self._head is None:
+            return 0.0
+        size = len(self._counts)
+        buckets = max(1, min(size, round(seconds / self.bucket_seconds)))
+        total = sum(self._counts[(self._head - step) % size] for step in range(buckets))
+        head_elapsed = min(max(now - self._head * self.bucket_seconds, 0), self.bucket_seconds)
+        span = max((buckets - 1) * self.bucket_seconds + head_elapsed, self.bucket_seconds)
+        return total * 60 / span
+
+class EWMARate:
+    """Exponentially decayed event rate - reacts smoothly without a hard window edge"""
+
+    def __init__(self, time_constant=CHAT_RATE_EWMA_SECONDS):
+        self.time_constant = time_constant
+        self._value = 0.0
+        self._last = None
+
+    def _decay(self, now):
+        if self._last is not None and now > self._last:
+            self._value *= math.exp(-(now - self._last) / self.time_constant)
+        if self._last is None or now > self._last:
+            self._last = now
+
+    def add(self, now=None, count=1):
+        now = time.time() if now is None else now
+        self._decay(now)
+        self._value += count
+
+    def rate_per_minute(self, now=None):
+        self._decay(time.time() if now is None else now)
+        return self._value * 60 / self.time_constant
+
+class ChatRateTracker:
+    """Chat rate over several windows plus an EWMA, all in messages per minute"""
+
+    def __init__(self, windows=CHAT_RATE_WINDOWS, speed_window=CHAT_SPEED_WINDOW,
+                 ewma_seconds=CHAT_RATE_EWMA_SECONDS):
+        self.speed_window = speed_window
+        self.counters = {
+            window: SlidingWindowCounter(window)
+            for window in sorted(set(windows) | {speed_window})
+        }
+        self.ewma = EWMARate(ewma_seconds)
+        self.total_messages = 0
+
+    def record(self, now=None, count=1):
+        """Record incoming messages"""
+        now = time.time() if now is None else now
+        for counter in self.counters.values():
+            counter.add(now, count)
+        self.ewma.add(now, count)
+        self.total_messages += count
+
+    def rate(self, window=None, now=None):
+        """Messages per minute over a tracked window (default CHAT_SPEED_WINDOW)"""
+        return self.counters[window or self.speed_window].rate_per_minute(now)
+
+    def ewma_rate(self, now=None):
+        return self.ewma.rate_per_minute(now)
+
+    def recent_rate(self, seconds, now=None):
+        """Messages per minute over just the last few seconds, from the finest window covering them"""
+        covering = [window for window in self.counters if window >= seconds]
+        window = min(covering) if covering else max(self.counters)
+        return self.counters[window].recent_rate_per_minute(seconds, now)
+
+    def get_rates(self, now=None):
+        """Every tracked rate, keyed like "10s" / "60s" / "300s" / "ewma" """
+        now = time.time() if now is None else now
+        rates = {f"{window:g}s": counter.rate_per_minute(now) for window, counter in self.counters.items()}
+        rates["ewma"] = self.ewma.rate_per_minute(now)
+        return rates
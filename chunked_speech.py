@@ -0,0 +1,126 @@
+"""Chunked speech - phrases rendered in parallel and played back to back on one mixer channel"""
+
+import bisect
+import logging
+import time
+from collections import deque
+from concurrent.futures import wait
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ChunkedSpeech:
+    """One utterance split into phrases, each rendering in the background.
+
+    `render(phrase)` must return (Sound, LipSyncTrack or None); the executor's
+    worker count bounds how many phrases render at once.
+    """
+
+    def __init__(self, phrases, render, executor):
+        self.phrases = phrases
+        self._futures = [executor.submit(render, phrase) for phrase in phrases]
+
+    def __len__(self):
+        return len(self._futures)
+
+    def is_ready(self, index):
+        return self._futures[index].done()
+
+    def result(self, index):
+        """(Sound, LipSyncTrack or None) for a phrase; raises if rendering failed"""
+        return self._futures[index].result()
+
+    def wait_rendered(self):
+        """Block until every phrase has rendered, failed or been cancelled"""
+        wait(self._futures)
+
+    def cancel(self):
+        """Stop rendering phrases that haven't started yet"""
+        for future in self._futures:
+            future.cancel()
+
+class ChunkTimeline:
+    """Playback position and mouth states across every chunk of an utterance"""
+
+    def __init__(self):
+        self._offsets = []  # Start of each chunk, in seconds into the utterance
+        self._durations = []
+        self._tracks = []
+        self._chunk_started_at = None
+
+    @property
+    def started(self):
+        return self._chunk_started_at is not None
+
+    def begin_chunk(self, track, duration):
+        """Mark the next chunk as playing from now"""
+        offset = self._offsets[-1] + self._durations[-1] if self._offsets else 0.0
+        self._offsets.append(offset)
+        self._durations.append(duration)
+        self._tracks.append(track)
+        self._chunk_started_at = time.monotonic()
+
+    def position(self):
+        """Seconds into the utterance, or -1 before the first chunk starts"""
+        if not self.started:
+            return -1
+        return self._offsets[-1] + time.monotonic() - self._chunk_started_at
+
+    def is_open_at(self, seconds):
+        """Mouth state at a position, looked up in the chunk playing then"""
+        index = bisect.bisect_right(self._offsets, seconds) - 1
+        if index < 0 or not self._tracks[index]:
+            return False
+        return self._tracks[index].is_open_at(seconds - self._offsets[index])
+
+class ChunkPlayer:
+    """Feeds rendered chunks to a mixer channel as they become ready.
+
+    Each chunk is queued on the channel while the previous one plays, so
+    the mixer moves between them without a gap. Call `step()` every few
+    milliseconds until it returns False.
+    """
+
+    def __init__(self, speech, channel):
+        self.speech = speech
+        self.channel = channel
+        self.timeline = ChunkTimeline()
+        self.failed_chunks = 0
+        self.underruns = 0
+        self._next_index = 0
+        self._queued = deque()  # (sound, track) handed to the mixer but not yet playing
+
+    def step(self):
+        """Advance playback; returns False once every chunk has played"""
+        # A queued chunk that the mixer has moved on to is now the one playing
+        if self._queued and (self.channel.get_sound() is self._queued[0][0] or not self.channel.get_busy()):
+            sound, track = self._queued.popleft()
+            self.timeline.begin_chunk(track, sound.get_length())
+
+        while self._next_index < len(self.speech) and self.speech.is_ready(self._next_index):
+            if self.channel.get_busy() and self.channel.get_queue() is not None:
+                break
+
+            try:
+                sound, track = self.speech.result(self._next_index)
+            except Exception as e:
+                self.failed_chunks += 1
+                logger.error(f"Failed to render speech chunk {self._next_index + 1}: {e}")
+                self._next_index += 1
+                continue
+
+            if self.channel.get_busy():
+                self.channel.queue(sound)
+                self._queued.append((sound, track))
+            else:
+                if self.timeline.started:
+                    self.underruns += 1
+                self.channel.play(sound)
+                self.timeline.begin_chunk(track, sound.get_length())
+            self._next_index += 1
+
+        return self._next_index < len(self.speech) or self.channel.get_busy()
+
+    def stop(self):
+        self.speech.cancel()
+        self.channel.stop()
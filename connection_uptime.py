@@ -0,0 +1,75 @@
+"""Connection uptime tracking - connected-time ratio, reconnects and outage windows"""
+
+import time
+from collections import deque
+
+class ConnectionUptime:
+    """Records when a connection is up or down and what chat was likely missed while down"""
+
+    def __init__(self, max_outages=50):
+        self._started = time.time()
+        self._connected_since = None
+        self._connected_total = 0.0
+        self._outage_started = None
+        self._outage_rate = 0.0  # Chat rate (msg/min) when the outage began
+        self.outages = deque(maxlen=max_outages)  # (start, end, estimated messages missed)
+
+        # Counters
+        self.connects = 0
+        self.reconnects = 0
+        self.estimated_missed = 0.0
+
+    @property
+    def is_connected(self):
+        return self._connected_since is not None
+
+    def mark_connected(self):
+        if self.is_connected:
+            return
+        now = time.time()
+        self.connects += 1
+        if self._outage_started is not None:
+            self.reconnects += 1
+            missed = self._outage_rate * (now - self._outage_started) / 60
+            self.estimated_missed += missed
+            self.outages.append((self._outage_started, now, missed))
+            self._outage_started = None
+        self._connected_since = now
+
+    def mark_disconnected(self, chat_rate=0.0):
+        """Start an outage; `chat_rate` (msg/min) estimates what it costs.
+
+        A failed attempt before the first connect starts one too, so
+        startup outages show up in the stats.
+        """
+        now = time.time()
+        if self.is_connected:
+            self._connected_total += now - self._connected_since
+            self._connected_since = None
+        elif self._outage_started is not None:
+            return  # Still in the same outage
+        self._outage_started = now
+        self._outage_rate = chat_rate
+
+    def connected_seconds(self):
+        current = time.time() - self._connected_since if self.is_connected else 0.0
+        return self._connected_total + current
+
+    def get_stats(self):
+        """Get connected-time ratio, reconnect count and recent outage windows"""
+        now = time.time()
+        elapsed = now - self._started
+        durations = [end - start for start, end, _ in self.outages]
+        return {
+            "connected": self.is_connected,
+            "connected_ratio": self.connected_seconds() / elapsed if elapsed > 0 else 0.0,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "current_outage_seconds": now - self._outage_started if self._outage_started else 0.0,
+            "longest_outage_seconds": max(durations, default=0.0),
+            "estimated_messages_missed": round(self.estimated_missed),
+            "outages": [
+                {"start": start, "end": end, "seconds": end - start, "estimated_missed": round(missed)}
+                for start, end, missed in self.outages
+            ]
+        }
@@ -10,6 +10,24 @@ BARKLE_TARGET_USER_ID = "username_to_monitor"
 # Stream Configuration Options
 BARKLE_STREAM_ID = "target_stream_id_here" 
 BARKLE_AUTO_DETECT_STREAM = True
+BARKLE_STREAM_IDS = []            # Extra streams whose chats are followed over the same connection
+BARKLE_FOLLOW_LIVE_USERS = False  # Also follow the chats of LIVE_MONITOR_USERS while they're live
+BARKLE_JSON_DECODER = "auto"      # "orjson", "msgspec", "json", or "auto" (fastest installed)
+BARKLE_WS_PING_INTERVAL = 20      # Seconds between websocket keepalive pings
+BARKLE_WS_PING_TIMEOUT = 10       # Seconds without a pong before the connection counts as dead
+BARKLE_RECONNECT_MIN_DELAY = 1    # First reconnect waits up to this long (jittered, doubles each failure)
+BARKLE_RECONNECT_MAX_DELAY = 60
+BARKLE_WS_STABLE_SECONDS = 30     # A connection up this long resets the reconnect backoff
+BARKLE_OUTAGE_RATE_SECONDS = 3    # Chat rate over this many seconds before a drop estimates messages missed
+BARKLE_API_URL = "https://barkle.chat/api"  # Point at a local stub server for testing
+BARKLE_HTTP_TIMEOUT = 10          # Total seconds per stream API request
+BARKLE_HTTP_CONNECT_TIMEOUT = 5   # Seconds to establish a connection
+BARKLE_HTTP_MAX_RETRIES = 2       # Retries for connection errors, timeouts, 429 and 5xx
+BARKLE_HTTP_RETRY_BASE_DELAY = 0.5  # First retry waits up to this long (jittered, doubles each retry)
+BARKLE_HTTP_RETRY_MAX_DELAY = 8     # Longest wait between retries, including a server's Retry-After
+BARKLE_HTTP_POOL_SIZE = 10        # Kept-alive connections shared by stream API calls
+BARKLE_STREAM_CACHE_TTL = 5       # Seconds a live/get answer is reused for the same user
+BARKLE_STREAM_CACHE_MAX_ENTRIES = 256  # Users whose live/get answer is kept; least recently used go first
 
 # YouTube Configuration
 YOUTUBE_VIDEO_ID = None  # Will auto-detect if None, or provide specific video ID
@@ -24,17 +42,54 @@ TWITCH_BOT_NICK = "your_bot_nickname"
 # Groq API Configuration  
 GROQ_API_KEY = "your_groq_api_key_here"
 GROQ_MODEL = "llama-3.3-70b-versatile"
+GROQ_MAX_CONCURRENT_REQUESTS = 1  # Summary requests sent to Groq at once
+GROQ_MAX_PENDING_REQUESTS = 2     # Requests per followed stream allowed to wait before new ones are rejected
+GROQ_SUMMARY_DEADLINE = 10        # Seconds before an in-flight summary counts as stale
+GROQ_STALE_POLICY = "drop"        # "drop" late summaries, or "merge" their messages into the next one
+GROQ_PROMPT_TOKEN_BUDGET = 1000   # Approximate tokens of chat included in each summary prompt
+GROQ_STREAMING = True             # Stream summaries and start speaking each phrase as it completes
+GROQ_REQUEST_TIMEOUT = 8          # Deadline (seconds) for each Groq attempt and each streamed chunk
+GROQ_MAX_RETRIES = 2              # Retries after timeouts, connection errors, 5xx and 429s (within GROQ_SUMMARY_DEADLINE)
+GROQ_RETRY_BASE_DELAY = 0.5       # First retry waits up to this long (jittered, doubles each retry)
+GROQ_RETRY_MAX_DELAY = 5         # Longest wait between retries, including a 429's Retry-After
+GROQ_REQUESTS_PER_MINUTE = 30     # Token-bucket pacing for Groq requests
+GROQ_REQUEST_BURST = 5
+GROQ_BREAKER_FAILURES = 3         # Consecutive failed summaries (after retries) that open the circuit (random selection only)
+GROQ_BREAKER_RESET_SECONDS = 60   # Time before a single trial request is let through again
+SUMMARY_CACHE_ENABLED = True      # Reuse summaries for repeated chat windows
+SUMMARY_CACHE_TTL = 120           # Seconds a cached summary stays valid
+SUMMARY_CACHE_MAX_ENTRIES = 64
+SUMMARY_CACHE_SIMILARITY = 0.8    # Window overlap that reuses a summary (1 = exact match only)
+
+# Response Timing
+COOLDOWN = 20  # Seconds between responses
+TIMEOUT = 30   # Timeout for processing messages
 
 # Chat Speed Detection
 FAST_CHAT_THRESHOLD = 5    
 CHAT_SPEED_WINDOW = 60
+CHAT_SPEED_ESTIMATOR = "window"      # "window" (last CHAT_SPEED_WINDOW seconds) or "ewma"
+CHAT_RATE_WINDOWS = [10, 60, 300]    # Windows (seconds) tracked for metrics
+CHAT_RATE_EWMA_SECONDS = 30          # EWMA time constant
 MIN_MESSAGES_FOR_GROQ = 4  
 RANDOM_SAMPLE_SIZE = 3
 
+# Chat Buffer Limits
+CHAT_BUFFER_MAX_MESSAGES = 200     # Messages held while waiting for a summary
+CHAT_BUFFER_MAX_BYTES = 32768      # Total text held while waiting for a summary
+CHAT_BUFFER_POLICY = "drop_oldest" # "drop_oldest", "reservoir" or "per_user"
+CHAT_BUFFER_PER_USER_LIMIT = 5     # Messages kept per user with the "per_user" policy
+CHAT_DEDUP_WINDOW = 100            # Recent messages checked for repeats
+CHAT_DEDUP_SIMILARITY = 0.8        # Shingle similarity that counts as a repeat (1 = exact only)
+
 # OBS Configuration
 OBS_HOST = "localhost"
 OBS_PORT = 4455
 OBS_PASSWORD = ""
+OBS_ASYNC = True           # Asyncio OBS client on the main loop (False = threaded obs-websocket-py client)
+OBS_REQUEST_TIMEOUT = 2    # Seconds to wait for an OBS response
+OBS_RECONNECT_MIN_DELAY = 1   # First reconnect delay after OBS goes away (doubles each failure)
+OBS_RECONNECT_MAX_DELAY = 30  # Longest reconnect delay
 
 # Scene and Source Names
 MAIN_SCENE = "chatty"
@@ -44,11 +99,37 @@ LIPS_OPEN_SOURCE = "lips-open"
 
 # Animation Settings
 ANIMATION_SPEED = 0.2
+LIP_SYNC_ENABLED = True           # Drive the mouth from the speech audio instead of a fixed timer
+LIP_SYNC_FRAME_SECONDS = 0.05     # Envelope frame size and animation tick
+LIP_SYNC_OPEN_THRESHOLD = 0.35    # Relative loudness that opens the mouth
+LIP_SYNC_CLOSE_THRESHOLD = 0.2    # Relative loudness that closes it again
 
 # TTS Settings
 TTS_LANGUAGE = "en"
 TTS_SLOW = False
+TTS_ENGINE = "auto"        # "gtts", "espeak" (offline, needs espeak-ng) or "auto" (gtts with espeak fallback)
+TTS_ENGINE_DEADLINE = 3.0  # Seconds gTTS gets before falling back to the local engine
+TTS_FALLBACK_COOLDOWN = 60 # Seconds to stay on the local engine after a miss
+TTS_IN_MEMORY = True       # Keep synthesized audio in memory instead of temp files
+TTS_CACHE_ENABLED = True   # Reuse audio for repeated lines
+TTS_CACHE_MEMORY_MB = 32   # Memory tier size limit
+TTS_CACHE_DIR = None       # Directory for the on-disk tier, e.g. "tts_cache" (None = memory only)
+TTS_CACHE_DISK_MB = 256    # Disk tier size limit
+TTS_CHUNKED = True         # Split long lines into phrases and start playing the first while the rest render
+TTS_CHUNK_PARALLELISM = 2  # Phrases synthesized at once in chunked mode
+TTS_PREWARM_PHRASES = []   # Phrases to synthesize at startup, e.g. ["lol", "hi chatty"]
 SUMMARY_DELAY = 2
+SPEECH_LOOKAHEAD = 1       # Utterances synthesized ahead of the one playing
+SPEECH_STALE_AFTER = 60    # Seconds before a queued summary is dropped (0 = never)
+SPEECH_CHUNK_MIN_CHARS = 20   # Shortest phrase split off at a sentence or clause boundary
+SPEECH_CHUNK_MAX_CHARS = 120  # Longest phrase before forcing a split at a space
 
 # Stream Monitoring
 STREAM_CHECK_INTERVAL = 30 
+LIVE_MONITOR_USERS = []          # Other creators to watch for go-live/go-offline events
+LIVE_MONITOR_CONCURRENCY = 8     # Live checks in flight at once
+LIVE_MONITOR_MAX_INTERVAL = 300  # Longest gap between checks of a long-offline creator
+LIVE_MONITOR_BACKOFF = 1.5       # Offline check interval grows by this much each check
+LIVE_MONITOR_LIVE_INTERVAL = 60  # Check interval while a creator is live (to spot go-offline)
+LIVE_MONITOR_HOT_MINUTES = 30    # Poll at STREAM_CHECK_INTERVAL within this many minutes of a usual go-live time
+LIVE_MONITOR_USUAL_TIMES = {}    # Known schedules, e.g. {"username": ["19:00", "21:30"]} (local time)
@@ -0,0 +1,158 @@
+"""Resilience helpers for Groq requests - circuit breaker, pacing, backoff, latency histogram"""
+
+import asyncio
+import bisect
+import time
+from backoff import backoff_delay as _jittered_backoff
+from config import (
+    GROQ_BREAKER_FAILURES, GROQ_BREAKER_RESET_SECONDS, GROQ_REQUESTS_PER_MINUTE, GROQ_REQUEST_BURST,
+    GROQ_RETRY_BASE_DELAY, GROQ_RETRY_MAX_DELAY
+)
+
+def backoff_delay(attempt, base=GROQ_RETRY_BASE_DELAY, cap=GROQ_RETRY_MAX_DELAY):
+    """Groq retry delay - full-jitter backoff with the GROQ_RETRY_* settings"""
+    return _jittered_backoff(attempt, base, cap)
+
+class CircuitBreaker:
+    """Stops calls to an unhealthy API, letting one trial call through after a cool-off.
+
+    Callers claim a call with `begin_request()` and report one outcome per
+    logical request (after any retries) with `record_success()`/`record_failure()`.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=GROQ_BREAKER_FAILURES, reset_timeout=GROQ_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0
+        self._trial_started = None  # When the half-open trial was let through
+        self.times_opened = 0
+
+    @property
+    def state(self):
+        if self._state == self.OPEN and time.time() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def _trial_in_flight(self):
+        # A trial that never reported back stops blocking after another cool-off
+        return self._trial_started is not None and time.time() - self._trial_started < self.reset_timeout
+
+    def allow_request(self):
+        """Check whether a call would be let through, without claiming it"""
+        state = self.state
+        if state == self.HALF_OPEN:
+            return not self._trial_in_flight()
+        return state == self.CLOSED
+
+    def begin_request(self):
+        """Claim a call; while half-open only one trial is let through at a time"""
+        if not self.allow_request():
+            return False
+        if self.state == self.HALF_OPEN:
+            self._trial_started = time.time()
+        return True
+
+    def release(self):
+        """Give back a trial that ended without an outcome (e.g. cancelled)"""
+        self._trial_started = None
+
+    def record_success(self):
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._trial_started = None
+
+    def record_failure(self):
+        self._consecutive_failures += 1
+        self._trial_started = None
+        state = self.state
+        # A failed trial re-opens immediately
+        if state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if state != self.OPEN:
+                self.times_opened += 1
+            self._state = self.OPEN
+            self._opened_at = time.time()
+
+    def get_stats(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "times_opened": self.times_opened
+        }
+
+class TokenBucket:
+    """Paces requests to a rate limit; 429s can pause it for the server's Retry-After"""
+
+    def __init__(self, rate_per_minute=GROQ_REQUESTS_PER_MINUTE, burst=GROQ_REQUEST_BURST):
+        self.rate = rate_per_minute / 60
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self.waits = 0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(self._paused_until - now, 0)
+            if not wait and self._tokens >= 1:
+                self._tokens -= 1
+                return
+            if not wait:
+                wait = (1 - self._tokens) / self.rate
+            self.waits += 1
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold all requests for `seconds` (e.g. a 429's Retry-After)"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def is_paused(self):
+        """Check if requests are being held for a Retry-After"""
+        return time.monotonic() < self._paused_until
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self, bounds=(0.25, 0.5, 1, 2, 4, 8, 16)):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given percentile"""
+        if not self.total:
+            return 0.0
+        target = fraction * self.total
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return self.bounds[index] if index < len(self.bounds) else float("inf")
+        return float("inf")
+
+    def get_stats(self):
+        labels = [f"<={bound:g}s" for bound in self.bounds] + [f">{self.bounds[-1]:g}s"]
+        return {
+            "count": self.total,
+            "avg_seconds": self.sum / self.total if self.total else 0.0,
+            "p50_seconds": self.percentile(0.5),
+            "p95_seconds": self.percentile(0.95),
+            "buckets": dict(zip(labels, self.counts))
+        }
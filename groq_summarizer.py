@@ -1,20 +1,55 @@
 """Updated Groq summarizer with version compatibility"""
 
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 try:
-    from groq import Groq
+    from groq import Groq, AsyncGroq
+    from groq import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
     GROQ_AVAILABLE = True
 except ImportError:
     GROQ_AVAILABLE = False
     
-from config import GROQ_API_KEY, GROQ_MODEL
+from prompt_builder import PromptBuilder, estimate_tokens
+from summary_cache import SummaryCache
+from groq_resilience import CircuitBreaker, TokenBucket, LatencyHistogram, backoff_delay
+from config import (
+    GROQ_API_KEY, GROQ_MODEL, GROQ_MAX_CONCURRENT_REQUESTS, GROQ_MAX_PENDING_REQUESTS,
+    SUMMARY_CACHE_ENABLED, GROQ_REQUEST_TIMEOUT, GROQ_MAX_RETRIES, GROQ_SUMMARY_DEADLINE, GROQ_RETRY_MAX_DELAY
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class SummaryDeadlineExceeded(asyncio.TimeoutError):
+    """A summary couldn't be produced before its deadline"""
+
 class GroqSummarizer:
     def __init__(self):
         self.client = None
+        self.async_client = None
+        self.prompt_builder = PromptBuilder()
+        self.summary_cache = SummaryCache() if SUMMARY_CACHE_ENABLED else None
+        self.last_prompt_tokens = 0
+        self.last_prompt_messages = 0
+        
+        # Bounded request queue for the async path
+        self._request_slots = asyncio.Semaphore(GROQ_MAX_CONCURRENT_REQUESTS)
+        self._pending_requests = 0
+        self.max_pending_requests = GROQ_MAX_PENDING_REQUESTS
+        self.rejected_requests = 0
+        
+        # Resilience: breaker, pacing, and stats
+        self.breaker = CircuitBreaker()
+        self.rate_limiter = TokenBucket()
+        self.latency = LatencyHistogram()
+        self.first_token_latency = LatencyHistogram()
+        self.retries = 0
+        self.timeouts = 0
+        self.rate_limited = 0
+        self.short_circuited = 0
+        
         if GROQ_AVAILABLE:
             self.initialize_client()
         
@@ -25,55 +60,372 @@ class GroqSummarizer:
                 logger.warning("Groq API key not configured")
                 return False
             
-            # Simple initialization without extra parameters
-            self.client = Groq(api_key=GROQ_API_KEY)
+            # Retries are handled here, so the client gets a deadline and no retries of its own
+            self.client = Groq(api_key=GROQ_API_KEY, timeout=GROQ_REQUEST_TIMEOUT, max_retries=0)
+            self.async_client = AsyncGroq(api_key=GROQ_API_KEY, timeout=GROQ_REQUEST_TIMEOUT, max_retries=0)
             logger.info("Groq client initialized successfully")
             return True
         except Exception as e:
             logger.warning(f"Groq client initialization failed: {e}")
             return False
     
+    def _build_request_messages(self, messages, chat_context):
+        """Build the chat completion messages for a summary request"""
+        selected, _ = self.prompt_builder.select_messages(messages)
+        chat_text = "\n".join(selected)
+        
+        prompt = f"""
+        Create a brief, natural summary of this chat conversation from the {chat_context} channel. 
+        Focus on main topics and participants. Keep it conversational and under 20 words.
+        
+        Chat messages:
+        {chat_text}
+        
+        Summary:"""
+        
+        system_prompt = "You are a helpful assistant that summarizes chat conversations concisely."
+        
+        self.last_prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(prompt)
+        self.last_prompt_messages = len(selected)
+        logger.info(f"Groq prompt: {len(selected)}/{len(messages)} messages, ~{self.last_prompt_tokens} tokens")
+        
+        return [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user", 
+                "content": prompt
+            }
+        ]
+    
     def summarize_chat_messages(self, messages, chat_context="general"):
         """Summarize chat messages using Groq"""
         if not self.client or not messages:
             return None
+        
+        cached = self._get_cached_summary(messages)
+        if cached:
+            return cached
+        
+        if not self._breaker_allows():
+            return None
             
         try:
-            chat_text = "\n".join(messages)
-            
-            prompt = f"""
-            Create a brief, natural summary of this chat conversation from the {chat_context} channel. 
-            Focus on main topics and participants. Keep it conversational and under 20 words.
-            
-            Chat messages:
-            {chat_text}
-            
-            Summary:"""
-            
+            started = time.time()
             response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that summarizes chat conversations concisely."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
+                messages=self._build_request_messages(messages, chat_context),
                 model=GROQ_MODEL,
                 max_tokens=50,
                 temperature=0.7
             )
+            self._record_success(time.time() - started)
+            
+            summary = response.choices[0].message.content.strip()
+            logger.info(f"Groq summary generated: {summary}")
+            self._cache_summary(messages, summary, time.time() - started)
+            return summary
+            
+        except Exception as e:
+            self.breaker.record_failure()
+            logger.error(f"Error generating Groq summary: {e}")
+            return None
+    
+    async def summarize_chat_messages_async(self, messages, chat_context="general",
+                                            deadline=GROQ_SUMMARY_DEADLINE, started_at=None):
+        """Summarize chat messages using Groq without blocking the event loop.
+        
+        The summary is due `deadline` seconds after `started_at` (a time.time()
+        value, default now); waiting, retrying and the request itself all stop
+        there, raising SummaryDeadlineExceeded. Other failures return None.
+        """
+        if not self.async_client or not messages:
+            return None
+        deadline_at = self._deadline_at(deadline, started_at)
+        
+        cached = self._get_cached_summary(messages)
+        if cached:
+            return cached
+        
+        # Reject instead of queueing without bound when Groq falls behind
+        if not self.has_capacity():
+            self.rejected_requests += 1
+            logger.warning(f"Groq request queue full or rate limited ({self._pending_requests} pending), skipping summary")
+            return None
+        
+        if not self._breaker_allows():
+            return None
+        
+        self._pending_requests += 1
+        try:
+            async with self._request_slot(deadline_at):
+                response, started = await self._request_with_retries(
+                    self._build_request_messages(messages, chat_context), deadline=deadline_at
+                )
+            latency = time.time() - started
+            self._record_success(latency)
             
             summary = response.choices[0].message.content.strip()
             logger.info(f"Groq summary generated: {summary}")
+            self._cache_summary(messages, summary, latency)
             return summary
             
+        except SummaryDeadlineExceeded:
+            raise
         except Exception as e:
+            if time.monotonic() >= deadline_at:
+                raise SummaryDeadlineExceeded() from e
             logger.error(f"Error generating Groq summary: {e}")
             return None
+        finally:
+            self._pending_requests -= 1
+    
+    async def stream_summary_async(self, messages, chat_context="general",
+                                   deadline=GROQ_SUMMARY_DEADLINE, started_at=None):
+        """Stream a summary, yielding text deltas as Groq generates them.
+        
+        The first token is due `deadline` seconds after `started_at` (as for
+        summarize_chat_messages_async), else SummaryDeadlineExceeded is raised.
+        Retries only happen before the first token; once text has been yielded
+        a failure ends the stream with an exception.
+        """
+        if not self.async_client or not messages:
+            return
+        deadline_at = self._deadline_at(deadline, started_at)
+        
+        cached = self._get_cached_summary(messages)
+        if cached:
+            yield cached
+            return
+        
+        if not self.has_capacity():
+            self.rejected_requests += 1
+            logger.warning(f"Groq request queue full or rate limited ({self._pending_requests} pending), skipping summary")
+            return
+        
+        if not self._breaker_allows():
+            return
+        
+        self._pending_requests += 1
+        try:
+            async with self._request_slot(deadline_at):
+                try:
+                    stream, started = await self._request_with_retries(
+                        self._build_request_messages(messages, chat_context), stream=True, deadline=deadline_at
+                    )
+                except Exception as e:
+                    if isinstance(e, SummaryDeadlineExceeded) or time.monotonic() < deadline_at:
+                        raise
+                    raise SummaryDeadlineExceeded() from e
+                
+                parts = []
+                chunks = stream.__aiter__()
+                while True:
+                    # Until the first token arrives the summary deadline applies too
+                    timeout = GROQ_REQUEST_TIMEOUT
+                    if not parts:
+                        timeout = min(timeout, deadline_at - time.monotonic())
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), max(timeout, 0))
+                    except StopAsyncIteration:
+                        break
+                    except Exception as e:
+                        self.breaker.record_failure()
+                        if not parts and time.monotonic() >= deadline_at:
+                            raise SummaryDeadlineExceeded() from e
+                        raise
+                    
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    if not parts:
+                        self.first_token_latency.observe(time.time() - started)
+                    parts.append(delta)
+                    yield delta
+            
+            latency = time.time() - started
+            self._record_success(latency)
+            
+            summary = "".join(parts).strip()
+            logger.info(f"Groq summary streamed: {summary}")
+            self._cache_summary(messages, summary, latency)
+            
+        finally:
+            self._pending_requests -= 1
+    
+    def _deadline_at(self, deadline, started_at):
+        """time.monotonic() value `deadline` seconds after `started_at` (a time.time() value)"""
+        elapsed = time.time() - started_at if started_at is not None else 0
+        return time.monotonic() + deadline - elapsed
+    
+    @asynccontextmanager
+    async def _request_slot(self, deadline_at):
+        """Hold one of the concurrent request slots, waiting no later than `deadline_at`"""
+        try:
+            await asyncio.wait_for(self._request_slots.acquire(), max(deadline_at - time.monotonic(), 0))
+        except asyncio.TimeoutError as e:
+            # Stuck behind other requests - Groq's turn never came, so no verdict on its health
+            self.breaker.release()
+            raise SummaryDeadlineExceeded() from e
+        try:
+            yield
+        finally:
+            self._request_slots.release()
+    
+    async def _request_with_retries(self, request_messages, stream=False, deadline=None):
+        """Call Groq with a per-attempt deadline, paced and retried with jittered backoff.
+        
+        Attempts are cut short at `deadline` (a time.monotonic() value), and
+        the breaker sees one failure per call, once retries are given up.
+        Returns the response (a chunk stream if `stream`) and when the successful attempt started.
+        """
+        try:
+            return await self._attempt_until_done(request_messages, stream, deadline)
+        except asyncio.CancelledError:
+            # Cancelled from outside (e.g. shutdown) - no verdict on Groq's health
+            self.breaker.release()
+            raise
+    
+    async def _attempt_until_done(self, request_messages, stream, deadline):
+        attempt = 0
+        while True:
+            if not await self._paced_before(deadline):
+                # Out of time waiting to send - earlier failed attempts still count against Groq
+                if attempt:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.release()
+                raise SummaryDeadlineExceeded()
+            started = time.time()
+            timeout = GROQ_REQUEST_TIMEOUT
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+            try:
+                if timeout <= 0:
+                    raise asyncio.TimeoutError()
+                response = await asyncio.wait_for(
+                    self.async_client.chat.completions.create(
+                        messages=request_messages,
+                        model=GROQ_MODEL,
+                        max_tokens=50,
+                        temperature=0.7,
+                        stream=stream
+                    ),
+                    timeout
+                )
+                return response, started
+                
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.timeouts += 1
+                elif isinstance(e, RateLimitError):
+                    self.rate_limited += 1
+                    self.rate_limiter.pause(self._retry_after(e))
+                
+                retryable = isinstance(e, (
+                    asyncio.TimeoutError, APIConnectionError, APITimeoutError,
+                    InternalServerError, RateLimitError
+                ))
+                delay = backoff_delay(attempt)
+                out_of_time = deadline is not None and time.monotonic() + delay >= deadline
+                if not retryable or attempt >= GROQ_MAX_RETRIES or out_of_time:
+                    self.breaker.record_failure()
+                    raise
+                
+                attempt += 1
+                self.retries += 1
+                logger.warning(f"Groq request failed ({type(e).__name__}), retry {attempt} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    async def _paced_before(self, deadline):
+        """Wait for the rate limiter; False if that would run past `deadline`"""
+        if deadline is None:
+            await self.rate_limiter.acquire()
+            return True
+        try:
+            await asyncio.wait_for(self.rate_limiter.acquire(), max(deadline - time.monotonic(), 0))
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def _retry_after(self, error):
+        """Seconds the server asked us to wait (at most GROQ_RETRY_MAX_DELAY), defaulting to one backoff step"""
+        try:
+            seconds = float(error.response.headers.get("retry-after"))
+        except (AttributeError, TypeError, ValueError):
+            return backoff_delay(0)
+        return min(max(seconds, 0), GROQ_RETRY_MAX_DELAY)
+    
+    def _breaker_allows(self):
+        """Short-circuit while the API is unhealthy"""
+        if self.breaker.begin_request():
+            return True
+        self.short_circuited += 1
+        logger.warning("Groq circuit open, skipping summary")
+        return False
+    
+    def _record_success(self, latency):
+        self.latency.observe(latency)
+        self.breaker.record_success()
+    
+    def _get_cached_summary(self, messages):
+        """Reuse the summary of an identical or near-identical recent window"""
+        if not self.summary_cache:
+            return None
+        summary = self.summary_cache.get(messages)
+        if summary:
+            logger.info(f"Groq summary cache hit: {summary}")
+        return summary
+    
+    def _cache_summary(self, messages, summary, latency):
+        if self.summary_cache:
+            self.summary_cache.put(messages, summary, latency)
+    
+    def get_cache_stats(self):
+        """Get summary cache hit rates and time saved"""
+        return self.summary_cache.get_stats() if self.summary_cache else None
+    
+    def get_prompt_stats(self):
+        """Get the size of the last prompt sent to Groq"""
+        return {
+            "token_budget": self.prompt_builder.token_budget,
+            "last_prompt_tokens": self.last_prompt_tokens,
+            "last_prompt_messages": self.last_prompt_messages
+        }
+    
+    def set_stream_count(self, streams):
+        """Allow GROQ_MAX_PENDING_REQUESTS waiting requests per followed stream"""
+        self.max_pending_requests = GROQ_MAX_PENDING_REQUESTS * max(1, streams)
+    
+    def has_capacity(self):
+        """Check if another request would be queued rather than rejected.
+        
+        Not while a 429 has paused requests - summaries would only wait out the pause.
+        """
+        return self._pending_requests < self.max_pending_requests and not self.rate_limiter.is_paused()
+    
+    def get_pending_requests(self):
+        """Get number of summary requests queued or in flight"""
+        return self._pending_requests
     
     def is_available(self):
         """Check if Groq is available"""
         return GROQ_AVAILABLE and self.client is not None
+    
+    def is_healthy(self):
+        """Check if the circuit breaker currently lets requests through"""
+        return self.breaker.allow_request()
+    
+    def get_resilience_stats(self):
+        """Get circuit breaker state, retry counters and latency histogram"""
+        return {
+            "breaker": self.breaker.get_stats(),
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "rate_limited": self.rate_limited,
+            "short_circuited": self.short_circuited,
+            "rejected": self.rejected_requests,
+            "latency": self.latency.get_stats(),
+            "first_token_latency": self.first_token_latency.get_stats()
+        }
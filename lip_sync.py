@@ -0,0 +1,92 @@
+"""Amplitude-driven lip sync - RMS energy envelope with hysteresis"""
+
+import io
+import logging
+import numpy as np
+import pygame
+import pygame.sndarray
+from config import LIP_SYNC_FRAME_SECONDS, LIP_SYNC_OPEN_THRESHOLD, LIP_SYNC_CLOSE_THRESHOLD
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def decode_pcm(audio_file):
+    """Decode a file path or in-memory audio to mono float samples and the mixer rate"""
+    if isinstance(audio_file, str):
+        sound = pygame.mixer.Sound(file=audio_file)
+    else:
+        # Decode from a copy so the mixer's own read position is untouched
+        sound = pygame.mixer.Sound(file=io.BytesIO(audio_file.getvalue()))
+    return sound_pcm(sound)
+
+def sound_pcm(sound):
+    """Mono float samples and the mixer rate of an already decoded Sound"""
+    samples = pygame.sndarray.array(sound).astype(np.float32)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+
+    sample_rate = pygame.mixer.get_init()[0]
+    return samples, sample_rate
+
+def compute_envelope(samples, sample_rate, frame_seconds=LIP_SYNC_FRAME_SECONDS):
+    """RMS energy per frame, normalized so the loudest frame is 1.0"""
+    frame_size = max(1, int(sample_rate * frame_seconds))
+    frame_count = -(-len(samples) // frame_size)
+    if frame_count == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    padded = np.zeros(frame_count * frame_size, dtype=np.float32)
+    padded[:len(samples)] = samples
+    frames = padded.reshape(frame_count, frame_size)
+
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    peak = rms.max()
+    return rms / peak if peak > 0 else rms
+
+def apply_hysteresis(envelope, open_threshold=LIP_SYNC_OPEN_THRESHOLD,
+                     close_threshold=LIP_SYNC_CLOSE_THRESHOLD):
+    """Turn an envelope into open/closed mouth states that don't chatter near a threshold"""
+    states = np.zeros(len(envelope), dtype=bool)
+    is_open = False
+    for i, level in enumerate(envelope):
+        if is_open and level < close_threshold:
+            is_open = False
+        elif not is_open and level >= open_threshold:
+            is_open = True
+        states[i] = is_open
+    return states
+
+class LipSyncTrack:
+    """Precomputed mouth states for one utterance, looked up by playback position"""
+
+    def __init__(self, states, frame_seconds):
+        self.states = states
+        self.frame_seconds = frame_seconds
+
+    @classmethod
+    def from_audio(cls, audio_file, frame_seconds=LIP_SYNC_FRAME_SECONDS):
+        return cls.from_pcm(*decode_pcm(audio_file), frame_seconds)
+
+    @classmethod
+    def from_sound(cls, sound, frame_seconds=LIP_SYNC_FRAME_SECONDS):
+        return cls.from_pcm(*sound_pcm(sound), frame_seconds)
+
+    @classmethod
+    def from_pcm(cls, samples, sample_rate, frame_seconds=LIP_SYNC_FRAME_SECONDS):
+        envelope = compute_envelope(samples, sample_rate, frame_seconds)
+        return cls(apply_hysteresis(envelope), frame_seconds)
+
+    @property
+    def duration(self):
+        return len(self.states) * self.frame_seconds
+
+    def is_open_at(self, seconds):
+        """Mouth state at a playback position in seconds"""
+        index = int(seconds / self.frame_seconds)
+        if index < 0 or index >= len(self.states):
+            return False
+        return bool(self.states[index])
+
+    def transition_count(self):
+        """Number of open/closed changes - the OBS updates this track needs"""
+        return int(np.count_nonzero(self.states[1:] != self.states[:-1]))
@@ -0,0 +1,225 @@
+"""Live status monitor - polls many creators concurrently, adapting how often to each"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from config import (
+    STREAM_CHECK_INTERVAL, LIVE_MONITOR_MAX_INTERVAL, LIVE_MONITOR_LIVE_INTERVAL,
+    LIVE_MONITOR_BACKOFF, LIVE_MONITOR_CONCURRENCY, LIVE_MONITOR_HOT_MINUTES,
+    LIVE_MONITOR_USUAL_TIMES
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WENT_LIVE = "live"
+WENT_OFFLINE = "offline"
+
+def _minute_of_day(when):
+    return when.hour * 60 + when.minute
+
+def _parse_usual_time(text):
+    hours, _, minutes = text.partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+class UserLiveState:
+    """What we know about one creator and when to look again"""
+    __slots__ = ("user_id", "is_live", "stream_data", "interval", "next_check",
+                 "checks", "last_change", "go_live_minutes")
+
+    def __init__(self, user_id, usual_times=()):
+        self.user_id = user_id
+        self.is_live = None  # Unknown until the first check
+        self.stream_data = None
+        self.interval = STREAM_CHECK_INTERVAL
+        self.next_check = 0.0
+        self.checks = 0
+        self.last_change = None
+        # Minutes past midnight this creator has gone live, oldest first
+        self.go_live_minutes = deque((_parse_usual_time(t) for t in usual_times), maxlen=20)
+
+class LiveStatusMonitor:
+    """Checks a set of creators under a concurrency limit and emits go-live/go-offline events.
+
+    Offline creators are polled less often the longer they stay offline,
+    but at the base interval around the times they usually go live.
+    """
+
+    def __init__(self, stream_helper, user_ids=(), max_concurrency=LIVE_MONITOR_CONCURRENCY,
+                 base_interval=STREAM_CHECK_INTERVAL, max_interval=LIVE_MONITOR_MAX_INTERVAL,
+                 live_interval=LIVE_MONITOR_LIVE_INTERVAL, backoff=LIVE_MONITOR_BACKOFF,
+                 hot_minutes=LIVE_MONITOR_HOT_MINUTES):
+        self.stream_helper = stream_helper
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.live_interval = live_interval
+        self.backoff = backoff
+        self.hot_minutes = hot_minutes
+        self._slots = asyncio.Semaphore(max(1, max_concurrency))
+        self._users = {}
+        self._listeners = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+        for user_id in user_ids:
+            self.add_user(user_id)
+
+        # Stats
+        self.checks = 0
+        self.failed_checks = 0
+        self.events = 0
+        self.last_sweep_seconds = 0.0
+
+    def add_user(self, user_id):
+        """Start watching a creator"""
+        user_id = self.stream_helper.format_user_id(user_id)
+        if user_id not in self._users:
+            usual_times = LIVE_MONITOR_USUAL_TIMES.get(user_id) or LIVE_MONITOR_USUAL_TIMES.get(user_id.split(":", 1)[-1], ())
+            self._users[user_id] = UserLiveState(user_id, usual_times)
+            self._wakeup.set()
+        return self._users[user_id]
+
+    def remove_user(self, user_id):
+        self._users.pop(self.stream_helper.format_user_id(user_id), None)
+
+    def subscribe(self, callback):
+        """Call `callback(event, user_id, stream_data)` on every go-live/go-offline.
+
+        `event` is WENT_LIVE or WENT_OFFLINE; coroutine callbacks are awaited.
+        """
+        self._listeners.append(callback)
+
+    def get_state(self, user_id):
+        return self._users.get(self.stream_helper.format_user_id(user_id))
+
+    def live_users(self):
+        return [state for state in self._users.values() if state.is_live]
+
+    def start(self):
+        """Start polling in the background"""
+        if not self._task:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self):
+        """Poll due creators until cancelled"""
+        while True:
+            await self.check_due()
+
+            now = time.monotonic()
+            next_check = min((state.next_check for state in self._users.values()), default=now + self.base_interval)
+            self._wakeup.clear()
+            try:
+                # Sleep until someone is due, or a new user is added
+                await asyncio.wait_for(self._wakeup.wait(), max(0.0, next_check - now))
+            except asyncio.TimeoutError:
+                pass
+
+    async def check_due(self):
+        """Check every creator whose next poll time has passed, concurrently"""
+        now = time.monotonic()
+        due = [state for state in self._users.values() if state.next_check <= now]
+        if due:
+            await self._sweep(due)
+        return due
+
+    async def check_all(self):
+        """Check every creator now, concurrently; returns their states"""
+        states = list(self._users.values())
+        await self._sweep(states)
+        return states
+
+    async def _sweep(self, states):
+        started = time.monotonic()
+        await asyncio.gather(*(self._check(state) for state in states))
+        self.last_sweep_seconds = time.monotonic() - started
+        logger.debug(f"Checked {len(states)} creators in {self.last_sweep_seconds:.2f}s")
+
+    async def _check(self, state):
+        async with self._slots:
+            response = await self.stream_helper.get_live_status(state.user_id)
+
+        self.checks += 1
+        state.checks += 1
+
+        if response is None:
+            # Couldn't tell - keep the last known state and try again soon
+            self.failed_checks += 1
+            state.interval = self.base_interval
+            state.next_check = time.monotonic() + state.interval
+            return
+
+        is_live = bool(response.get("isActive"))
+        was_live = state.is_live
+        state.is_live = is_live
+        state.stream_data = response if is_live else None
+
+        if is_live and not was_live:
+            state.last_change = time.time()
+            if was_live is False:
+                # Only learn schedules from go-lives we actually saw happen
+                state.go_live_minutes.append(_minute_of_day(datetime.now()))
+            await self._emit(WENT_LIVE, state)
+        elif was_live and not is_live:
+            state.last_change = time.time()
+            state.interval = self.base_interval  # Back off again from the start
+            await self._emit(WENT_OFFLINE, state)
+
+        state.interval = self._next_interval(state)
+        state.next_check = time.monotonic() + state.interval
+
+    def _next_interval(self, state):
+        """Live creators get a steady check; offline ones back off except near usual go-live times"""
+        if state.is_live:
+            return self.live_interval
+        if self._near_usual_time(state):
+            return self.base_interval
+        if state.checks <= 1:
+            return self.base_interval
+        return min(self.max_interval, state.interval * self.backoff)
+
+    def _near_usual_time(self, state, now=None):
+        if not state.go_live_minutes:
+            return False
+        minute = _minute_of_day(now or datetime.now())
+        for usual in state.go_live_minutes:
+            distance = abs(minute - usual)
+            if min(distance, 24 * 60 - distance) <= self.hot_minutes:
+                return True
+        return False
+
+    async def _emit(self, event, state):
+        self.events += 1
+        if event == WENT_LIVE:
+            logger.info(f"🔴 {state.user_id} went live (stream {state.stream_data.get('id')})")
+        else:
+            logger.info(f"⚫ {state.user_id} went offline")
+
+        for callback in list(self._listeners):
+            try:
+                result = callback(event, state.user_id, state.stream_data)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Live status listener error: {e}")
+
+    def get_stats(self):
+        """Get check counters and per-user polling intervals"""
+        return {
+            "users": len(self._users),
+            "live": len(self.live_users()),
+            "checks": self.checks,
+            "failed_checks": self.failed_checks,
+            "events": self.events,
+            "last_sweep_seconds": self.last_sweep_seconds,
+            "intervals": {user_id: state.interval for user_id, state in self._users.items()}
+        }
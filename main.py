@@ -7,7 +7,9 @@ import sys
 from barkle_connector import EnhancedBarkleConnector  # Back to original class name
 from tts_handler import SimplifiedTTSHandler
 from obs_controller import SourceSwitchingOBSController
-from config import SUMMARY_DELAY
+from async_obs_controller import AsyncOBSController
+from speech_pipeline import SpeechPipeline
+from config import TTS_PREWARM_PHRASES, OBS_ASYNC
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,10 +20,10 @@ logger = logging.getLogger(__name__)
 class StreamingChattyDee:
     def __init__(self):
         self.barkle = EnhancedBarkleConnector()  # Back to original class
-        self.obs = SourceSwitchingOBSController()
+        self.obs = AsyncOBSController() if OBS_ASYNC else SourceSwitchingOBSController()
         self.tts = SimplifiedTTSHandler()
+        self.speech = SpeechPipeline(self.tts, async_playback=OBS_ASYNC)
         self.running = False
-        self.processing = False
         
         # Connect TTS to OBS
         self.tts.set_obs_controller(self.obs)
@@ -31,9 +33,16 @@ class StreamingChattyDee:
         logger.info("🚀 Starting Streaming Chatty Dee...")
         
         # Connect to OBS
-        if not self.obs.connect():
-            logger.error("❌ Failed to connect to OBS")
-            return False
+        if OBS_ASYNC:
+            obs_connected = await self.obs.connect()
+        else:
+            obs_connected = self.obs.connect()
+        
+        if not obs_connected:
+            if not OBS_ASYNC:
+                logger.error("❌ Failed to connect to OBS")
+                return False
+            logger.warning("⚠️ OBS not reachable yet - will keep retrying in the background")
         
         # Check Groq availability
         if self.barkle.groq_summarizer.is_available():
@@ -42,6 +51,13 @@ class StreamingChattyDee:
             logger.warning("⚠️ Groq not available - using random selection only")
         
         self.running = True
+        self.speech.start()
+        
+        # Warm the speech cache in the background
+        if TTS_PREWARM_PHRASES:
+            asyncio.get_running_loop().run_in_executor(
+                None, self.tts.prewarm, TTS_PREWARM_PHRASES
+            )
         
         # Start Barkle connection - BACK TO ORIGINAL METHOD
         barkle_task = asyncio.create_task(self.barkle.connect_to_chat())
@@ -60,53 +76,44 @@ class StreamingChattyDee:
         
         while self.running:
             try:
-                if not self.processing:
-                    summary = self.barkle.get_summary()
-                    if summary:
-                        await self.process_summary(summary)
+                # Sleep until the connector hands us a summary
+                summary, started_at, final = await self.barkle.wait_for_summary_chunk()
+                
+                metrics = self.barkle.get_summary_metrics()
+                logger.debug(
+                    f"Summary waited {metrics['last_wait_seconds'] * 1000:.1f}ms "
+                    f"(queue depth: {metrics['queue_depth']})"
+                )
                 
-                await asyncio.sleep(0.1)
+                await self.process_summary(summary, started_at, final)
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Main loop error: {e}")
                 await asyncio.sleep(1)
     
-    async def process_summary(self, summary):
-        """Process summary with animation"""
-        if self.processing:
-            return
-            
-        self.processing = True
-        
-        try:
+    async def process_summary(self, summary, started_at=None, final=True):
+        """Queue summary for speech and animation"""
+        if summary:
             logger.info(f"🎭 Processing: {summary}")
-            
-            # Generate speech
-            audio_file = self.tts.text_to_speech(summary)
-            
-            if audio_file:
-                # Play with animation
-                await asyncio.get_event_loop().run_in_executor(
-                    None, self.tts.play_speech, audio_file
-                )
-                logger.info("✅ Speech and animation completed")
-            else:
-                logger.warning("❌ Failed to generate speech")
-            
-            # Wait before next
-            await asyncio.sleep(SUMMARY_DELAY)
-            
-        except Exception as e:
-            logger.error(f"Processing error: {e}")
-        finally:
-            self.processing = False
+        self.speech.submit(summary, started_at, final)
     
     async def cleanup(self):
         """Cleanup"""
         logger.info("🧹 Cleaning up...")
         self.running = False
+        await self.speech.stop()
+        logger.info(f"Speech stats: {self.speech.get_stats()}")
+        logger.info(f"Speech cache stats: {self.tts.get_cache_stats()}")
+        logger.info(f"Groq resilience stats: {self.barkle.groq_summarizer.get_resilience_stats()}")
+        logger.info(f"Barkle connection stats: {self.barkle.get_connection_stats()}")
         self.tts.stop_speech()
-        self.obs.disconnect()
+        if OBS_ASYNC:
+            await self.obs.disconnect()
+        else:
+            self.obs.disconnect()
+        await self.barkle.close()
 
 def signal_handler(signum, frame):
     logger.info("Received termination signal")
@@ -1,24 +1,134 @@
 """Source-switching OBS controller - much simpler and more reliable"""
 
+import json
+import socket
 import time
 import threading
 import logging
-from obswebsocket import obsws, requests
+from collections import deque
+import websocket
+from obswebsocket import obsws, requests, exceptions
+from obswebsocket.core import RecvThread
 from config import (
     OBS_HOST, OBS_PORT, OBS_PASSWORD, MAIN_SCENE, CHATTY_SOURCE, 
-    LIPS_CLOSED_SOURCE, LIPS_OPEN_SOURCE
+    LIPS_CLOSED_SOURCE, LIPS_OPEN_SOURCE, ANIMATION_SPEED, LIP_SYNC_FRAME_SECONDS
 )
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# obs-websocket v5 RequestBatch execution type: run every request in the same graphics frame
+BATCH_EXECUTION_SERIAL_FRAME = 1
+
+STRETCH_SOURCE = "Chatty-stretch"  # Stretched source
+REQUIRED_SOURCES = [CHATTY_SOURCE, STRETCH_SOURCE, LIPS_CLOSED_SOURCE, LIPS_OPEN_SOURCE]
+
+def frame_states(stretched):
+    """Visibility of every source for the stretched (open mouth) or normal frame"""
+    return {
+        CHATTY_SOURCE: not stretched,
+        STRETCH_SOURCE: stretched,
+        LIPS_CLOSED_SOURCE: not stretched,
+        LIPS_OPEN_SOURCE: stretched
+    }
+
+class _BatchRecvThread(RecvThread):
+    """Receive thread that also routes RequestBatchResponse (op 9) replies"""
+    
+    def run(self):
+        while self.running:
+            message = ""
+            try:
+                message = self.ws.recv()
+                if not message:
+                    continue
+                
+                result = json.loads(message)
+                op = result.get('op')
+                
+                if op == 5:  # Event
+                    self.core.eventmanager.trigger(self.build_event(result['d']))
+                elif op in (7, 9):  # RequestResponse / RequestBatchResponse
+                    request_id = result['d']['requestId']
+                    if request_id in self.core.events:
+                        self.core.answers[request_id] = result['d']
+                        self.core.events[request_id].set()
+                else:
+                    logger.warning(f"Unknown OBS message: {result}")
+                    
+            except websocket.WebSocketConnectionClosedException:
+                if self.running:
+                    logger.warning("OBS connection lost!")
+                    self.core.disconnect()
+                break
+            except OSError as e:
+                if self.running:
+                    raise e
+            except (ValueError, exceptions.ObjectError) as e:
+                logger.warning(f"Invalid OBS message: {message} ({e})")
+
+class BatchingOBSWS(obsws):
+    """obsws client that can send several requests as one RequestBatch"""
+    
+    def connect(self):
+        if self.legacy:
+            return super().connect()
+        
+        try:
+            self.ws = websocket.WebSocket()
+            self.ws.connect(f"ws://{self.host}:{self.port}")
+            self._auth()
+            
+            if self.thread_recv is not None:
+                self.thread_recv.running = False
+            self.thread_recv = _BatchRecvThread(self)
+            self.thread_recv.daemon = True
+            self.thread_recv.start()
+        except socket.error as e:
+            raise exceptions.ConnectionFailure(str(e))
+    
+    def call_batch(self, batch, execution_type=BATCH_EXECUTION_SERIAL_FRAME):
+        """Send requests as one RequestBatch and return the per-request results"""
+        message_id = str(self.id)
+        self.id += 1
+        event = threading.Event()
+        self.events[message_id] = event
+        
+        payload = {
+            "op": 8,
+            "d": {
+                "requestId": message_id,
+                "haltOnFailure": False,
+                "executionType": execution_type,
+                "requests": [
+                    {"requestType": request.name, "requestData": request.data()}
+                    for request in batch
+                ]
+            }
+        }
+        self.ws.send(json.dumps(payload))
+        
+        event.wait(self.timeout)
+        self.events.pop(message_id)
+        
+        if message_id in self.answers:
+            return self.answers.pop(message_id).get('results', [])
+        raise exceptions.MessageTimeout(f"No answer for batch {message_id}")
+
 class SourceSwitchingOBSController:
     def __init__(self):
-        self.ws = obsws(OBS_HOST, OBS_PORT, OBS_PASSWORD)
+        self.ws = BatchingOBSWS(OBS_HOST, OBS_PORT, OBS_PASSWORD, on_disconnect=self._on_disconnect)
         self.connected = False
         self.source_ids = {}
+        self._visibility = {}  # Last known visibility per source
+        self._frame_latencies = deque(maxlen=200)
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.frames_dropped = 0
         self.animation_running = False
         self.animation_thread = None
+        self._lip_sync = None
+        self._playback_position = None
         
     def connect(self):
         """Connect and setup sources"""
@@ -40,21 +150,14 @@ class SourceSwitchingOBSController:
             response = self.ws.call(requests.GetSceneItemList(sceneName=MAIN_SCENE))
             items = response.datain.get('sceneItems', [])
             
-            required_sources = [
-                CHATTY_SOURCE, 
-                "Chatty-stretch",  # Stretched source
-                LIPS_CLOSED_SOURCE, 
-                LIPS_OPEN_SOURCE
-            ]
-            
             for item in items:
                 source_name = item.get('sourceName', '')
-                if source_name in required_sources:
+                if source_name in REQUIRED_SOURCES:
                     self.source_ids[source_name] = item.get('sceneItemId', 0)
                     logger.info(f"Found {source_name} with ID: {self.source_ids[source_name]}")
             
             # Check for missing sources
-            missing = [src for src in required_sources if src not in self.source_ids]
+            missing = [src for src in REQUIRED_SOURCES if src not in self.source_ids]
             if missing:
                 logger.error(f"❌ Missing sources: {missing}")
                 return False
@@ -68,24 +171,22 @@ class SourceSwitchingOBSController:
     def _set_initial_state(self):
         """Set initial visibility state"""
         try:
-            # Show normal chatty, hide stretched version
-            self._set_source_visibility(CHATTY_SOURCE, True)
-            self._set_source_visibility("Chatty-stretch", False)
-            
-            # Show closed lips, hide open lips
-            self._set_source_visibility(LIPS_CLOSED_SOURCE, True)
-            self._set_source_visibility(LIPS_OPEN_SOURCE, False)
+            # Forget cached state so every source gets set
+            self._visibility.clear()
+            self._show_normal_state()
             
             logger.info("✅ Set initial state")
         except Exception as e:
             logger.error(f"Error setting initial state: {e}")
     
-    def start_animation(self):
-        """Start the rapid source-switching animation"""
+    def start_animation(self, lip_sync=None, playback_position=None):
+        """Start animation - follow the audio envelope when given one, else flip-flop"""
         if self.animation_running:
             return
             
         self.animation_running = True
+        self._lip_sync = lip_sync if playback_position else None
+        self._playback_position = playback_position
         self.animation_thread = threading.Thread(target=self._animation_loop, daemon=True)
         self.animation_thread.start()
         logger.info("🎭 Started source-switching animation")
@@ -100,30 +201,43 @@ class SourceSwitchingOBSController:
         logger.info("⏹️ Stopped animation")
     
     def _animation_loop(self):
-        """Fast animation loop - switch between sources"""
+        """Animation loop - switch between sources"""
+        if self._lip_sync:
+            self._lip_sync_loop()
+            return
+        
         while self.animation_running:
             # STRETCH - Show stretched chatty + open lips
             self._show_stretched_state()
-            time.sleep(0.2)  # Very fast - 200ms
+            time.sleep(ANIMATION_SPEED)
             
             if not self.animation_running:
                 break
                 
             # NORMAL - Show normal chatty + closed lips  
             self._show_normal_state()
-            time.sleep(0.2)  # Very fast - 200ms
+            time.sleep(ANIMATION_SPEED)
+    
+    def _lip_sync_loop(self):
+        """Follow the precomputed mouth states, only touching OBS when they change"""
+        mouth_open = False
+        
+        while self.animation_running:
+            should_open = self._lip_sync.is_open_at(self._playback_position())
+            
+            if should_open != mouth_open:
+                mouth_open = should_open
+                if mouth_open:
+                    self._show_stretched_state()
+                else:
+                    self._show_normal_state()
+            
+            time.sleep(LIP_SYNC_FRAME_SECONDS)
     
     def _show_stretched_state(self):
         """Show stretched version with open lips"""
         try:
-            # Switch to stretched chatty
-            self._set_source_visibility(CHATTY_SOURCE, False)
-            self._set_source_visibility("Chatty-stretch", True)
-            
-            # Show open lips
-            self._set_source_visibility(LIPS_CLOSED_SOURCE, False)
-            self._set_source_visibility(LIPS_OPEN_SOURCE, True)
-            
+            self._apply_frame(frame_states(stretched=True))
             logger.debug("📈 Showing stretched state")
             
         except Exception as e:
@@ -132,19 +246,49 @@ class SourceSwitchingOBSController:
     def _show_normal_state(self):
         """Show normal version with closed lips"""
         try:
-            # Switch to normal chatty
-            self._set_source_visibility(CHATTY_SOURCE, True)
-            self._set_source_visibility("Chatty-stretch", False)
-            
-            # Show closed lips
-            self._set_source_visibility(LIPS_CLOSED_SOURCE, True)
-            self._set_source_visibility(LIPS_OPEN_SOURCE, False)
-            
+            self._apply_frame(frame_states(stretched=False))
             logger.debug("📉 Showing normal state")
             
         except Exception as e:
             logger.error(f"Error showing normal state: {e}")
     
+    def _apply_frame(self, states):
+        """Send every visibility change for a frame as one request batch"""
+        changes = [
+            (source_name, visible) for source_name, visible in states.items()
+            if self._visibility.get(source_name) != visible and self.source_ids.get(source_name)
+        ]
+        
+        if not changes:
+            self.frames_skipped += 1
+            return
+        
+        # Don't wait on request timeouts while OBS is gone
+        if not self.connected:
+            self.frames_dropped += 1
+            return
+        
+        batch = [
+            requests.SetSceneItemEnabled(
+                sceneName=MAIN_SCENE,
+                sceneItemId=self.source_ids[source_name],
+                sceneItemEnabled=visible
+            )
+            for source_name, visible in changes
+        ]
+        
+        started = time.perf_counter()
+        results = self.ws.call_batch(batch)
+        self._frame_latencies.append(time.perf_counter() - started)
+        self.frames_sent += 1
+        
+        for (source_name, visible), result in zip(changes, results):
+            if result.get('requestStatus', {}).get('result'):
+                self._visibility[source_name] = visible
+            else:
+                self._visibility.pop(source_name, None)
+                logger.error(f"Failed to set {source_name} visibility")
+    
     def _set_source_visibility(self, source_name, visible):
         """Set source visibility"""
         try:
@@ -160,13 +304,27 @@ class SourceSwitchingOBSController:
             ))
             
             if response.status:
+                self._visibility[source_name] = visible
                 logger.debug(f"Set {source_name} visibility: {visible}")
             else:
+                self._visibility.pop(source_name, None)
                 logger.error(f"Failed to set {source_name} visibility")
                 
         except Exception as e:
             logger.error(f"Visibility error for {source_name}: {e}")
     
+    def get_frame_stats(self):
+        """Get per-frame batch latency stats"""
+        latencies = sorted(self._frame_latencies)
+        return {
+            "frames_sent": self.frames_sent,
+            "frames_skipped": self.frames_skipped,
+            "frames_dropped": self.frames_dropped,
+            "avg_latency_ms": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p95_latency_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "max_latency_ms": 1000 * latencies[-1] if latencies else 0.0
+        }
+    
     def _reset_to_normal(self):
         """Reset to normal state"""
         try:
@@ -175,6 +333,10 @@ class SourceSwitchingOBSController:
         except Exception as e:
             logger.error(f"Reset error: {e}")
     
+    def _on_disconnect(self, ws):
+        """Mark the connection lost so frames are dropped instead of timing out"""
+        self.connected = False
+    
     def disconnect(self):
         """Disconnect from OBS"""
         self.stop_animation()
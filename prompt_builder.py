@@ -0,0 +1,53 @@
+"""Token-budgeted selection of chat messages for Groq prompts"""
+
+from collections import deque
+from config import GROQ_PROMPT_TOKEN_BUDGET
+
+def estimate_tokens(text):
+    """Cheap token estimate - roughly four characters per token for English chat"""
+    return max(1, (len(text) + 3) // 4)
+
+def _normalize(text):
+    return " ".join(text.casefold().split())
+
+class PromptBuilder:
+    def __init__(self, token_budget=GROQ_PROMPT_TOKEN_BUDGET):
+        self.token_budget = token_budget
+
+    def select_messages(self, messages):
+        """Pick the most informative messages that fit the budget.
+
+        Newer messages win, repeated text is only counted once, and users are
+        taken round-robin so a single chatty viewer can't fill the prompt.
+        Returns (selected messages in chat order, estimated tokens).
+        """
+        # Newest first, keeping only the latest copy of repeated text
+        seen = set()
+        by_user = {}
+        for index in range(len(messages) - 1, -1, -1):
+            message = messages[index]
+            user, _, text = message.partition(":")
+            key = _normalize(text or message)
+            if key in seen:
+                continue
+            seen.add(key)
+            by_user.setdefault(user.strip(), deque()).append(index)
+
+        # Round-robin over users, most recently active first
+        queues = list(by_user.values())
+        chosen = []
+        tokens = 0
+        while queues:
+            remaining = []
+            for queue in queues:
+                index = queue.popleft()
+                cost = estimate_tokens(messages[index]) + 1  # +1 for the newline
+                if tokens + cost <= self.token_budget:
+                    chosen.append(index)
+                    tokens += cost
+                if queue:
+                    remaining.append(queue)
+            queues = remaining
+
+        chosen.sort()
+        return [messages[index] for index in chosen], tokens
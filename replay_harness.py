@@ -0,0 +1,410 @@
+"""Replay harness - drives the whole bot against a local Barkle stand-in.
+
+Replays a recorded JSONL chat log, or seeded synthetic chat at a steady
+rate with optional raid bursts, through EnhancedBarkleConnector and the
+speech pipeline with stub Groq, TTS and OBS backends, then prints
+throughput and latency percentiles. Cooldowns and thresholds come from
+config.py, so runs measure the settings you'd stream with.
+
+    python replay_harness.py --rate 2 --duration 60
+    python replay_harness.py --rate 0.0167 --duration 600                  # ~1 msg/min
+    python replay_harness.py --rate 5 --burst-rate 3000 --burst-at 10 --burst-seconds 5
+    python replay_harness.py --log chat.jsonl --speed 4 --drop-at 30
+
+Log lines look like {"t": 12.5, "user": "name", "text": "...", "stream": 0};
+recorded message bodies with "user": {"name": ...} work too, lines without
+"t" are spaced at --rate, and {"t": ..., "deleted": "<id>"} replays a deletion.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from types import SimpleNamespace
+from barkle_connector import EnhancedBarkleConnector
+from barkle_standin import BarkleStandIn
+from groq_resilience import TokenBucket
+from speech_pipeline import SpeechPipeline
+
+logger = logging.getLogger("replay_harness")
+
+CHAT_PHRASES = ["lol", "gg", "what build is this", "POG", "hi chat", "that boss is brutal",
+                "first time here, love the stream", "KEKW", "can you explain the last part?",
+                "how long have you been playing", "the music is so good", "no way"]
+RAID_PHRASES = ["RAID HYPE", "raid from the squad!", "hello from the raid", "POG POG POG", "welcome raiders"]
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))] if ordered else 0.0
+
+def synthetic_schedule(rate, duration, streams=1, burst_rate=0.0, burst_at=0.0, burst_seconds=0.0, seed=1):
+    """Seeded Poisson chat at `rate` msg/s, plus a raid of `burst_rate` msg/s if given.
+
+    Returns (offset seconds, stream index, event, user, text, message ID) tuples in send order.
+    """
+    rng = random.Random(seed)
+    events = []
+
+    def arrivals(start, end, per_second, phrases):
+        if per_second <= 0:
+            return
+        offset = start + rng.expovariate(per_second)
+        while offset < end:
+            text = f"{rng.choice(phrases)} {rng.randrange(50)}" if rng.random() < 0.5 else rng.choice(phrases)
+            events.append((offset, rng.randrange(streams), "message", f"viewer{rng.randrange(500)}", text, None))
+            offset += rng.expovariate(per_second)
+
+    arrivals(0.0, duration, rate, CHAT_PHRASES)
+    arrivals(burst_at, burst_at + burst_seconds, burst_rate, RAID_PHRASES)
+    events.sort(key=lambda event: event[0])
+    return events
+
+def load_log(path, rate=1.0, speed=1.0, streams=1):
+    """Schedule a recorded JSONL chat log; timestamps are divided by `speed`"""
+    events = []
+    first_t = None
+    offset = 0.0
+    with open(path, encoding="utf-8") as log:
+        for line_number, line in enumerate(log, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                logger.warning(f"Skipping line {line_number} of {path}: {e}")
+                continue
+
+            if "t" in record:
+                t = float(record["t"])
+                first_t = t if first_t is None else first_t
+                offset = (t - first_t) / speed
+            elif events:
+                offset += 1 / rate if rate > 0 else 0.0
+            stream = int(record.get("stream", 0)) % streams
+
+            if record.get("deleted"):
+                events.append((offset, stream, "deleted", None, None, str(record["deleted"])))
+                continue
+            user = record.get("user")
+            if isinstance(user, dict):
+                user = user.get("name") or user.get("username")
+            events.append((offset, stream, "message", user or "Anonymous", record.get("text") or "", record.get("id")))
+    return events
+
+class StubGroqClient:
+    """Stands in for AsyncGroq: a canned summary after `latency` seconds, streamed word by word"""
+
+    def __init__(self, latency=0.3, token_delay=0.02, fail_rate=0.0, seed=1):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.fail_rate = fail_rate
+        self._rng = random.Random(seed)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.calls = 0
+        self.failures = 0
+
+    async def create(self, messages, stream=False, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self._rng.random() < self.fail_rate:
+            self.failures += 1
+            raise asyncio.TimeoutError()
+
+        text = f"Summary {self.calls}: chat is hyped and asking about the build."
+        if not stream:
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+        return self._stream(text)
+
+    async def _stream(self, text):
+        for word in text.split(" "):
+            await asyncio.sleep(self.token_delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + " "))])
+
+class StubOBS:
+    """Counts avatar animations instead of driving OBS"""
+
+    def __init__(self):
+        self.animations = 0
+
+    def start_animation(self, lip_sync=None, playback_position=None):
+        self.animations += 1
+
+    def stop_animation(self):
+        pass
+
+class StubTTS:
+    """Stands in for SimplifiedTTSHandler: the "audio" is the text, played for a time per character"""
+
+    def __init__(self, obs, seconds_per_char=0.06, render_seconds=0.05):
+        self.obs = obs
+        self.seconds_per_char = seconds_per_char
+        self.render_seconds = render_seconds
+        self.on_play = None  # Called with the text of every utterance as it starts
+        self.rendered = 0
+
+    def text_to_speech(self, text):
+        time.sleep(self.render_seconds)
+        self.rendered += 1
+        return text
+
+    def play_speech(self, audio_file):
+        self._started(audio_file)
+        time.sleep(len(audio_file) * self.seconds_per_char)
+        self.obs.stop_animation()
+
+    async def play_speech_async(self, audio_file):
+        self._started(audio_file)
+        await asyncio.sleep(len(audio_file) * self.seconds_per_char)
+        self.obs.stop_animation()
+
+    def _started(self, audio_file):
+        self.obs.start_animation()
+        if self.on_play:
+            self.on_play(audio_file)
+
+    def discard_audio(self, audio_file):
+        pass
+
+class ReplayHarness:
+    """Runs a schedule through the stand-in, connector and speech pipeline, timing each stage"""
+
+    def __init__(self, schedule, streams=1, groq=None, tts_seconds_per_char=0.06, render_seconds=0.05,
+                 groq_rpm=None, drop_at=(), drain_seconds=30.0):
+        self.schedule = schedule
+        self.stream_ids = [f"replay-stream-{index + 1}" for index in range(streams)]
+        self.groq = groq or StubGroqClient()
+        self.obs = StubOBS()
+        self.tts = StubTTS(self.obs, tts_seconds_per_char, render_seconds)
+        self.groq_rpm = groq_rpm
+        self.drop_at = sorted(drop_at)
+        self.drain_seconds = drain_seconds
+
+        # Measurements
+        self.ingest_latency = []  # Seconds from stand-in send to the channel handling it
+        self.first_audio = []  # Seconds from summary generation start to its first audio
+        self.max_send_lag = 0.0  # How far the stand-in fell behind the schedule
+        self.send_seconds = 0.0
+        self._started_at_by_text = {}
+        self._spoken_started_at = set()
+
+    async def run(self):
+        """Replay the schedule and return the report"""
+        server = BarkleStandIn()
+        await server.start()
+        connector = EnhancedBarkleConnector(stream_ids=self.stream_ids, ws_url=server.ws_url)
+        if connector.stream_helper:
+            # The live monitor polls live/get too - keep that offline as well
+            connector.stream_helper.base_url = server.api_url
+        self._install_stubs(connector)
+        speech = SpeechPipeline(self.tts, async_playback=True)
+        speech.start()
+
+        tasks = [asyncio.create_task(connector.connect_to_chat()),
+                 asyncio.create_task(self._consume(connector, speech))]
+        try:
+            await self._wait_subscribed(server)
+            await self._send(server)
+            await self._drain(connector, speech)
+            return self.report(server, connector, speech)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await speech.stop()
+            await connector.close()
+            await server.stop()
+
+    def _install_stubs(self, connector):
+        summarizer = connector.groq_summarizer
+        summarizer.client = summarizer.async_client = self.groq
+        if self.groq_rpm:
+            summarizer.rate_limiter = TokenBucket(self.groq_rpm, max(1, self.groq_rpm // 6))
+        if not summarizer.is_available():
+            logger.warning("groq package not installed - summaries will all be random selections")
+
+        # Time every chat frame from the stand-in's send to the end of its handling
+        dispatch = connector._dispatch_frame
+
+        async def timed_dispatch(frame):
+            await dispatch(frame)
+            sent_at = frame.body.get("sentAt")
+            if frame.event == "message" and sent_at:
+                self.ingest_latency.append(time.time() - sent_at)
+
+        connector._dispatch_frame = timed_dispatch
+        self.tts.on_play = self._record_first_audio
+
+    async def _consume(self, connector, speech):
+        """The main loop of main.py, with the started_at of each text remembered"""
+        while True:
+            summary, started_at, final = await connector.wait_for_summary_chunk()
+            self._started_at_by_text[summary] = started_at
+            speech.submit(summary, started_at, final)
+
+    def _record_first_audio(self, text):
+        started_at = self._started_at_by_text.get(text)
+        if started_at is not None and started_at not in self._spoken_started_at:
+            self._spoken_started_at.add(started_at)
+            self.first_audio.append(time.time() - started_at)
+
+    async def _wait_subscribed(self, server, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not all(server.is_subscribed(stream_id) for stream_id in self.stream_ids):
+            if time.monotonic() > deadline:
+                raise RuntimeError("Connector never subscribed to the stand-in's stream chats")
+            await asyncio.sleep(0.05)
+
+    async def _send(self, server):
+        """Publish the schedule on time, batching whatever is due when running behind"""
+        drops = list(self.drop_at)
+        started = time.perf_counter()
+        for sent, (offset, stream, event, user, text, message_id) in enumerate(self.schedule):
+            wait = offset - (time.perf_counter() - started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            else:
+                self.max_send_lag = max(self.max_send_lag, -wait)
+                if sent % 100 == 0:
+                    await asyncio.sleep(0)  # Let the connector read between batches
+
+            while drops and drops[0] <= offset:
+                drops.pop(0)
+                logger.info("Dropping client connections")
+                await server.drop_clients()
+
+            stream_id = self.stream_ids[stream]
+            if event == "deleted":
+                await server.delete(stream_id, message_id)
+            else:
+                await server.publish(stream_id, user, text, message_id)
+        self.send_seconds = time.perf_counter() - started
+
+    async def _drain(self, connector, speech):
+        """Wait for in-flight summaries and speech to finish, up to drain_seconds"""
+        deadline = time.monotonic() + self.drain_seconds
+        while time.monotonic() < deadline:
+            stats = speech.get_stats()
+            summarizing = any(channel._groq_task and not channel._groq_task.done()
+                              for channel in connector.channels.values())
+            if not summarizing and connector.summary_queue.empty() and not stats["pending"] and not stats["ready"]:
+                await asyncio.sleep(max(speech.delay, 0.5))  # The last utterance and its pause
+                return
+            await asyncio.sleep(0.1)
+
+    def report(self, server, connector, speech):
+        streams = connector.get_stream_metrics().values()
+        handled = sum(stream["messages"] for stream in streams)
+        groq_stats = connector.groq_summarizer.get_resilience_stats()
+        ms = lambda values, q: percentile(values, q) * 1000
+        return {
+            "traffic": {
+                "scheduled": len(self.schedule),
+                "published": server.published,
+                "delivered": server.delivered,
+                "unrouted": server.unrouted,
+                "send_seconds": self.send_seconds,
+                "offered_per_second": server.published / self.send_seconds if self.send_seconds else 0.0,
+                "max_send_lag_seconds": self.max_send_lag
+            },
+            "ingest": {
+                "handled": handled,
+                "handled_per_second": handled / self.send_seconds if self.send_seconds else 0.0,
+                "p50_ms": ms(self.ingest_latency, 0.5),
+                "p95_ms": ms(self.ingest_latency, 0.95),
+                "p99_ms": ms(self.ingest_latency, 0.99),
+                "max_ms": ms(self.ingest_latency, 1.0),
+                **connector.get_ingest_stats()
+            },
+            "summaries": {
+                "groq": sum(stream["groq_summaries"] for stream in streams),
+                "random": sum(stream["random_selections"] for stream in streams),
+                "stale": sum(stream["stale_summaries"] for stream in streams),
+                "groq_calls": self.groq.calls,
+                "groq_failures": self.groq.failures,
+                "groq_latency": groq_stats["latency"],
+                "queue": connector.get_summary_metrics()
+            },
+            "speech": {
+                "utterances": speech.utterances_played,
+                "animations": self.obs.animations,
+                "dropped_stale": speech.dropped_stale,
+                "first_audio_p50_ms": ms(self.first_audio, 0.5),
+                "first_audio_p95_ms": ms(self.first_audio, 0.95),
+                "first_audio_p99_ms": ms(self.first_audio, 0.99),
+                "p95_gap_seconds": speech.get_stats()["p95_gap_seconds"]
+            },
+            "connection": {
+                **{key: value for key, value in connector.get_connection_stats().items() if key != "outages"},
+                # What the outage estimate should have said: sent by the stand-in but never handled
+                "actual_messages_missed": server.published - handled
+            }
+        }
+
+def print_report(report):
+    traffic, ingest, summaries, speech = report["traffic"], report["ingest"], report["summaries"], report["speech"]
+    connection = report["connection"]
+    print(f"Traffic:    {traffic['published']} messages in {traffic['send_seconds']:.1f}s "
+          f"({traffic['offered_per_second']:,.1f} msg/s offered, max send lag {traffic['max_send_lag_seconds'] * 1000:.0f}ms)")
+    print(f"Ingest:     {ingest['handled']} handled ({ingest['handled_per_second']:,.1f} msg/s), latency "
+          f"p50 {ingest['p50_ms']:.1f}ms  p95 {ingest['p95_ms']:.1f}ms  p99 {ingest['p99_ms']:.1f}ms  max {ingest['max_ms']:.1f}ms")
+    print(f"Summaries:  {summaries['groq']} Groq ({summaries['groq_calls']} calls, {summaries['groq_failures']} failed), "
+          f"{summaries['random']} random, {summaries['stale']} stale; "
+          f"queue wait avg {summaries['queue']['avg_wait_seconds'] * 1000:.1f}ms")
+    print(f"Speech:     {speech['utterances']} utterances, {speech['dropped_stale']} dropped stale, first audio "
+          f"p50 {speech['first_audio_p50_ms']:.0f}ms  p95 {speech['first_audio_p95_ms']:.0f}ms  p99 {speech['first_audio_p99_ms']:.0f}ms")
+    print(f"Connection: {connection['connects']} connects, {connection['reconnects']} reconnects, "
+          f"{connection['connected_ratio']:.1%} connected, ~{connection['estimated_messages_missed']} messages missed "
+          f"(actually {connection['actual_messages_missed']}, {report['traffic']['unrouted']} unrouted)")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", help="JSONL chat log to replay instead of synthetic chat")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay the log this many times faster")
+    parser.add_argument("--rate", type=float, default=2.0, help="steady chat rate, msg/s")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of synthetic chat")
+    parser.add_argument("--burst-rate", type=float, default=0.0, help="raid rate, msg/s")
+    parser.add_argument("--burst-at", type=float, default=10.0, help="raid start, seconds in")
+    parser.add_argument("--burst-seconds", type=float, default=5.0)
+    parser.add_argument("--streams", type=int, default=1, help="streams followed on the one websocket")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--groq-latency", type=float, default=0.3)
+    parser.add_argument("--groq-token-delay", type=float, default=0.02)
+    parser.add_argument("--groq-fail-rate", type=float, default=0.0)
+    parser.add_argument("--groq-rpm", type=int, help="override GROQ_REQUESTS_PER_MINUTE")
+    parser.add_argument("--tts-seconds-per-char", type=float, default=0.06)
+    parser.add_argument("--render-seconds", type=float, default=0.05)
+    parser.add_argument("--drop-at", type=float, action="append", default=[], help="drop the websocket at this offset")
+    parser.add_argument("--drain", type=float, default=30.0, help="max seconds to wait for speech to finish")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show the bot's INFO logs")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    if args.log:
+        schedule = load_log(args.log, args.rate, args.speed, args.streams)
+    else:
+        schedule = synthetic_schedule(args.rate, args.duration, args.streams, args.burst_rate,
+                                      args.burst_at, args.burst_seconds, args.seed)
+
+    harness = ReplayHarness(
+        schedule,
+        streams=args.streams,
+        groq=StubGroqClient(args.groq_latency, args.groq_token_delay, args.groq_fail_rate, args.seed),
+        tts_seconds_per_char=args.tts_seconds_per_char,
+        render_seconds=args.render_seconds,
+        groq_rpm=args.groq_rpm,
+        drop_at=args.drop_at,
+        drain_seconds=args.drain
+    )
+    report = await harness.run()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    asyncio.run(main())
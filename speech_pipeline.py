@@ -0,0 +1,206 @@
+"""Producer/consumer speech pipeline - renders the next line while the current one plays"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config import SUMMARY_DELAY, SPEECH_LOOKAHEAD, SPEECH_STALE_AFTER
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SpeechPipeline:
+    def __init__(self, tts, lookahead=SPEECH_LOOKAHEAD, stale_after=SPEECH_STALE_AFTER,
+                 delay=SUMMARY_DELAY, async_playback=False):
+        self.tts = tts
+        self.async_playback = async_playback
+        self.stale_after = stale_after
+        self.delay = delay
+
+        # Summaries waiting for synthesis, then rendered audio waiting for playback
+        self._pending = asyncio.Queue()
+        self._ready = asyncio.Queue(maxsize=max(1, lookahead))
+
+        # Separate workers so synthesis never waits behind playback
+        self._synth_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-synth")
+        self._play_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-play")
+        self._tasks = []
+
+        # Stats
+        self.utterances_played = 0
+        self.dropped_stale = 0
+        self.failed_synthesis = 0
+        self._gaps = deque(maxlen=100)
+        self._last_end_time = None
+        self._pause_owed = False  # Something was spoken since the last end-of-summary pause
+        self._first_audio = deque(maxlen=100)
+        self._current_started_at = None
+
+    def start(self):
+        """Start the synthesis and playback workers"""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._synthesis_worker()),
+            asyncio.create_task(self._playback_worker())
+        ]
+        logger.info("🔊 Speech pipeline started")
+
+    async def stop(self):
+        """Stop the workers and discard anything not yet spoken"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.cancel_pending()
+        self._synth_executor.shutdown(wait=False)
+        self._play_executor.shutdown(wait=False)
+
+    def submit(self, text, started_at=None, final=True):
+        """Queue a summary, or one phrase of a streamed summary, to be spoken.
+
+        `started_at` is when generating the summary began (for time to first
+        audio); phrases that aren't `final` play without the usual pause. An
+        empty `final` text just ends a streamed summary, applying the pause.
+        """
+        now = time.time()
+        self._pending.put_nowait((now, text, started_at or now, final))
+
+    def cancel_pending(self):
+        """Drop every queued summary and any audio rendered ahead"""
+        dropped = 0
+        while not self._pending.empty():
+            self._pending.get_nowait()
+            dropped += 1
+        while not self._ready.empty():
+            _, _, audio_file, _, _ = self._ready.get_nowait()
+            if audio_file is not None:
+                self.tts.discard_audio(audio_file)
+            dropped += 1
+        if dropped:
+            logger.info(f"Cancelled {dropped} queued utterances")
+        return dropped
+
+    def _is_stale(self, queued_at):
+        """Check if a queued summary is too old to be worth saying"""
+        return bool(self.stale_after) and time.time() - queued_at > self.stale_after
+
+    async def _synthesis_worker(self):
+        """Render queued summaries ahead of playback"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            queued_at, text, started_at, final = await self._pending.get()
+
+            if not text:
+                # End-of-summary marker - nothing to render, but it keeps its place in line
+                await self._ready.put((queued_at, text, None, started_at, final))
+                continue
+
+            if self._is_stale(queued_at):
+                self.dropped_stale += 1
+                logger.info(f"Dropping stale summary before synthesis: {text}")
+                await self._forward_end(queued_at, started_at, final)
+                continue
+
+            try:
+                audio_file = await loop.run_in_executor(
+                    self._synth_executor, self.tts.text_to_speech, text
+                )
+            except Exception as e:
+                logger.error(f"Synthesis error: {e}")
+                audio_file = None
+
+            if not audio_file:
+                self.failed_synthesis += 1
+                logger.warning("❌ Failed to generate speech")
+                await self._forward_end(queued_at, started_at, final)
+                continue
+
+            # Blocks once the lookahead is full
+            await self._ready.put((queued_at, text, audio_file, started_at, final))
+
+    async def _playback_worker(self):
+        """Play rendered audio in order"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            queued_at, text, audio_file, started_at, final = await self._ready.get()
+
+            if audio_file is None:
+                await self._end_summary(final)
+                continue
+
+            if self._is_stale(queued_at):
+                self.dropped_stale += 1
+                logger.info(f"Dropping stale summary before playback: {text}")
+                self.tts.discard_audio(audio_file)
+                await self._end_summary(final)
+                continue
+
+            self._record_gap(queued_at)
+            self._record_first_audio(started_at)
+            logger.info(f"🎭 Speaking: {text}")
+
+            try:
+                if self.async_playback:
+                    await self.tts.play_speech_async(audio_file)
+                else:
+                    await loop.run_in_executor(self._play_executor, self.tts.play_speech, audio_file)
+                self.utterances_played += 1
+                logger.info("✅ Speech and animation completed")
+            except Exception as e:
+                logger.error(f"Playback error: {e}")
+
+            self._last_end_time = time.time()
+            self._pause_owed = True
+            await self._end_summary(final)
+
+    async def _forward_end(self, queued_at, started_at, final):
+        """Keep a dropped phrase's end-of-summary in line, so the pause still follows"""
+        if final:
+            await self._ready.put((queued_at, "", None, started_at, final))
+
+    async def _end_summary(self, final):
+        """Wait before the next summary, but not between phrases of one"""
+        if not final or not self._pause_owed:
+            return
+        self._pause_owed = False
+        await asyncio.sleep(self.delay)
+        # The pause is deliberate, so dead air is counted from its end
+        self._last_end_time = time.time()
+
+    def _record_gap(self, queued_at):
+        """Record dead air between the previous utterance and this one"""
+        if self._last_end_time is None:
+            return
+
+        # Only count time where this summary was already waiting to be said
+        gap_start = max(self._last_end_time, queued_at)
+        self._gaps.append(time.time() - gap_start)
+
+    def _record_first_audio(self, started_at):
+        """Record time from summary generation start to its first audio"""
+        if started_at == self._current_started_at:
+            return
+        self._current_started_at = started_at
+        self._first_audio.append(time.time() - started_at)
+
+    def get_stats(self):
+        """Get pipeline depth and gap-between-utterances stats"""
+        gaps = sorted(self._gaps)
+        first_audio = sorted(self._first_audio)
+        return {
+            "pending": self._pending.qsize(),
+            "ready": self._ready.qsize(),
+            "utterances_played": self.utterances_played,
+            "dropped_stale": self.dropped_stale,
+            "failed_synthesis": self.failed_synthesis,
+            "gap_count": len(gaps),
+            "avg_gap_seconds": sum(gaps) / len(gaps) if gaps else 0.0,
+            "p95_gap_seconds": gaps[int(0.95 * (len(gaps) - 1))] if gaps else 0.0,
+            "max_gap_seconds": gaps[-1] if gaps else 0.0,
+            "avg_time_to_first_audio": sum(first_audio) / len(first_audio) if first_audio else 0.0,
+            "p95_time_to_first_audio": first_audio[int(0.95 * (len(first_audio) - 1))] if first_audio else 0.0
+        }
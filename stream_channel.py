@@ -0,0 +1,348 @@
+"""Per-stream chat state - buffer, rate tracking, cooldown and summary decisions for one stream"""
+
+import asyncio
+import logging
+import time
+import random
+from contextlib import aclosing
+from chat_rate import ChatRateTracker
+from chat_buffer import ChatBuffer, ChatEntry
+from chat_dedup import ChatDeduplicator
+from text_chunker import PhraseChunker
+from barkle_protocol import ChatMessage
+from groq_summarizer import SummaryDeadlineExceeded
+from config import (
+    FAST_CHAT_THRESHOLD, CHAT_SPEED_WINDOW, MIN_MESSAGES_FOR_GROQ, COOLDOWN, TIMEOUT,
+    GROQ_SUMMARY_DEADLINE, GROQ_STALE_POLICY, CHAT_SPEED_ESTIMATOR, GROQ_STREAMING
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class StreamChatChannel:
+    """One subscribed streamChat channel.
+
+    Summaries go to the shared `enqueue_summary(text, started_at=None, final=True)`
+    so every stream speaks through the same voice.
+    """
+
+    def __init__(self, stream_id, channel_id, summarizer, enqueue_summary):
+        self.stream_id = stream_id
+        self.channel_id = channel_id
+        self.summarizer = summarizer
+        self._enqueue = enqueue_summary
+        self.chat_buffer = ChatBuffer()
+        self.dedup = ChatDeduplicator()
+        self.chat_rate = ChatRateTracker()
+        self.subscribed = False
+        self._last_process_time = time.time()
+        self._last_response_time = 0  # Track when we last responded
+        self._groq_task = None  # In-flight Groq summary, if any
+        
+        # Stats
+        self.messages = 0
+        self.deletions = 0
+        self.groq_summaries = 0
+        self.random_selections = 0
+        self.stale_summaries = 0
+        self.groq_rejected = 0
+    
+    async def handle_stream_chat_message(self, message_data):
+        """Handle incoming stream chat messages"""
+        await self.handle_chat(ChatMessage.from_body(message_data))
+    
+    async def handle_chat(self, message):
+        """Buffer one parsed chat message and decide whether to respond"""
+        try:
+            message_text = message.text
+            if not message_text or message_text.isspace():
+                return
+                
+            # Record message for speed tracking
+            self.messages += 1
+            self.chat_rate.record()
+            
+            # Collapse repeats into the buffered original, otherwise add to buffer.
+            # Chat lines are logged lazily at DEBUG - at raid volume formatting them dominates.
+            duplicate = self.dedup.find_duplicate(message_text)
+            if duplicate is not None:
+                duplicate.count += 1
+                logger.debug("Stream Chat [%s] (repeat x%d): %s: %s",
+                             self.stream_id, duplicate.count, message.user_name, message_text)
+            else:
+                entry = ChatEntry(message.user_name, message_text)
+                self.chat_buffer.append(entry)
+                self.dedup.remember(entry)
+                logger.debug("Stream Chat [%s]: %s", self.stream_id, entry)
+            
+            # Check if we should process messages
+            await self.check_and_process_messages()
+                
+        except Exception as e:
+            logger.error(f"Error handling stream chat message: {e}")
+    
+    async def handle_message_deletion(self, deletion_data):
+        """Handle message deletion events"""
+        message_id = deletion_data.get("messageId", "")
+        self.deletions += 1
+        logger.info(f"Message {message_id} deleted")
+    
+    async def check_and_process_messages(self):
+        """Enhanced processing logic with cooldown"""
+        buffer_length = len(self.chat_buffer)
+        
+        if buffer_length < 1:
+            return
+        
+        # Keep buffering while a Groq summary is in flight
+        if self._groq_task and not self._groq_task.done():
+            logger.debug("Groq summary in flight, buffering (%d messages)", buffer_length)
+            return
+        
+        current_time = time.time()
+        time_since_last_response = current_time - self._last_response_time
+        chat_speed = self.calculate_chat_speed()
+        
+        logger.debug("[%s] Chat speed: %.1f msg/min, Buffer: %d", self.stream_id, chat_speed, buffer_length)
+        
+        # Check cooldown - prevent too frequent responses
+        if time_since_last_response < COOLDOWN:
+            remaining_cooldown = COOLDOWN - time_since_last_response
+            logger.debug("⏳ Cooldown active: %.1fs remaining", remaining_cooldown)
+            return
+        
+        # Processing logic with configurable thresholds
+        if chat_speed >= FAST_CHAT_THRESHOLD and buffer_length >= MIN_MESSAGES_FOR_GROQ:
+            logger.info(f"🚀 Using Groq (fast chat: {chat_speed:.1f} msg/min)")
+            await self.process_with_groq()
+        elif buffer_length >= 1:
+            logger.info(f"🎲 Using random selection ({buffer_length} messages)")
+            self.process_with_random_selection()
+        
+        # Fallback timeout processing (after cooldown expires)
+        elif buffer_length >= 1 and self._should_process_timeout():
+            logger.info(f"⏰ Timeout processing ({buffer_length} messages)")
+            self.process_with_random_selection()
+    
+    def _should_process_timeout(self):
+        """Check if we should process due to timeout"""
+        current_time = time.time()
+        time_since_last_response = current_time - self._last_response_time
+        time_since_last_process = current_time - self._last_process_time
+        
+        # Only timeout if cooldown has expired and we haven't processed in a while
+        return (time_since_last_response >= COOLDOWN and 
+                time_since_last_process >= TIMEOUT)
+    
+    async def process_with_groq(self):
+        """Start a Groq summary of the buffer in the background"""
+        if not self.summarizer.is_available():
+            logger.warning("Groq not available, using random selection")
+            self.process_with_random_selection()
+            return
+        
+        if not self.summarizer.is_healthy():
+            logger.info("Groq circuit open, using random selection")
+            self.process_with_random_selection()
+            return
+        
+        if not self.summarizer.has_capacity():
+            self.groq_rejected += 1
+            logger.warning(f"[{self.stream_id}] Groq request queue full or rate limited, using random selection")
+            self.process_with_random_selection()
+            return
+        
+        # Hand the current window to Groq; new chat keeps filling the buffer
+        entries = self.chat_buffer.drain()
+        self._last_process_time = time.time()
+        
+        if GROQ_STREAMING:
+            self._groq_task = asyncio.create_task(self._run_streamed_groq_summary(entries))
+        else:
+            self._groq_task = asyncio.create_task(self._run_groq_summary(entries))
+    
+    async def _run_groq_summary(self, entries):
+        """Await a Groq summary and queue it unless it arrived too late"""
+        started = time.time()
+        
+        try:
+            # The summarizer gives up as soon as the summary would be stale, rather
+            # than holding the window through every retry only to throw the answer away
+            summary = await self.summarizer.summarize_chat_messages_async(
+                [entry.formatted for entry in entries], deadline=GROQ_SUMMARY_DEADLINE, started_at=started
+            )
+            elapsed = time.time() - started
+            
+            if not summary:
+                # Put the window back and fall back to picking a message
+                self.chat_buffer.prepend(entries)
+                self.process_with_random_selection()
+                return
+            
+            processed_text = f"Chat buzz: {summary}"
+            self._enqueue(processed_text, started_at=started)
+            self.groq_summaries += 1
+            logger.info(f"Groq summary ({elapsed:.1f}s): {processed_text}")
+            
+            # Update response time
+            self._last_response_time = time.time()
+            
+        except SummaryDeadlineExceeded:
+            self._apply_stale_policy(entries, f"still pending after {time.time() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Error in Groq processing: {e}")
+            self.chat_buffer.prepend(entries)
+            self.process_with_random_selection()
+    
+    async def _run_streamed_groq_summary(self, entries):
+        """Stream a Groq summary, queueing each phrase as soon as it is complete"""
+        started = time.time()
+        chunker = PhraseChunker()
+        phrases_sent = 0
+        
+        def finish():
+            # The chunker may already have handed out the last phrase as non-final,
+            # so an empty final marker ends the summary and lets the pause apply
+            self._enqueue("", started_at=started, final=True)
+        
+        def send(phrase, final=False):
+            nonlocal phrases_sent
+            if not phrases_sent:
+                phrase = f"Chat buzz: {phrase}"
+                self.groq_summaries += 1
+                logger.info(f"First Groq phrase after {time.time() - started:.2f}s")
+            self._enqueue(phrase, started_at=started, final=final)
+            self._last_response_time = time.time()
+            phrases_sent += 1
+        
+        try:
+            stream = self.summarizer.stream_summary_async(
+                [entry.formatted for entry in entries], deadline=GROQ_SUMMARY_DEADLINE, started_at=started
+            )
+            async with aclosing(stream):
+                async for delta in stream:
+                    for phrase in chunker.feed(delta):
+                        if not phrases_sent and self._first_phrase_too_late(entries, started):
+                            return
+                        send(phrase)
+            
+        except SummaryDeadlineExceeded:
+            self._apply_stale_policy(entries, f"had no first token after {time.time() - started:.1f}s")
+            return
+        except Exception as e:
+            logger.error(f"Error in streamed Groq processing: {e}")
+            if not phrases_sent:
+                self.chat_buffer.prepend(entries)
+                self.process_with_random_selection()
+            else:
+                # Part of the summary is already being spoken, so end it here
+                finish()
+            return
+        
+        remaining = chunker.flush()
+        if remaining:
+            if not phrases_sent and self._first_phrase_too_late(entries, started):
+                return
+            send(remaining[0], final=True)
+        elif phrases_sent:
+            finish()
+        
+        if not phrases_sent:
+            # Nothing usable came back - put the window back and pick a message
+            self.chat_buffer.prepend(entries)
+            self.process_with_random_selection()
+    
+    def _first_phrase_too_late(self, entries, started):
+        """Apply the stale-summary policy to a streamed summary's first phrase"""
+        elapsed = time.time() - started
+        if elapsed <= GROQ_SUMMARY_DEADLINE:
+            return False
+        self._apply_stale_policy(entries, f"started after {elapsed:.1f}s")
+        return True
+    
+    def _apply_stale_policy(self, entries, reason):
+        """Drop a late summary, or merge its messages into the next window"""
+        self.stale_summaries += 1
+        if GROQ_STALE_POLICY == "merge":
+            logger.warning(f"Groq summary {reason}, merging its messages into the next window")
+            self.chat_buffer.prepend(entries)
+        else:
+            logger.warning(f"Groq summary {reason}, dropping stale summary")
+    
+    def process_with_random_selection(self):
+        """Process with actual message content - SINGLE MESSAGE ONLY"""
+        try:
+            if not self.chat_buffer:
+                return
+            
+            # Always pick just ONE message, regardless of buffer size
+            selected_message = random.choice(self.chat_buffer)
+            summary = selected_message.text.strip()  # Just the content
+            
+            self._enqueue(summary)
+            self.random_selections += 1
+            logger.info(f"Random selection: {summary}")
+            
+            # Update response time
+            self._last_response_time = time.time()
+            
+            self.chat_buffer.clear()
+            self._last_process_time = time.time()
+            
+        except Exception as e:
+            logger.error(f"Error in random selection: {e}")
+            if self.chat_buffer:
+                simple_summary = f"Chat activity from {len(self.chat_buffer)} viewers"
+                self._enqueue(simple_summary)
+                self._last_response_time = time.time()
+                self.chat_buffer.clear()
+                self._last_process_time = time.time()
+    
+    def calculate_chat_speed(self):
+        """Calculate messages per minute"""
+        if CHAT_SPEED_ESTIMATOR == "ewma":
+            return self.chat_rate.ewma_rate()
+        return self.chat_rate.rate(CHAT_SPEED_WINDOW)
+    
+    def get_buffer_stats(self):
+        """Get chat buffer size, dropped-message and collapsed-duplicate counters"""
+        return {**self.chat_buffer.get_stats(), **self.dedup.get_stats()}
+    
+    def get_chat_rates(self):
+        """Get chat rates over every tracked window, in messages per minute"""
+        return self.chat_rate.get_rates()
+    
+    def get_cooldown_status(self):
+        """Get current cooldown status"""
+        current_time = time.time()
+        time_since_last_response = current_time - self._last_response_time
+        remaining_cooldown = max(0, COOLDOWN - time_since_last_response)
+        
+        return {
+            "cooldown_active": remaining_cooldown > 0,
+            "remaining_seconds": remaining_cooldown,
+            "last_response_time": self._last_response_time
+        }
+    
+    def cancel(self):
+        """Abandon any in-flight summary for this stream"""
+        if self._groq_task and not self._groq_task.done():
+            self._groq_task.cancel()
+    
+    def get_stats(self):
+        """Get per-stream message, summary, buffer and rate metrics"""
+        return {
+            "stream_id": self.stream_id,
+            "channel_id": self.channel_id,
+            "subscribed": self.subscribed,
+            "messages": self.messages,
+            "deletions": self.deletions,
+            "groq_summaries": self.groq_summaries,
+            "random_selections": self.random_selections,
+            "stale_summaries": self.stale_summaries,
+            "groq_rejected": self.groq_rejected,
+            "chat_speed": self.calculate_chat_speed(),
+            "chat_rates": self.get_chat_rates(),
+            "buffer": self.get_buffer_stats(),
+            "cooldown": self.get_cooldown_status()
+        }
@@ -1,14 +1,74 @@
 """Updated stream ID helper with correct Barkle user ID format"""
 
-import requests
+import aiohttp
 import json
 import asyncio
-from config import BARKLE_TOKEN
+import time
+from collections import OrderedDict
+from backoff import backoff_delay
+from live_monitor import LiveStatusMonitor
+from config import (
+    BARKLE_TOKEN, BARKLE_API_URL, BARKLE_HTTP_TIMEOUT, BARKLE_HTTP_CONNECT_TIMEOUT,
+    BARKLE_HTTP_MAX_RETRIES, BARKLE_HTTP_RETRY_BASE_DELAY, BARKLE_HTTP_RETRY_MAX_DELAY,
+    BARKLE_HTTP_POOL_SIZE, BARKLE_STREAM_CACHE_TTL, BARKLE_STREAM_CACHE_MAX_ENTRIES
+)
+
+# Statuses worth retrying - rate limiting and server-side trouble
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 class BarkleStreamHelper:
-    def __init__(self, access_token):
+    def __init__(self, access_token, base_url=BARKLE_API_URL, session=None,
+                 timeout=BARKLE_HTTP_TIMEOUT, max_retries=BARKLE_HTTP_MAX_RETRIES,
+                 cache_ttl=BARKLE_STREAM_CACHE_TTL, retry_base_delay=BARKLE_HTTP_RETRY_BASE_DELAY,
+                 retry_max_delay=BARKLE_HTTP_RETRY_MAX_DELAY,
+                 cache_max_entries=BARKLE_STREAM_CACHE_MAX_ENTRIES):
         self.access_token = access_token
-        self.base_url = "https://barkle.chat/api"
+        self.base_url = base_url.rstrip("/")
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=BARKLE_HTTP_CONNECT_TIMEOUT)
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay  # Also caps how long a Retry-After can hold us
+        
+        # Pass a session in to control the transport (e.g. a local stub server in tests)
+        self._session = session
+        self._owns_session = session is None
+        
+        # live/get responses by user, and lookups currently on the wire
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self._stream_cache = OrderedDict()  # formatted user ID -> (fetched_at, response), least recently used first
+        self._in_flight = {}  # formatted user ID -> task
+        
+        # Stats
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    def _get_session(self):
+        """Shared keep-alive session, created on first use inside the running loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=BARKLE_HTTP_POOL_SIZE, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={'Authorization': f'Bearer {self.access_token}'}
+            )
+            self._owns_session = True
+        return self._session
+    
+    async def close(self):
+        """Close the pooled session if this helper created it"""
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
         
     def format_user_id(self, user_id):
         """Ensure user ID has proper barkle: prefix"""
@@ -16,17 +76,17 @@ class BarkleStreamHelper:
             return f"barkle:{user_id}"
         return user_id
         
-    async def get_stream_data(self, user_id):
-        """Get complete stream data for a specific user"""
+    async def get_stream_data(self, user_id, max_age=None):
+        """Get complete stream data for a specific user.
+        
+        `max_age` is the oldest cached answer (in seconds) the caller will
+        accept; it defaults to the helper's cache TTL and 0 forces a fresh lookup.
+        """
         try:
             # Format the user ID correctly
             formatted_user_id = self.format_user_id(user_id)
             
-            response = await self._make_request(
-                endpoint="live/get",
-                method="POST",
-                data={"userId": formatted_user_id}
-            )
+            response = await self._fetch_stream(formatted_user_id, max_age)
             
             if response and response.get("isActive"):
                 return response
@@ -38,50 +98,140 @@ class BarkleStreamHelper:
             print(f"Error fetching stream data: {e}")
             return None
     
-    async def get_stream_id(self, user_id):
+    async def get_stream_id(self, user_id, max_age=None):
         """Get just the stream ID for a user"""
-        stream_data = await self.get_stream_data(user_id)
+        stream_data = await self.get_stream_data(user_id, max_age)
         return stream_data.get("id") if stream_data else None
     
-    async def is_user_live(self, user_id):
+    async def is_user_live(self, user_id, max_age=None):
         """Check if a user is currently live streaming"""
-        stream_data = await self.get_stream_data(user_id)
+        stream_data = await self.get_stream_data(user_id, max_age)
         return stream_data.get("isActive", False) if stream_data else False
     
-    async def get_viewer_count(self, user_id):
+    async def get_viewer_count(self, user_id, max_age=None):
         """Get current viewer count for a user's stream"""
-        stream_data = await self.get_stream_data(user_id)
+        stream_data = await self.get_stream_data(user_id, max_age)
         return stream_data.get("viewers", 0) if stream_data else 0
     
-    async def _make_request(self, endpoint, method="GET", data=None):
-        """Make HTTP request to Barkle API"""
+    async def get_live_status(self, user_id, max_age=None):
+        """Raw live/get answer for a user, or None if the lookup failed.
+        
+        Unlike get_stream_data this tells "offline" apart from "couldn't tell".
+        """
         try:
-            url = f"{self.base_url}/{endpoint}"
-            headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            if method == "POST":
-                response = requests.post(url, headers=headers, json=data)
-            else:
-                response = requests.get(url, headers=headers)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"API Error: {response.status_code} - {response.text}")
-                return None
-                
+            return await self._fetch_stream(self.format_user_id(user_id), max_age)
         except Exception as e:
-            print(f"Request error: {e}")
+            print(f"Error fetching stream data: {e}")
             return None
+    
+    async def _fetch_stream(self, formatted_user_id, max_age=None):
+        """live/get for a user - from the cache if fresh enough, else one shared request"""
+        max_age = self.cache_ttl if max_age is None else max_age
+        
+        cached = self._stream_cache.get(formatted_user_id)
+        if cached and time.monotonic() - cached[0] <= max_age:
+            self.cache_hits += 1
+            self._stream_cache.move_to_end(formatted_user_id)
+            return cached[1]
+        
+        # Join a lookup that's already on the wire instead of sending another
+        task = self._in_flight.get(formatted_user_id)
+        if task:
+            self.coalesced += 1
+        else:
+            task = asyncio.create_task(self._request_stream(formatted_user_id))
+            self._in_flight[formatted_user_id] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(formatted_user_id, None))
+        
+        # Shielded so one caller giving up doesn't cancel it for the others
+        return await asyncio.shield(task)
+    
+    async def _request_stream(self, formatted_user_id):
+        response = await self._make_request(
+            endpoint="live/get",
+            method="POST",
+            data={"userId": formatted_user_id}
+        )
+        # Failures aren't cached so the next lookup tries again
+        if response is not None:
+            self._store_stream(formatted_user_id, response)
+        return response
+    
+    def _store_stream(self, formatted_user_id, response):
+        """Cache a live/get answer, dropping expired entries and then the least recently used"""
+        now = time.monotonic()
+        for user_id in [uid for uid, (fetched_at, _) in self._stream_cache.items() if now - fetched_at > self.cache_ttl]:
+            del self._stream_cache[user_id]
+        
+        self._stream_cache[formatted_user_id] = (now, response)
+        self._stream_cache.move_to_end(formatted_user_id)
+        while len(self._stream_cache) > self.cache_max_entries:
+            self._stream_cache.popitem(last=False)
+    
+    def invalidate(self, user_id=None):
+        """Forget cached stream data for one user, or everyone"""
+        if user_id is None:
+            self._stream_cache.clear()
+        else:
+            self._stream_cache.pop(self.format_user_id(user_id), None)
+    
+    async def _make_request(self, endpoint, method="GET", data=None):
+        """Make HTTP request to Barkle API, retrying transient failures with backoff"""
+        url = f"{self.base_url}/{endpoint}"
+        session = self._get_session()
+        
+        for attempt in range(self.max_retries + 1):
+            self.requests += 1
+            try:
+                async with session.request(method, url, json=data if method == "POST" else None) as response:
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+                    
+                    text = await response.text()
+                    if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                        print(f"API Error: {response.status} - {text}")
+                        self.failures += 1
+                        return None
+                    
+                    retry_after = response.headers.get("Retry-After")
+                    if retry_after and retry_after.isdigit():
+                        delay = min(float(retry_after), self.retry_max_delay)
+                    else:
+                        delay = self._backoff(attempt)
+                    
+            except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+                if attempt == self.max_retries:
+                    print(f"Request error: {e}")
+                    self.failures += 1
+                    return None
+                delay = self._backoff(attempt)
+            
+            self.retries += 1
+            await asyncio.sleep(delay)
+        
+        return None
+    
+    def _backoff(self, attempt):
+        return backoff_delay(attempt, self.retry_base_delay, self.retry_max_delay)
+    
+    def get_http_stats(self):
+        """Get request, retry, failure and stream cache counters"""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "cached_users": len(self._stream_cache)
+        }
 
 # Test function with multiple user ID formats
 async def test_stream_api():
     """Test the stream API with proper user ID formatting"""
-    helper = BarkleStreamHelper(BARKLE_TOKEN)
-    
+    async with BarkleStreamHelper(BARKLE_TOKEN) as helper:
+        return await _test_user_ids(helper)
+
+async def _test_user_ids(helper):
     # Test with different user ID formats
     test_user_ids = [
         "example_user_123",  # Will be formatted to barkle:example_user_123
@@ -113,13 +263,15 @@ async def test_stream_api():
 # Utility functions
 async def get_stream_id_for_user(user_id, access_token=BARKLE_TOKEN):
     """Convenient function to get stream ID with proper formatting"""
-    helper = BarkleStreamHelper(access_token)
-    return await helper.get_stream_id(user_id)
+    async with BarkleStreamHelper(access_token) as helper:
+        return await helper.get_stream_id(user_id)
 
 async def find_live_users():
     """Helper to find users who are currently live"""
-    helper = BarkleStreamHelper(BARKLE_TOKEN)
-    
+    async with BarkleStreamHelper(BARKLE_TOKEN) as helper:
+        return await _find_live_users(helper)
+
+async def _find_live_users(helper):
     # Example: Check a list of known user IDs
     known_users = [
         "popular_streamer_1",
@@ -127,19 +279,17 @@ async def find_live_users():
         "tech_creator_3"
     ]
     
-    live_users = []
-    
-    for user_id in known_users:
-        if await helper.is_user_live(user_id):
-            stream_data = await helper.get_stream_data(user_id)
-            live_users.append({
-                "user_id": helper.format_user_id(user_id),
-                "stream_id": stream_data.get("id"),
-                "title": stream_data.get("title"),
-                "viewers": stream_data.get("viewers")
-            })
-    
-    return live_users
+    # Check them all at once rather than one round trip after another
+    monitor = LiveStatusMonitor(helper, known_users)
+    return [
+        {
+            "user_id": state.user_id,
+            "stream_id": state.stream_data.get("id"),
+            "title": state.stream_data.get("title"),
+            "viewers": state.stream_data.get("viewers")
+        }
+        for state in await monitor.check_all() if state.is_live
+    ]
 
 if __name__ == "__main__":
     asyncio.run(test_stream_api())
@@ -0,0 +1,105 @@
+"""Summary cache keyed on a canonical fingerprint of the chat window"""
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from chat_dedup import normalize_message
+from config import SUMMARY_CACHE_TTL, SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_SIMILARITY
+
+_REPEAT_SUFFIX = re.compile(r"\s*\(x\d+\)$")
+
+def canonical_message_set(messages):
+    """Normalized message texts, ignoring who said them and repeat counts"""
+    canonical = set()
+    for message in messages:
+        _, _, text = message.partition(":")
+        normalized = normalize_message(_REPEAT_SUFFIX.sub("", text or message))
+        if normalized:
+            canonical.add(normalized)
+    return frozenset(canonical)
+
+def fingerprint(message_set):
+    return hashlib.sha1("\n".join(sorted(message_set)).encode("utf-8")).hexdigest()
+
+class SummaryCache:
+    def __init__(self, ttl=SUMMARY_CACHE_TTL, max_entries=SUMMARY_CACHE_MAX_ENTRIES,
+                 similarity=SUMMARY_CACHE_SIMILARITY):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self._entries = OrderedDict()  # fingerprint -> (created_at, message set, summary)
+
+        # Stats
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+        self._avg_latency = None  # EWMA of real summary latency
+
+    def _expire(self, now):
+        # LRU order isn't age order, so check every entry (the cache is small)
+        expired = [key for key, (created_at, _, _) in self._entries.items() if now - created_at > self.ttl]
+        for key in expired:
+            del self._entries[key]
+
+    def get(self, messages):
+        """Return a cached summary for this window or a near-identical one"""
+        now = time.time()
+        self._expire(now)
+
+        message_set = canonical_message_set(messages)
+        if not message_set:
+            return None
+
+        key = fingerprint(message_set)
+        cached = self._entries.get(key)
+        if cached:
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            self._record_saving()
+            return cached[2]
+
+        if self.similarity < 1:
+            for other_key, (_, other_set, summary) in reversed(self._entries.items()):
+                overlap = len(message_set & other_set)
+                if overlap and overlap / len(message_set | other_set) >= self.similarity:
+                    self._entries.move_to_end(other_key)
+                    self.similar_hits += 1
+                    self._record_saving()
+                    return summary
+
+        self.misses += 1
+        return None
+
+    def put(self, messages, summary, latency=None):
+        """Cache a summary, recording how long it took to generate"""
+        message_set = canonical_message_set(messages)
+        if not message_set or not summary:
+            return
+
+        if latency is not None:
+            self._avg_latency = latency if self._avg_latency is None else 0.8 * self._avg_latency + 0.2 * latency
+
+        key = fingerprint(message_set)
+        self._entries.pop(key, None)
+        self._entries[key] = (time.time(), message_set, summary)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _record_saving(self):
+        if self._avg_latency is not None:
+            self.latency_saved += self._avg_latency
+
+    def get_stats(self):
+        """Get hit rates and estimated LLM time saved"""
+        hits = self.exact_hits + self.similar_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "latency_saved_seconds": self.latency_saved
+        }
@@ -0,0 +1,28 @@
+import asyncio
+from barkle_connector import EnhancedBarkleConnector
+from barkle_standin import BarkleStandIn
+
+def test_live_monitor_runs_with_a_configured_stream_id():
+    async def run():
+        standin = BarkleStandIn(live_streams={"username_to_monitor": "stream-2"})
+        await standin.start()
+        connector = EnhancedBarkleConnector(stream_ids=["stream-1"], ws_url=standin.ws_url)
+        connector.stream_helper.base_url = standin.api_url
+
+        async def stay_connected():
+            await asyncio.Event().wait()
+        connector._websocket_connection_loop = stay_connected
+
+        task = asyncio.create_task(connector.connect_to_chat())
+        try:
+            await asyncio.wait_for(connector._stream_found.wait(), 5)
+            return connector.current_stream_id, sorted(connector._channel_ids)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await connector.close()
+            await standin.stop()
+
+    current_stream_id, followed = asyncio.run(run())
+    assert current_stream_id == "stream-2"
+    assert followed == ["stream-2"]
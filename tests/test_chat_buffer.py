@@ -0,0 +1,28 @@
+import random
+from chat_buffer import ChatBuffer, ChatEntry, ReservoirPolicy
+
+def test_reservoir_stays_uniform_after_requeue():
+    trials = 3000
+    kept = [0] * 100
+    rng = random.Random(7)
+    for _ in range(trials):
+        buffer = ChatBuffer(max_messages=10, max_bytes=10 ** 6, policy=ReservoirPolicy(rng))
+        # A failed summary puts its window back, then new chat keeps arriving
+        buffer.prepend([ChatEntry("old", str(index)) for index in range(10)])
+        for index in range(10, 100):
+            buffer.append(ChatEntry("new", str(index)))
+        assert len(buffer) == 10
+        for entry in buffer:
+            kept[int(entry.text)] += 1
+
+    # Every one of the 100 messages should survive with probability 10/100
+    for count in kept:
+        assert abs(count / trials - 0.1) < 0.03
+    assert abs(sum(kept[:10]) / trials - 1.0) < 0.15
+
+def test_prepend_keeps_order_and_limits():
+    buffer = ChatBuffer(max_messages=3, max_bytes=10 ** 6)
+    buffer.append(ChatEntry("a", "new"))
+    buffer.prepend([ChatEntry("a", "old1"), ChatEntry("a", "old2")])
+    assert [entry.text for entry in buffer] == ["old1", "old2", "new"]
+    assert buffer.offered_since_drain == 3
@@ -0,0 +1,41 @@
+from chat_buffer import ChatEntry
+from chat_dedup import ChatDeduplicator, normalize_message
+
+def buffered(dedup, text):
+    entry = ChatEntry("viewer", text)
+    entry.buffered = True
+    dedup.remember(entry)
+    return entry
+
+def test_stretched_and_punctuated_text_matches():
+    assert normalize_message("LOOOL!!") == normalize_message("lol")
+    assert normalize_message("gg gg gg") == "gg"
+    assert normalize_message("cool") == "cool"
+
+def test_numbers_stay_distinct():
+    assert normalize_message("100") != normalize_message("10")
+    assert normalize_message("2000") != normalize_message("20")
+    assert normalize_message("bet 500") != normalize_message("bet 50")
+    dedup = ChatDeduplicator(window=50, similarity=0.8)
+    buffered(dedup, "100")
+    assert dedup.find_duplicate("10") is None
+
+def test_emoji_and_punctuation_only_messages_stay_distinct():
+    assert normalize_message("🔥🔥🔥") == normalize_message("🔥")
+    assert normalize_message("❤️❤️") == normalize_message("❤️")
+    assert normalize_message("🔥") != normalize_message("❤️")
+    assert normalize_message("???") != normalize_message("!!!")
+    assert normalize_message("???")
+
+def test_different_reactions_are_not_duplicates():
+    dedup = ChatDeduplicator(window=50, similarity=0.8)
+    fire = buffered(dedup, "🔥🔥🔥")
+    assert dedup.find_duplicate("❤️") is None
+    assert dedup.find_duplicate("???") is None
+    assert dedup.find_duplicate("🔥") is fire
+
+def test_near_duplicates_still_collapse():
+    dedup = ChatDeduplicator(window=50, similarity=0.6)
+    entry = buffered(dedup, "that boss is brutal")
+    assert dedup.find_duplicate("that boss is brutal!!") is entry
+    assert dedup.find_duplicate("that boss is so brutal") is entry
@@ -0,0 +1,38 @@
+import pytest
+from chat_rate import ChatRateTracker, SlidingWindowCounter, EWMARate
+
+def steady(record, start, end, every):
+    """Record one event every `every` seconds, offset half a step into [start, end)"""
+    for step in range(round((end - start) / every)):
+        record(start + (step + 0.5) * every)
+
+def test_window_rate_counts_only_the_window():
+    counter = SlidingWindowCounter(10, buckets=10)
+    steady(counter.add, 0, 20, 0.5)  # 2 per second
+    assert counter.count(now=19.9) == 20
+    assert counter.rate_per_minute(now=19.9) == pytest.approx(120)
+    assert counter.count(now=40) == 0
+
+def test_recent_rate_counts_the_filling_bucket_for_its_elapsed_time():
+    counter = SlidingWindowCounter(10, buckets=10)
+    steady(counter.add, 100, 105.5, 0.5)  # 2 per second, last event at 105.25
+    # 103 and 104 are full, 105 has covered half a second
+    assert counter.recent_rate_per_minute(3, now=105.5) == pytest.approx(120)
+    # Chat stopped - 104 and 105 hold 3 events, and 106 has only just begun
+    assert counter.recent_rate_per_minute(3, now=106.0) == pytest.approx(90)
+
+def test_recent_rate_with_nothing_recorded():
+    assert SlidingWindowCounter(10).recent_rate_per_minute(3, now=50) == 0.0
+
+def test_tracker_recent_rate_uses_the_finest_covering_window():
+    tracker = ChatRateTracker(windows=[10, 60], speed_window=60)
+    steady(tracker.record, 0, 30, 0.05)  # 20 per second
+    assert tracker.recent_rate(3, now=30.1) == pytest.approx(1200, rel=0.05)
+    assert tracker.rate(60, now=30.1) == pytest.approx(600, rel=0.05)
+
+def test_ewma_decays_towards_zero():
+    ewma = EWMARate(time_constant=30)
+    for second in range(300):
+        ewma.add(float(second))
+    assert ewma.rate_per_minute(now=300) == pytest.approx(60, rel=0.05)
+    assert ewma.rate_per_minute(now=420) < 2
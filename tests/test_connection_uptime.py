@@ -0,0 +1,21 @@
+from chat_rate import ChatRateTracker
+from connection_uptime import ConnectionUptime
+
+def test_startup_failures_count_as_an_outage():
+    uptime = ConnectionUptime()
+    uptime.mark_disconnected(chat_rate=60)
+    uptime.mark_disconnected(chat_rate=60)  # A second failed attempt is the same outage
+    uptime.mark_connected()
+    stats = uptime.get_stats()
+    assert stats["connects"] == 1
+    assert stats["reconnects"] == 1
+    assert len(stats["outages"]) == 1
+
+def test_outage_rate_ignores_an_earlier_raid():
+    tracker = ChatRateTracker(windows=[10, 60], speed_window=60)
+    # A raid of 3000 messages from 5s to 8s, then 5 msg/s until the drop at 12s
+    tracker.record(now=1000.0 + 6, count=3000)
+    for tenth in range(80, 120, 2):
+        tracker.record(now=1000.0 + tenth / 10)
+    assert tracker.rate(60, now=1012.0) > 3000
+    assert 200 <= tracker.recent_rate(3, now=1012.0) <= 400
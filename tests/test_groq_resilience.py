@@ -0,0 +1,169 @@
+import asyncio
+import time
+from types import SimpleNamespace
+import pytest
+import groq_resilience
+import groq_summarizer
+import stream_channel
+from chat_buffer import ChatEntry
+from groq_resilience import CircuitBreaker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return time.monotonic()
+
+def make_breaker(monkeypatch, failures=3, reset=60):
+    clock = FakeClock()
+    monkeypatch.setattr(groq_resilience, "time", clock)
+    return CircuitBreaker(failure_threshold=failures, reset_timeout=reset), clock
+
+def test_breaker_opens_after_consecutive_failures(monkeypatch):
+    breaker, _ = make_breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    assert not breaker.begin_request()
+    assert breaker.times_opened == 1
+
+def test_success_resets_failure_count(monkeypatch):
+    breaker, _ = make_breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_lets_one_trial_through(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch, failures=1)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert breaker.begin_request()
+    assert not breaker.allow_request()
+    assert not breaker.begin_request()
+
+def test_successful_trial_closes(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch, failures=1)
+    breaker.record_failure()
+    clock.now += 60
+    breaker.begin_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.begin_request() and breaker.begin_request()
+
+def test_failed_trial_reopens(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch, failures=3)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 60
+    breaker.begin_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+    clock.now += 59
+    assert not breaker.allow_request()
+
+def test_released_or_abandoned_trial_frees_the_slot(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch, failures=1)
+    breaker.record_failure()
+    clock.now += 60
+    breaker.begin_request()
+    breaker.release()
+    assert breaker.begin_request()
+    clock.now += 60
+    assert breaker.begin_request()
+
+class FailingClient:
+    """AsyncGroq stand-in whose calls all time out after `delay` seconds"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        raise asyncio.TimeoutError()
+
+def make_summarizer(monkeypatch, client):
+    monkeypatch.setattr(groq_summarizer, "backoff_delay", lambda attempt: 0.0)
+    summarizer = groq_summarizer.GroqSummarizer()
+    summarizer.summary_cache = None
+    summarizer.client = summarizer.async_client = client
+    return summarizer
+
+def test_retries_count_as_one_breaker_failure(monkeypatch):
+    client = FailingClient()
+    summarizer = make_summarizer(monkeypatch, client)
+    summary = asyncio.run(summarizer.summarize_chat_messages_async(["a: hi"]))
+    assert summary is None
+    assert client.calls == groq_summarizer.GROQ_MAX_RETRIES + 1
+    assert summarizer.breaker.get_stats()["consecutive_failures"] == 1
+    assert summarizer.breaker.state == CircuitBreaker.CLOSED
+
+def test_retries_stop_at_the_summary_deadline(monkeypatch):
+    client = FailingClient(delay=10)
+    summarizer = make_summarizer(monkeypatch, client)
+    started = time.monotonic()
+    with pytest.raises(groq_summarizer.SummaryDeadlineExceeded):
+        asyncio.run(summarizer.summarize_chat_messages_async(["a: hi"], deadline=0.2))
+    assert time.monotonic() - started < 1
+    assert client.calls == 1
+    assert summarizer.breaker.get_stats()["consecutive_failures"] == 1
+
+class HangingClient:
+    """AsyncGroq stand-in that never answers"""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.Event().wait()
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_hanging_groq_opens_the_breaker_from_a_channel(monkeypatch, streaming):
+    monkeypatch.setattr(stream_channel, "GROQ_STREAMING", streaming)
+    monkeypatch.setattr(stream_channel, "GROQ_SUMMARY_DEADLINE", 0.1)
+    summarizer = make_summarizer(monkeypatch, HangingClient())
+    spoken = []
+    channel = stream_channel.StreamChatChannel("stream-1", "channel-1", summarizer,
+                                               lambda text, **kwargs: spoken.append(text))
+
+    async def run():
+        for window in range(5):
+            channel.chat_buffer.append(ChatEntry("a", f"hi {window}"))
+            await channel.process_with_groq()
+            if channel._groq_task:
+                await channel._groq_task
+                channel._groq_task = None
+
+    asyncio.run(run())
+    assert summarizer.breaker.state == CircuitBreaker.OPEN
+    assert summarizer.breaker.get_stats()["consecutive_failures"] == 3
+    assert channel.stale_summaries == 3
+    assert summarizer.short_circuited == 0  # Later windows see is_healthy() and pick a message instead
+    assert channel.random_selections == 2
+
+def test_retry_after_is_capped_and_pauses_new_summaries(monkeypatch):
+    summarizer = make_summarizer(monkeypatch, FailingClient())
+    error = SimpleNamespace(response=SimpleNamespace(headers={"retry-after": "3600"}))
+    pause = summarizer._retry_after(error)
+    assert pause == groq_summarizer.GROQ_RETRY_MAX_DELAY
+
+    assert summarizer.has_capacity()
+    summarizer.rate_limiter.pause(pause)
+    assert summarizer.rate_limiter.is_paused()
+    assert not summarizer.has_capacity()
@@ -0,0 +1,48 @@
+import asyncio
+import time
+from speech_pipeline import SpeechPipeline
+
+class FakeTTS:
+    """Renders instantly (None for "fail"), plays for `play_seconds`, logs when each line starts"""
+
+    def __init__(self, play_seconds=0.02):
+        self.play_seconds = play_seconds
+        self.played = []
+
+    def text_to_speech(self, text):
+        return None if text == "fail" else text
+
+    def play_speech(self, audio_file):
+        self.played.append((audio_file, time.monotonic()))
+        time.sleep(self.play_seconds)
+
+    def discard_audio(self, audio_file):
+        pass
+
+def speak(lines, delay):
+    tts = FakeTTS()
+
+    async def run():
+        pipeline = SpeechPipeline(tts, stale_after=0, delay=delay)
+        pipeline.start()
+        for text, final in lines:
+            pipeline.submit(text, final=final)
+        while len(tts.played) < sum(1 for text, _ in lines if text not in ("", "fail")):
+            await asyncio.sleep(0.01)
+        stats = pipeline.get_stats()
+        await pipeline.stop()
+        return stats
+
+    return asyncio.run(run()), tts.played
+
+def test_gap_excludes_the_pause_between_summaries():
+    stats, played = speak([("one", True), ("two", True)], delay=0.3)
+    assert played[1][1] - played[0][1] >= 0.3
+    assert stats["gap_count"] == 1
+    assert stats["max_gap_seconds"] < 0.2
+
+def test_pause_follows_a_summary_whose_last_phrase_failed():
+    stats, played = speak([("first phrase", False), ("fail", True), ("next summary", True)], delay=0.3)
+    assert [text for text, _ in played] == ["first phrase", "next summary"]
+    assert played[1][1] - played[0][1] >= 0.3
+    assert stats["failed_synthesis"] == 1
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from aiohttp import web
+from stream_id_helper import BarkleStreamHelper
+
+async def serve(responses):
+    """Local live/get that answers with each of `responses` (status, headers) in turn, then 200"""
+    calls = []
+
+    async def live_get(request):
+        calls.append(time.monotonic())
+        if len(calls) <= len(responses):
+            status, headers = responses[len(calls) - 1]
+            return web.Response(status=status, headers=headers)
+        return web.json_response({"isActive": True, "id": "stream-1"})
+
+    app = web.Application()
+    app.router.add_post("/api/live/get", live_get)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}/api", calls
+
+def test_retry_after_is_capped():
+    async def run():
+        runner, url, calls = await serve([(429, {"Retry-After": "3600"})])
+        try:
+            async with BarkleStreamHelper("token", base_url=url, retry_max_delay=0.2) as helper:
+                started = time.monotonic()
+                stream_id = await helper.get_stream_id("someone", max_age=0)
+                return stream_id, time.monotonic() - started, len(calls), helper.get_http_stats()
+        finally:
+            await runner.cleanup()
+
+    stream_id, elapsed, calls, stats = asyncio.run(run())
+    assert stream_id == "stream-1"
+    assert elapsed < 2
+    assert calls == 2
+    assert stats["retries"] == 1
+
+def test_gives_up_after_max_retries():
+    async def run():
+        runner, url, calls = await serve([(503, {})] * 5)
+        try:
+            async with BarkleStreamHelper("token", base_url=url, max_retries=2,
+                                          retry_base_delay=0.01, retry_max_delay=0.02) as helper:
+                return await helper.get_live_status("someone", max_age=0), len(calls)
+        finally:
+            await runner.cleanup()
+
+    status, calls = asyncio.run(run())
+    assert status is None
+    assert calls == 3
+
+def test_stream_cache_is_bounded():
+    async def run():
+        runner, url, calls = await serve([])
+        try:
+            async with BarkleStreamHelper("token", base_url=url, cache_max_entries=2) as helper:
+                await helper.get_stream_id("alice")
+                await helper.get_stream_id("bob")
+                await helper.get_stream_id("alice")  # Hit - bob is now least recently used
+                await helper.get_stream_id("carol")
+                cached = list(helper._stream_cache)
+                await helper.get_stream_id("alice")
+                return cached, len(calls), helper.get_http_stats()
+        finally:
+            await runner.cleanup()
+
+    cached, calls, stats = asyncio.run(run())
+    assert cached == ["barkle:alice", "barkle:carol"]
+    assert calls == 3
+    assert stats["cache_hits"] == 2
+    assert stats["cached_users"] == 2
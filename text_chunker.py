@@ -0,0 +1,56 @@
+"""Split text into speakable phrases, either all at once or as it streams in"""
+
+import re
+from config import SPEECH_CHUNK_MIN_CHARS, SPEECH_CHUNK_MAX_CHARS
+
+# Sentence ends always split; clause breaks only once a phrase is long enough
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s+")
+_CLAUSE_BREAK = re.compile(r"[,;:–—]\s+")
+
+class PhraseChunker:
+    """Incrementally cut text into phrases at sentence and clause boundaries"""
+
+    def __init__(self, min_chars=SPEECH_CHUNK_MIN_CHARS, max_chars=SPEECH_CHUNK_MAX_CHARS):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._pending = ""
+
+    def feed(self, text):
+        """Add text and return any phrases that are now complete"""
+        self._pending += text
+        phrases = []
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            phrase = self._pending[:cut].strip()
+            self._pending = self._pending[cut:].lstrip()
+            if phrase:
+                phrases.append(phrase)
+        return phrases
+
+    def flush(self):
+        """Return whatever is left as a final phrase"""
+        phrase = self._pending.strip()
+        self._pending = ""
+        return [phrase] if phrase else []
+
+    def _find_cut(self):
+        text = self._pending
+        # Earliest boundary wins, but don't split off fragments like "Wow." on their own
+        cuts = [match.end() for match in _SENTENCE_END.finditer(text) if match.end() >= self.min_chars]
+        cuts += [match.end() for match in _CLAUSE_BREAK.finditer(text) if match.start() >= self.min_chars]
+        if cuts:
+            return min(cuts)
+
+        if len(text) > self.max_chars:
+            # Too long without punctuation - break at the last space
+            space = text.rfind(" ", 0, self.max_chars)
+            return space + 1 if space > 0 else self.max_chars
+
+        return None
+
+def split_phrases(text, min_chars=SPEECH_CHUNK_MIN_CHARS, max_chars=SPEECH_CHUNK_MAX_CHARS):
+    """Split complete text into phrases"""
+    chunker = PhraseChunker(min_chars, max_chars)
+    return chunker.feed(text) + chunker.flush()
@@ -0,0 +1,155 @@
+"""Content-addressed TTS audio cache with memory and disk LRU tiers"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from config import TTS_CACHE_MEMORY_MB, TTS_CACHE_DIR, TTS_CACHE_DISK_MB
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TTSAudioCache:
+    def __init__(self, max_memory_bytes=TTS_CACHE_MEMORY_MB * 1024 * 1024,
+                 disk_dir=TTS_CACHE_DIR, max_disk_bytes=TTS_CACHE_DISK_MB * 1024 * 1024):
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._lock = threading.Lock()
+
+        # key -> audio bytes / file size, least recently used first
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+
+        # Stats
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_dir:
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(text, lang, slow, engine="gtts"):
+        """Build a cache key from normalized text and voice settings"""
+        normalized = " ".join(text.casefold().split())
+        raw = f"{engine}|{lang}|{int(bool(slow))}|{normalized}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _load_disk_index(self):
+        """Index existing disk entries, oldest first"""
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.disk_dir):
+                path = os.path.join(self.disk_dir, name)
+                if name.endswith(".audio") and os.path.isfile(path):
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, name[:-len(".audio")], stat.st_size))
+
+            for _, key, size in sorted(entries):
+                self._disk[key] = size
+                self._disk_bytes += size
+
+            logger.info(f"TTS disk cache: {len(self._disk)} entries in {self.disk_dir}")
+        except Exception as e:
+            logger.error(f"TTS disk cache disabled: {e}")
+            self.disk_dir = None
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.audio")
+
+    def get(self, key):
+        """Get cached audio bytes, or None"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+            if self.disk_dir and key in self._disk:
+                try:
+                    path = self._disk_path(key)
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    os.utime(path)
+                    self._disk.move_to_end(key)
+                    self._store_memory(key, data)
+                    self.disk_hits += 1
+                    return data
+                except OSError as e:
+                    logger.warning(f"TTS disk cache read failed: {e}")
+                    self._drop_disk(key)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, data):
+        """Cache audio bytes in every enabled tier"""
+        if not data:
+            return
+
+        with self._lock:
+            self._store_memory(key, data)
+
+            if self.disk_dir and key not in self._disk and len(data) <= self.max_disk_bytes:
+                try:
+                    with open(self._disk_path(key), "wb") as f:
+                        f.write(data)
+                    self._disk[key] = len(data)
+                    self._disk_bytes += len(data)
+                    while self._disk_bytes > self.max_disk_bytes:
+                        self._drop_disk(next(iter(self._disk)))
+                        self.evictions += 1
+                except OSError as e:
+                    logger.warning(f"TTS disk cache write failed: {e}")
+
+    def _store_memory(self, key, data):
+        if len(data) > self.max_memory_bytes:
+            return
+
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _drop_disk(self, key):
+        size = self._disk.pop(key, 0)
+        self._disk_bytes -= size
+        try:
+            os.unlink(self._disk_path(key))
+        except OSError:
+            pass
+
+    def contains(self, key):
+        """Check if a key is cached without touching LRU order or stats"""
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def get_stats(self):
+        """Get hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes
+            }
@@ -0,0 +1,157 @@
+"""Pluggable TTS engines - network gTTS, local espeak, and a deadline-based fallback"""
+
+import io
+import logging
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from config import TTS_ENGINE, TTS_ENGINE_DEADLINE, TTS_FALLBACK_COOLDOWN
+
+try:
+    from gtts import gTTS
+    GTTS_AVAILABLE = True
+except ImportError:
+    GTTS_AVAILABLE = False
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def audio_format(data):
+    """Guess the container format of synthesized audio bytes"""
+    return "wav" if data[:4] == b"RIFF" else "mp3"
+
+class TTSEngine:
+    """Base class - engines turn text into encoded audio bytes"""
+    name = "base"
+
+    def synthesize(self, text, lang, slow=False):
+        """Return encoded audio bytes for text"""
+        raise NotImplementedError
+
+    def synthesize_with_source(self, text, lang, slow=False):
+        """Return (audio bytes, name of the engine that produced them)"""
+        return self.synthesize(text, lang, slow), self.name
+
+    @property
+    def preferred_name(self):
+        """Name of the engine used when everything is healthy"""
+        return self.name
+
+    def is_available(self):
+        return True
+
+class GTTSEngine(TTSEngine):
+    """Google Translate TTS - needs network access"""
+    name = "gtts"
+
+    def synthesize(self, text, lang, slow=False):
+        audio = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=slow).write_to_fp(audio)
+        return audio.getvalue()
+
+    def is_available(self):
+        return GTTS_AVAILABLE
+
+class EspeakEngine(TTSEngine):
+    """Local, offline TTS through the espeak-ng (or espeak) command line"""
+    name = "espeak"
+
+    def __init__(self, binary=None, timeout=10):
+        self.binary = binary or shutil.which("espeak-ng") or shutil.which("espeak")
+        self.timeout = timeout
+
+    def synthesize(self, text, lang, slow=False):
+        if not self.binary:
+            raise RuntimeError("espeak-ng is not installed")
+
+        result = subprocess.run(
+            [self.binary, "--stdout", "-v", lang, "-s", "120" if slow else "170", text],
+            capture_output=True,
+            timeout=self.timeout,
+            check=True
+        )
+        return result.stdout
+
+    def is_available(self):
+        return self.binary is not None
+
+class FallbackTTSEngine(TTSEngine):
+    """Use the primary engine, switching to the fallback when it misses its deadline"""
+
+    def __init__(self, primary, fallback, deadline=TTS_ENGINE_DEADLINE,
+                 cooldown=TTS_FALLBACK_COOLDOWN):
+        self.primary = primary
+        self.fallback = fallback
+        self.deadline = deadline
+        self.cooldown = cooldown
+        self.name = f"{primary.name}+{fallback.name}"
+
+        # Primary calls run here so a slow one can be abandoned at the deadline
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tts-engine")
+        self._degraded_until = 0
+
+        # Stats
+        self.primary_calls = 0
+        self.fallback_calls = 0
+        self.deadline_misses = 0
+        self.last_primary_latency = None
+
+    @property
+    def preferred_name(self):
+        return self.primary.name
+
+    def is_degraded(self):
+        """Check if the primary engine is currently being skipped"""
+        return time.time() < self._degraded_until
+
+    def synthesize(self, text, lang, slow=False):
+        return self.synthesize_with_source(text, lang, slow)[0]
+
+    def synthesize_with_source(self, text, lang, slow=False):
+        if not self.is_degraded():
+            started = time.time()
+            future = self._executor.submit(self.primary.synthesize, text, lang, slow)
+            try:
+                data = future.result(timeout=self.deadline)
+                self.primary_calls += 1
+                self.last_primary_latency = time.time() - started
+                return data, self.primary.name
+            except FutureTimeoutError:
+                self.deadline_misses += 1
+                logger.warning(f"{self.primary.name} missed its {self.deadline}s deadline, "
+                               f"using {self.fallback.name} for {self.cooldown}s")
+            except Exception as e:
+                logger.warning(f"{self.primary.name} failed ({e}), "
+                               f"using {self.fallback.name} for {self.cooldown}s")
+            self._degraded_until = time.time() + self.cooldown
+
+        self.fallback_calls += 1
+        return self.fallback.synthesize(text, lang, slow), self.fallback.name
+
+    def get_stats(self):
+        """Get primary/fallback usage stats"""
+        return {
+            "primary_calls": self.primary_calls,
+            "fallback_calls": self.fallback_calls,
+            "deadline_misses": self.deadline_misses,
+            "last_primary_latency": self.last_primary_latency,
+            "degraded": self.is_degraded()
+        }
+
+def create_tts_engine(name=TTS_ENGINE):
+    """Build the configured engine: "gtts", "espeak" or "auto" (gtts with espeak fallback)"""
+    if name == "espeak":
+        return EspeakEngine()
+    if name == "gtts":
+        return GTTSEngine()
+
+    local = EspeakEngine()
+    if GTTS_AVAILABLE and local.is_available():
+        return FallbackTTSEngine(GTTSEngine(), local)
+    if local.is_available():
+        logger.warning("gTTS not installed, using espeak")
+        return local
+
+    logger.warning("espeak-ng not found, offline fallback disabled")
+    return GTTSEngine()
@@ -1,60 +1,164 @@
 """Simplified TTS handler with direct animation control"""
 
+import asyncio
+import inspect
 import pygame
 import tempfile
+import io
 import os
 import threading
 import time
 import logging
-from gtts import gTTS
-from config import TTS_LANGUAGE, TTS_SLOW
+from concurrent.futures import ThreadPoolExecutor
+from tts_cache import TTSAudioCache
+from tts_engines import create_tts_engine, audio_format
+from lip_sync import LipSyncTrack
+from text_chunker import split_phrases
+from chunked_speech import ChunkedSpeech, ChunkPlayer
+from config import (
+    TTS_LANGUAGE, TTS_SLOW, TTS_IN_MEMORY, TTS_CACHE_ENABLED, LIP_SYNC_ENABLED,
+    TTS_CHUNKED, TTS_CHUNK_PARALLELISM
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SimplifiedTTSHandler:
-    def __init__(self):
+    def __init__(self, in_memory=TTS_IN_MEMORY, engine=None, chunked=TTS_CHUNKED):
         pygame.mixer.init()
+        self.in_memory = in_memory
+        self.engine = engine or create_tts_engine()
+        self.cache = TTSAudioCache() if TTS_CACHE_ENABLED else None
         self.is_speaking = False
         self.obs_controller = None
         
+        # Chunked mode renders phrases in parallel and plays them on a reserved channel
+        self.chunked = chunked
+        self._chunk_executor = None
+        self._channel = None
+        self._rendering = None  # Last ChunkedSpeech handed out, possibly still rendering
+        if chunked:
+            self._chunk_executor = ThreadPoolExecutor(
+                max_workers=max(1, TTS_CHUNK_PARALLELISM), thread_name_prefix="tts-chunk"
+            )
+            pygame.mixer.set_reserved(1)
+            self._channel = pygame.mixer.Channel(0)
+        
     def set_obs_controller(self, obs_controller):
         """Set reference to OBS controller"""
         self.obs_controller = obs_controller
         
     def text_to_speech(self, text, lang=TTS_LANGUAGE):
-        """Convert text to speech"""
+        """Convert text to speech, returning in-memory audio, a temp file path,
+        or ChunkedSpeech still rendering when chunked mode splits the text"""
         if not text or not text.strip():
             return None
+        
+        # ChunkedSpeech returns before its phrases render; finishing the previous one
+        # first keeps synthesis to one utterance at a time, so the pipeline's
+        # lookahead still bounds how much is rendered ahead
+        if self._rendering is not None:
+            self._rendering.wait_rendered()
+            self._rendering = None
+        
+        if self.chunked:
+            phrases = split_phrases(text)
+            if len(phrases) > 1:
+                logger.info(f"Converting to speech in {len(phrases)} chunks: {text}")
+                self._rendering = ChunkedSpeech(phrases, lambda phrase: self._render_chunk(phrase, lang), self._chunk_executor)
+                return self._rendering
             
         try:
-            logger.info(f"Converting to speech: {text}")
-            tts = gTTS(text=text, lang=lang, slow=TTS_SLOW)
+            audio_data = self._synthesize(text, lang)
             
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                tts.save(tmp_file.name)
+            if self.in_memory:
+                return io.BytesIO(audio_data)
+            
+            suffix = f".{audio_format(audio_data)}"
+            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+                tmp_file.write(audio_data)
                 return tmp_file.name
                 
         except Exception as e:
             logger.error(f"TTS Error: {e}")
             return None
     
+    def _synthesize(self, text, lang):
+        """Get audio bytes for text, from the cache when possible"""
+        key = self._cache_key(text, lang) if self.cache else None
+        
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info(f"Speech cache hit: {text}")
+                return cached
+        
+        logger.info(f"Converting to speech: {text}")
+        audio_data, source = self.engine.synthesize_with_source(text, lang, TTS_SLOW)
+        
+        # Don't let fallback audio stand in for the preferred voice later
+        if key and source == self.engine.preferred_name:
+            self.cache.put(key, audio_data)
+        return audio_data
+    
+    def _render_chunk(self, phrase, lang):
+        """Synthesize and decode one phrase for the mixer"""
+        sound = pygame.mixer.Sound(file=io.BytesIO(self._synthesize(phrase, lang)))
+        lip_sync = None
+        if LIP_SYNC_ENABLED and self.obs_controller:
+            try:
+                lip_sync = LipSyncTrack.from_sound(sound)
+            except Exception as e:
+                logger.warning(f"Lip sync unavailable for this chunk: {e}")
+        return sound, lip_sync
+    
+    def _cache_key(self, text, lang):
+        return TTSAudioCache.make_key(text, lang, TTS_SLOW, self.engine.preferred_name)
+    
+    def prewarm(self, phrases, lang=TTS_LANGUAGE):
+        """Synthesize known phrases into the cache ahead of time"""
+        if not self.cache:
+            return 0
+        
+        warmed = 0
+        for phrase in phrases:
+            if not phrase or not phrase.strip():
+                continue
+            if self.cache.contains(self._cache_key(phrase, lang)):
+                continue
+            try:
+                self._synthesize(phrase, lang)
+                warmed += 1
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm '{phrase}': {e}")
+        
+        logger.info(f"Pre-warmed {warmed} phrases into speech cache")
+        return warmed
+    
+    def get_cache_stats(self):
+        """Get speech cache stats"""
+        return self.cache.get_stats() if self.cache else None
+    
     def play_speech(self, audio_file):
         """Play speech with simple animation"""
-        if not audio_file or not os.path.exists(audio_file):
+        if not audio_file:
+            return
+        if isinstance(audio_file, str) and not os.path.exists(audio_file):
+            return
+        if isinstance(audio_file, ChunkedSpeech):
+            self._play_chunks(audio_file)
             return
             
         try:
-            # Start animation
-            if self.obs_controller:
-                self.obs_controller.start_animation()
-            
-            # Play audio
-            pygame.mixer.music.load(audio_file)
+            lip_sync = self._prepare_playback(audio_file)
             pygame.mixer.music.play()
             
             self.is_speaking = True
             
+            # Start animation
+            if self.obs_controller:
+                self.obs_controller.start_animation(lip_sync, self.get_playback_position)
+            
             # Monitor playback
             while pygame.mixer.music.get_busy():
                 time.sleep(0.1)
@@ -69,8 +173,153 @@ class SimplifiedTTSHandler:
             logger.error(f"Audio playback error: {e}")
         finally:
             # Cleanup
-            if os.path.exists(audio_file):
-                os.unlink(audio_file)
+            self.discard_audio(audio_file)
+    
+    async def play_speech_async(self, audio_file):
+        """Play speech with animation on the event loop, without a worker thread"""
+        if not audio_file:
+            return
+        if isinstance(audio_file, str) and not os.path.exists(audio_file):
+            return
+        if isinstance(audio_file, ChunkedSpeech):
+            await self._play_chunks_async(audio_file)
+            return
+            
+        try:
+            # Decoding for lip sync and loading the clip would stall chat ingest
+            # and OBS frames, so they run in a thread; only play() happens here
+            lip_sync = await asyncio.to_thread(self._prepare_playback, audio_file)
+            pygame.mixer.music.play()
+            
+            self.is_speaking = True
+            
+            # Start animation
+            if self.obs_controller:
+                self.obs_controller.start_animation(lip_sync, self.get_playback_position)
+            
+            # Sleep through the known length, then poll for the tail
+            if lip_sync:
+                await asyncio.sleep(max(0, lip_sync.duration - 0.1))
+            while pygame.mixer.music.get_busy():
+                await asyncio.sleep(0.02)
+            
+            self.is_speaking = False
+            
+            # Stop animation
+            pending = self._stop_animation()
+            if pending:
+                await pending
+                
+        except Exception as e:
+            logger.error(f"Audio playback error: {e}")
+        finally:
+            # Cleanup
+            self.discard_audio(audio_file)
+    
+    def _play_chunks(self, speech):
+        """Play chunked speech, starting as soon as the first chunk is rendered"""
+        player = ChunkPlayer(speech, self._channel)
+        self.is_speaking = True
+        animating = False
+        
+        try:
+            while player.step():
+                if not self.is_speaking:
+                    # stop_speech() was called
+                    player.stop()
+                    break
+                if not animating and player.timeline.started and self.obs_controller:
+                    self.obs_controller.start_animation(self._chunk_lip_sync(player), player.timeline.position)
+                    animating = True
+                time.sleep(0.02)
+        except Exception as e:
+            logger.error(f"Audio playback error: {e}")
+            player.stop()
+        finally:
+            self.is_speaking = False
+            if animating:
+                self.obs_controller.stop_animation()
+            self._log_chunk_playback(player)
+    
+    async def _play_chunks_async(self, speech):
+        """Play chunked speech on the event loop"""
+        player = ChunkPlayer(speech, self._channel)
+        self.is_speaking = True
+        animating = False
+        
+        try:
+            while player.step():
+                if not self.is_speaking:
+                    # stop_speech() was called
+                    player.stop()
+                    break
+                if not animating and player.timeline.started and self.obs_controller:
+                    self.obs_controller.start_animation(self._chunk_lip_sync(player), player.timeline.position)
+                    animating = True
+                await asyncio.sleep(0.02)
+        except asyncio.CancelledError:
+            player.stop()
+            raise
+        except Exception as e:
+            logger.error(f"Audio playback error: {e}")
+            player.stop()
+        finally:
+            self.is_speaking = False
+            if animating:
+                pending = self._stop_animation()
+                if pending:
+                    await pending
+            self._log_chunk_playback(player)
+    
+    def _chunk_lip_sync(self, player):
+        """The timeline follows each chunk's envelope; without lip sync use the flip-flop"""
+        return player.timeline if LIP_SYNC_ENABLED else None
+    
+    def _log_chunk_playback(self, player):
+        if player.failed_chunks or player.underruns:
+            logger.warning(
+                f"Chunked speech: {player.failed_chunks} failed chunks, {player.underruns} underruns"
+            )
+    
+    def _stop_animation(self):
+        """Stop animation, returning the awaitable if the controller is async"""
+        if not self.obs_controller:
+            return None
+        result = self.obs_controller.stop_animation()
+        return result if inspect.isawaitable(result) else None
+    
+    def _prepare_playback(self, audio_file):
+        """Build the clip's lip sync track and load it into the mixer, ready to play"""
+        lip_sync = self._build_lip_sync(audio_file)
+        if isinstance(audio_file, str):
+            pygame.mixer.music.load(audio_file)
+        else:
+            audio_file.seek(0)
+            pygame.mixer.music.load(audio_file, audio_format(audio_file.getvalue()[:4]))
+        return lip_sync
+    
+    def _build_lip_sync(self, audio_file):
+        """Decode audio once into a mouth-state track, or None to use the fixed flip-flop"""
+        if not LIP_SYNC_ENABLED or not self.obs_controller:
+            return None
+        try:
+            return LipSyncTrack.from_audio(audio_file)
+        except Exception as e:
+            logger.warning(f"Lip sync unavailable for this clip: {e}")
+            return None
+    
+    def get_playback_position(self):
+        """Seconds into the current clip, or -1 when nothing is playing"""
+        position_ms = pygame.mixer.music.get_pos()
+        return position_ms / 1000 if position_ms >= 0 else -1
+    
+    def discard_audio(self, audio_file):
+        """Delete synthesized audio that is no longer needed"""
+        # In-memory audio is simply dropped; only temp files touch the disk
+        if isinstance(audio_file, ChunkedSpeech):
+            audio_file.cancel()
+        elif isinstance(audio_file, str) and os.path.exists(audio_file):
+            os.unlink(audio_file)
     
     def is_playing(self):
         """Check if playing"""
@@ -80,6 +329,12 @@ class SimplifiedTTSHandler:
         """Stop speech"""
         if self.is_speaking:
             pygame.mixer.music.stop()
+            if self._channel:
+                self._channel.stop()
             self.is_speaking = False
-            if self.obs_controller:
-                self.obs_controller.stop_animation()
+            pending = self._stop_animation()
+            if pending:
+                try:
+                    asyncio.get_running_loop().create_task(pending)
+                except RuntimeError:
+                    pending.close()